@@ -1,12 +1,211 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from .models import User, Client, Freelancer, JobListing, Application, Category, Interview
-
-# Register your models here
-admin.site.register(User, UserAdmin)
-admin.site.register(Client)
-admin.site.register(Freelancer)
-admin.site.register(Category)
-admin.site.register(JobListing)
-admin.site.register(Application)
-admin.site.register(Interview)
\ No newline at end of file
+from django.core.paginator import Paginator
+from django.db import connection, transaction
+from django.db.models import Count
+from django.utils.functional import cached_property
+from django.utils.text import capfirst
+
+from .bulk_delete import bulk_delete, count_dependents
+from .locations import adjust_job_count
+from .models import (
+    User, Client, Freelancer, JobListing, Application, Category, Interview, Location, LocationAlias
+)
+
+
+# --- Helpers for big tables ---
+def estimated_row_count(model):
+    """Row estimate from table statistics instead of COUNT(*). None if unknown."""
+    if connection.vendor != 'mysql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT TABLE_ROWS FROM information_schema.TABLES
+            WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+        """, [model._meta.db_table])
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Unfiltered changelists use the table statistics for the page count,
+    filtered ones still run a real COUNT(*) (which can use the filter's index).
+    """
+    # Below this an exact count is cheap enough
+    exact_count_threshold = 10000
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, 'query', None)
+        if query is not None and not query.where:
+            estimate = estimated_row_count(self.object_list.model)
+            if estimate is not None and estimate > self.exact_count_threshold:
+                return estimate
+        return super().count
+
+
+class ScalableModelAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    list_per_page = 50
+
+
+class BulkDeleteMixin:
+    """
+    Deletes through core.bulk_delete instead of the cascade collector,
+    both for the "delete selected" action and the single object page.
+    The confirmation page shows row counts rather than every object.
+    """
+    bulk_delete_kind = None
+    # Objects listed by name on the confirmation page
+    confirmation_sample = 20
+
+    def get_deleted_objects(self, objs, request):
+        ids = [obj.pk for obj in objs]
+        counts = count_dependents(self.bulk_delete_kind, ids)
+        tables = {m._meta.db_table: m for m in self.admin_site._registry}
+        tables[self.model._meta.db_table] = self.model
+
+        model_count, perms_needed = {}, set()
+        for table, n in counts.items():
+            model = tables.get(table)
+            if model is None or not n:
+                continue
+            opts = model._meta
+            model_count[opts.verbose_name_plural] = n
+            if not request.user.has_perm(f"{opts.app_label}.delete_{opts.model_name}"):
+                perms_needed.add(opts.verbose_name)
+
+        to_delete = [f"{capfirst(self.model._meta.verbose_name)}: {obj}" for obj in objs[:self.confirmation_sample]]
+        if len(ids) > self.confirmation_sample:
+            to_delete.append(f"... and {len(ids) - self.confirmation_sample} more")
+        return to_delete, model_count, perms_needed, []
+
+    def delete_queryset(self, request, queryset):
+        bulk_delete(self.bulk_delete_kind, queryset.values_list('pk', flat=True))
+
+    def delete_model(self, request, obj):
+        bulk_delete(self.bulk_delete_kind, [obj.pk])
+
+
+# --- Users & Profiles ---
+@admin.register(User)
+class BulkDeleteUserAdmin(BulkDeleteMixin, UserAdmin):
+    bulk_delete_kind = 'user'
+
+
+@admin.register(Client)
+class ClientAdmin(BulkDeleteMixin, ScalableModelAdmin):
+    bulk_delete_kind = 'client'
+    list_display = ('id', 'company_name', 'user', 'location', 'resolved_location')
+    list_select_related = ('user', 'resolved_location')
+    search_fields = ('company_name', 'user__username')
+    raw_id_fields = ('user',)
+    # Resolved from `location` on save so the job counts follow it
+    readonly_fields = ('resolved_location',)
+
+
+@admin.register(Freelancer)
+class FreelancerAdmin(BulkDeleteMixin, ScalableModelAdmin):
+    bulk_delete_kind = 'freelancer'
+    list_display = ('id', 'user', 'portfolio_link')
+    list_select_related = ('user',)
+    search_fields = ('user__username',)
+    raw_id_fields = ('user',)
+
+
+@admin.register(Category)
+class CategoryAdmin(admin.ModelAdmin):
+    list_display = ('id', 'name')
+    search_fields = ('name',)
+
+
+class LocationAliasInline(admin.TabularInline):
+    model = LocationAlias
+    extra = 1
+
+
+@admin.register(Location)
+class LocationAdmin(admin.ModelAdmin):
+    list_display = ('id', 'name', 'job_count')
+    search_fields = ('name',)
+    readonly_fields = ('job_count',)
+    inlines = (LocationAliasInline,)
+
+
+@admin.register(LocationAlias)
+class LocationAliasAdmin(ScalableModelAdmin):
+    list_display = ('alias', 'location')
+    list_select_related = ('location',)
+    search_fields = ('alias',)
+    autocomplete_fields = ('location',)
+
+
+# --- Jobs ---
+@admin.register(JobListing)
+class JobListingAdmin(BulkDeleteMixin, ScalableModelAdmin):
+    bulk_delete_kind = 'job'
+    list_display = ('id', 'title', 'client', 'category', 'budget', 'is_active', 'created_at')
+    list_select_related = ('client__user', 'category')
+    list_filter = ('is_active', 'category')
+    search_fields = ('title',)
+    autocomplete_fields = ('client', 'category')
+    actions = ('activate_jobs', 'deactivate_jobs')
+
+    def _set_active(self, queryset, is_active):
+        """Bulk update that moves the changed jobs in or out of their location counts"""
+        with transaction.atomic():
+            changing = queryset.exclude(is_active=is_active)
+            by_location = list(
+                changing.exclude(client__resolved_location=None)
+                .values_list('client__resolved_location')
+                .annotate(n=Count('id'))
+                .order_by()
+            )
+            updated = changing.update(is_active=is_active)
+            for location_id, n in by_location:
+                adjust_job_count(location_id, n if is_active else -n)
+        return updated
+
+    @admin.action(description='Mark selected jobs as active')
+    def activate_jobs(self, request, queryset):
+        updated = self._set_active(queryset, True)
+        self.message_user(request, f"{updated} job(s) activated.")
+
+    @admin.action(description='Mark selected jobs as inactive')
+    def deactivate_jobs(self, request, queryset):
+        updated = self._set_active(queryset, False)
+        self.message_user(request, f"{updated} job(s) deactivated.")
+
+
+# --- Applications & Interviews ---
+@admin.register(Application)
+class ApplicationAdmin(ScalableModelAdmin):
+    list_display = ('id', '__str__', 'expected_payment', 'status', 'created_at')
+    # __str__ touches freelancer.user and job
+    list_select_related = ('freelancer__user', 'job')
+    list_filter = ('status',)
+    search_fields = ('job__title', 'freelancer__user__username')
+    autocomplete_fields = ('job', 'freelancer')
+    actions = ('approve_applications', 'reject_applications')
+
+    def _set_status(self, request, queryset, status):
+        updated = queryset.update(status=status)
+        self.message_user(request, f"{updated} application(s) marked as {status}.")
+
+    @admin.action(description='Approve selected applications')
+    def approve_applications(self, request, queryset):
+        self._set_status(request, queryset, 'Approved')
+
+    @admin.action(description='Reject selected applications')
+    def reject_applications(self, request, queryset):
+        self._set_status(request, queryset, 'Rejected')
+
+
+@admin.register(Interview)
+class InterviewAdmin(ScalableModelAdmin):
+    list_display = ('id', '__str__', 'date_time', 'link_or_location')
+    # __str__ follows application.job.title
+    list_select_related = ('application__job',)
+    raw_id_fields = ('application',)
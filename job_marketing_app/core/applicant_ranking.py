@@ -0,0 +1,214 @@
+import time
+from array import array
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+from .autocomplete import normalize, split_skills
+from .timeutils import to_timestamp
+
+# --- Ranked applicant lists ---
+# score = w_budget * budget_fit + w_skills * skill_match + w_recency * recency
+#
+#   budget_fit   1 at the job's budget, falling off linearly above it (0 at
+#                2x budget) and more gently below it (0.5 at a zero bid)
+#   skill_match  share of the freelancer's skills (up to MAX_SKILLS) that
+#                appear in the job title/description
+#   recency      2 ** (-(newest - applied_at) / half_life), i.e. relative
+#                to the job's newest application, so a stored ranking stays
+#                correct until another application arrives
+#
+# All applications of a job are scored in one pass over one query and
+# the resulting orders (by score, by date, by bid) are cached as packed
+# id arrays. A page is then a slice of an array plus one
+# SELECT ... WHERE id IN (page ids), however many applicants there are.
+#
+# New or deleted applications bump the job's ranking version (same idea
+# as the interview calendar versions), so a ranking computed while an
+# application was being inserted is never served.
+
+DEFAULTS = {
+    'WEIGHTS': {'budget': 0.4, 'skills': 0.4, 'recency': 0.2},
+    'RECENCY_HALF_LIFE_DAYS': 7,
+    # Freelancers listing more skills than this aren't penalised for it
+    'MAX_SKILLS': 5,
+    'PAGE_SIZE': 25,
+    # Upper bound on staleness from profile edits (skills) that don't bump the version
+    'TIMEOUT': 60 * 60,
+}
+
+VERSION_TIMEOUT = 60 * 60 * 24 * 30
+
+# ?sort= value -> (stored order, reversed)
+SORTS = {
+    'score': ('score', False),
+    'newest': ('date', True),
+    'oldest': ('date', False),
+    'bid_low': ('bid', False),
+    'bid_high': ('bid', True),
+}
+
+
+def get_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, 'APPLICANT_RANKING', {}))
+    return config
+
+
+def _version_key(job_id):
+    return f"applicant_ranking:version:{job_id}"
+
+
+def ranking_version(job_id):
+    version = cache.get(_version_key(job_id))
+    if version is None:
+        version = time.time_ns()
+        cache.add(_version_key(job_id), version, VERSION_TIMEOUT)
+        version = cache.get(_version_key(job_id), version)
+    return version
+
+
+def invalidate_rankings(*job_ids):
+    """Call after applications are added to or removed from these jobs"""
+    version = time.time_ns()
+    cache.set_many({_version_key(job_id): version for job_id in job_ids}, VERSION_TIMEOUT)
+
+
+# --- Scoring ---
+def budget_fit(bid, budget):
+    if budget <= 0:
+        return 1.0
+    ratio = bid / budget
+    if ratio > 1:
+        return max(0.0, 2.0 - ratio)
+    return 0.5 + 0.5 * ratio
+
+
+class JobContext:
+    """Everything about the job that scoring needs, computed once per batch"""
+
+    def __init__(self, title, description, budget, newest, config=None):
+        config = config or get_config()
+        self.text = f" {normalize(f'{title} {description}')} "
+        self.budget = float(budget)
+        self.newest = newest
+        self.half_life = config['RECENCY_HALF_LIFE_DAYS'] * 86400
+        self.max_skills = config['MAX_SKILLS']
+        self.weights = config['WEIGHTS']
+        self._skill_hits = {}
+        self._matches = {}
+
+    def skill_match(self, skills):
+        match = self._matches.get(skills)
+        if match is None:
+            match = self._matches[skills] = self._skill_match(skills)
+        return match
+
+    def _skill_match(self, skills):
+        skills = split_skills(skills)
+        if not skills:
+            return 0.0
+        hits = 0
+        for skill in skills:
+            # Freelancers share most skills, so each distinct one is matched once
+            hit = self._skill_hits.get(skill)
+            if hit is None:
+                key = normalize(skill)
+                hit = self._skill_hits[skill] = bool(key) and f" {key} " in self.text
+            hits += hit
+        return min(1.0, hits / min(len(skills), self.max_skills))
+
+    def recency(self, applied_at):
+        return 2 ** (-(self.newest - applied_at) / self.half_life)
+
+    def components(self, bid, applied_at, skills):
+        return {
+            'budget': budget_fit(float(bid), self.budget),
+            'skills': self.skill_match(skills),
+            'recency': self.recency(applied_at),
+        }
+
+    def score(self, components):
+        return sum(self.weights[name] * value for name, value in components.items())
+
+
+def compute_ranking(job_id, config=None):
+    """Score every application of the job in one pass"""
+    config = config or get_config()
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT title, description, budget FROM core_joblisting WHERE id = %s", [job_id])
+        job = cursor.fetchone()
+        cursor.execute("""
+            SELECT a.id, a.expected_payment, a.created_at, f.skills
+            FROM core_application a
+            JOIN core_freelancer f ON a.freelancer_id = f.id
+            WHERE a.job_id = %s
+        """, [job_id])
+        rows = cursor.fetchall()
+    if job is None:
+        return None
+
+    ids = array('I', (row[0] for row in rows))
+    bids = [float(row[1]) for row in rows]
+    applied = [to_timestamp(row[2]) for row in rows]
+    newest = max(applied, default=0.0)
+
+    context = JobContext(job[0], job[1], job[2], newest, config)
+    scores = [
+        context.score(context.components(bid, at, row[3]))
+        for bid, at, row in zip(bids, applied, rows)
+    ]
+
+    positions = range(len(ids))
+
+    def order(key):
+        return array('I', (ids[i] for i in sorted(positions, key=key))).tobytes()
+
+    return {
+        'newest': newest,
+        'orders': {
+            # Equal scores keep the earlier application first
+            'score': order(lambda i: (-scores[i], ids[i])),
+            'date': order(lambda i: (applied[i], ids[i])),
+            'bid': order(lambda i: (bids[i], ids[i])),
+        },
+    }
+
+
+def get_ranking(job_id):
+    version = ranking_version(job_id)
+    key = f"applicant_ranking:{job_id}:{version}"
+    ranking = cache.get(key)
+    if ranking is None:
+        ranking = compute_ranking(job_id)
+        if ranking is not None:
+            cache.set(key, ranking, get_config()['TIMEOUT'])
+    return ranking
+
+
+class RankedIds:
+    """Sequence view of a packed id order, for django's Paginator"""
+
+    def __init__(self, packed, reverse=False):
+        self.ids = array('I')
+        self.ids.frombytes(packed)
+        self.reverse = reverse
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, item):
+        if self.reverse:
+            n = len(self.ids)
+            start, stop, _ = item.indices(n)
+            return list(reversed(self.ids[n - stop:n - start]))
+        return list(self.ids[item])
+
+    def count(self):
+        return len(self.ids)
+
+
+def ranked_ids(ranking, sort):
+    order, reverse = SORTS.get(sort, SORTS['score'])
+    return RankedIds(ranking['orders'][order], reverse)
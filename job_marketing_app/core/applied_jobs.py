@@ -0,0 +1,129 @@
+import time
+from array import array
+from bisect import bisect_left
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+
+# --- Per-freelancer "applied jobs" set ---
+# Stored in the shared cache as a sorted array of unsigned ints (4 bytes per
+# job) so job_list can badge every card and job_detail can skip its query.
+#
+# Each freelancer has a version key that writes replace. A cached set is
+# stamped with the version it was loaded under and only served while that
+# is still current, so a load that raced with a new application can't put
+# the old set back after the invalidation.
+
+DEFAULTS = {
+    # Freelancers with more applications than this are not cached (memory budget)
+    'MAX_IDS': 20000,
+    'TIMEOUT': 60 * 60,
+}
+
+VERSION_TIMEOUT = 60 * 60 * 24 * 30
+
+
+def get_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, 'APPLIED_JOBS_CACHE', {}))
+    return config
+
+
+def _key(freelancer_id):
+    return f"applied_jobs:{freelancer_id}"
+
+
+def _version_key(freelancer_id):
+    return f"applied_jobs:version:{freelancer_id}"
+
+
+class AppliedJobs:
+    """Read-only set of job ids backed by a sorted int array"""
+
+    def __init__(self, ids):
+        self.ids = ids
+
+    def __contains__(self, job_id):
+        try:
+            job_id = int(job_id)
+        except (TypeError, ValueError):
+            return False
+        i = bisect_left(self.ids, job_id)
+        return i < len(self.ids) and self.ids[i] == job_id
+
+    def __len__(self):
+        return len(self.ids)
+
+
+def load_applied_job_ids(freelancer_id, max_ids):
+    """Sorted array of job ids, or None if over the budget"""
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT job_id FROM core_application
+            WHERE freelancer_id = %s
+            ORDER BY job_id
+            LIMIT %s
+        """, [freelancer_id, max_ids + 1])
+        rows = cursor.fetchall()
+
+    if len(rows) > max_ids:
+        return None
+    return array('I', (row[0] for row in rows))
+
+
+def load_applied_among(freelancer_id, job_ids):
+    """The subset of job_ids this freelancer applied to, in one query"""
+    job_ids = sorted({int(job_id) for job_id in job_ids})
+    if not job_ids:
+        return array('I')
+    with connection.cursor() as cursor:
+        cursor.execute(f"""
+            SELECT job_id FROM core_application
+            WHERE freelancer_id = %s AND job_id IN ({', '.join(['%s'] * len(job_ids))})
+            ORDER BY job_id
+        """, [freelancer_id] + job_ids)
+        return array('I', (row[0] for row in cursor.fetchall()))
+
+
+def get_applied_jobs(freelancer_id, job_ids=()):
+    """
+    Every job the freelancer applied to. Freelancers over the MAX_IDS
+    budget aren't cached; for them only `job_ids` (the jobs on the page)
+    are looked up.
+    """
+    config = get_config()
+    key, version_key = _key(freelancer_id), _version_key(freelancer_id)
+    values = cache.get_many([key, version_key])
+
+    version = values.get(version_key)
+    if version is None:
+        version = time.time_ns()
+        cache.add(version_key, version, VERSION_TIMEOUT)
+        version = cache.get(version_key, version)
+
+    entry = values.get(key)
+    if entry is None or entry[0] != version:
+        ids = load_applied_job_ids(freelancer_id, config['MAX_IDS'])
+        # b'' remembers that this freelancer is over budget
+        entry = (version, b'' if ids is None else b'\x01' + ids.tobytes())
+        cache.set(key, entry, config['TIMEOUT'])
+        if ids is not None:
+            return AppliedJobs(ids)
+
+    raw = entry[1]
+    if not raw:
+        return AppliedJobs(load_applied_among(freelancer_id, job_ids))
+
+    ids = array('I')
+    ids.frombytes(raw[1:])
+    return AppliedJobs(ids)
+
+
+def invalidate_applied_jobs(freelancer_id):
+    """
+    Move the freelancer to a new version; the next read reloads the set
+    with one indexed query. Replacing rather than patching the array
+    means two workers can't overwrite each other's additions.
+    """
+    cache.set(_version_key(freelancer_id), time.time_ns(), VERSION_TIMEOUT)
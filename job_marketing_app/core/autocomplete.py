@@ -0,0 +1,304 @@
+import heapq
+import re
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left
+
+from django.conf import settings
+from django.db import connection
+
+# --- In-memory prefix autocomplete for job titles and skills ---
+# Terms are kept as parallel sorted arrays (normalised key, display form,
+# weight). A prefix maps to a contiguous key range found with two
+# bisects; the top-k by weight in that range is the answer. Prefixes
+# with wide ranges (all short ones, plus longer ones that still match
+# many terms) have their top-k precomputed, so every lookup either reads
+# a list or scans a few hundred weights - well under a millisecond.
+#
+# Each worker builds its own index on first use and rebuilds it in the
+# background every REFRESH_SECONDS; its own writes (post_job,
+# update_profile) are added immediately.
+
+DEFAULTS = {
+    'REFRESH_SECONDS': 10 * 60,
+    # Prefixes up to this length get a precomputed top-k
+    'PRECOMPUTE_PREFIX_LENGTH': 3,
+    # ...and longer prefixes still matching more terms than this
+    'PRECOMPUTE_MIN_RANGE': 256,
+    'MAX_RESULTS': 10,
+}
+
+KINDS = ('title', 'skill')
+
+_STRIP_RE = re.compile(r'[^\w\s+#.]')
+_SPACE_RE = re.compile(r'\s+')
+
+
+def get_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, 'AUTOCOMPLETE', {}))
+    return config
+
+
+def normalize(text):
+    text = _STRIP_RE.sub(' ', (text or '').lower())
+    return _SPACE_RE.sub(' ', text).strip()
+
+
+def split_skills(skills):
+    """'Python, Django; React' -> ['Python', 'Django', 'React']"""
+    return [s.strip() for s in re.split(r'[,;\n]', skills or '') if s.strip()]
+
+
+def title_terms(title):
+    """A title is offered as a whole and word by word ('dev' -> 'Developer')"""
+    terms = [title.strip()]
+    terms += [w for w in re.findall(r'[\w+#.]+', title) if len(w) > 2]
+    return terms
+
+
+class PrefixIndex:
+    def __init__(self, counts=None, precompute_length=3, max_results=10, dense_range=256):
+        """counts: {display term: weight}"""
+        self.precompute_length = precompute_length
+        self.dense_range = dense_range
+        self.max_results = max_results
+        self.lock = threading.Lock()
+
+        merged = {}
+        for display, weight in (counts or {}).items():
+            key = normalize(display)
+            if not key:
+                continue
+            if key in merged:
+                merged[key][1] += weight
+            else:
+                merged[key] = [display, weight]
+
+        self.keys = sorted(merged)
+        self.displays = [merged[k][0] for k in self.keys]
+        self.weights = array('I', (merged[k][1] for k in self.keys))
+        self.top = {}
+        self._precompute()
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _dense(self, prefix, lo, hi):
+        return len(prefix) <= self.precompute_length or hi - lo > self.dense_range
+
+    def _precompute(self):
+        """
+        Top-k for every short prefix, and for longer ones while their range
+        stays wider than dense_range. Walks the implicit trie over the
+        sorted keys, so sparse branches are never expanded.
+        """
+        self.top = {}
+        stack = ['']
+        while stack:
+            prefix = stack.pop()
+            lo, hi = self._range(prefix)
+            if prefix:
+                if not self._dense(prefix, lo, hi):
+                    continue
+                self.top[prefix] = self._best(range(lo, hi))
+            depth = len(prefix)
+            i = lo
+            while i < hi:
+                key = self.keys[i]
+                if len(key) == depth:
+                    i += 1
+                    continue
+                child = key[:depth + 1]
+                stack.append(child)
+                i = self._range(child)[1]
+
+    def _best(self, ids):
+        best = heapq.nlargest(self.max_results, ids, key=lambda i: (self.weights[i], -i))
+        return [(self.displays[i], self.weights[i]) for i in best]
+
+    def _range(self, prefix):
+        lo = bisect_left(self.keys, prefix)
+        hi = bisect_left(self.keys, prefix + '\U0010ffff', lo)
+        return lo, hi
+
+    def complete(self, prefix, k=None):
+        k = min(k or self.max_results, self.max_results)
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+        with self.lock:
+            if prefix in self.top:
+                return self.top[prefix][:k]
+            if len(prefix) <= self.precompute_length:
+                return []
+            lo, hi = self._range(prefix)
+            best = heapq.nlargest(k, range(lo, hi), key=lambda i: (self.weights[i], -i))
+            return [(self.displays[i], self.weights[i]) for i in best]
+
+    def add(self, display, delta=1):
+        """Incremental update for one term"""
+        key = normalize(display)
+        if not key:
+            return
+        with self.lock:
+            i = bisect_left(self.keys, key)
+            if i < len(self.keys) and self.keys[i] == key:
+                self.weights[i] += delta
+            else:
+                self.keys.insert(i, key)
+                self.displays.insert(i, display)
+                self.weights.insert(i, delta)
+            # The precomputed table holds (display, weight) pairs rather than
+            # positions, so only this term's own prefixes need redoing. A
+            # prefix that only becomes dense now waits for the next rebuild.
+            for n in range(1, len(key) + 1):
+                prefix = key[:n]
+                if n <= self.precompute_length or prefix in self.top:
+                    lo, hi = self._range(prefix)
+                    self.top[prefix] = self._best(range(lo, hi))
+                else:
+                    break
+
+    def memory_bytes(self):
+        """Rough footprint: key/display strings, weights and the top-k table"""
+        total = sys.getsizeof(self.keys) + sys.getsizeof(self.displays)
+        total += self.weights.buffer_info()[1] * self.weights.itemsize
+        total += sum(sys.getsizeof(k) for k in self.keys)
+        total += sum(sys.getsizeof(d) for d, k in zip(self.displays, self.keys) if d is not k)
+        total += sys.getsizeof(self.top)
+        for prefix, entries in self.top.items():
+            total += sys.getsizeof(prefix) + sys.getsizeof(entries) + len(entries) * 56
+        return total
+
+
+# --- Building from the database ---
+def load_title_counts():
+    """Active job titles (whole and per word), weighted by how many jobs use them"""
+    counts = {}
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT title FROM core_joblisting WHERE is_active = %s", [True])
+        for (title,) in cursor.fetchall():
+            for term in title_terms(title):
+                counts[term] = counts.get(term, 0) + 1
+    return counts
+
+
+def load_skill_counts():
+    """Skills across freelancer profiles, weighted by how many freelancers list them"""
+    counts = {}
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT skills FROM core_freelancer WHERE skills <> ''")
+        for (skills,) in cursor.fetchall():
+            for skill in split_skills(skills):
+                counts[skill] = counts.get(skill, 0) + 1
+    return counts
+
+
+LOADERS = {
+    'title': load_title_counts,
+    'skill': load_skill_counts,
+}
+
+
+def build_index(kind):
+    config = get_config()
+    return PrefixIndex(
+        LOADERS[kind](),
+        precompute_length=config['PRECOMPUTE_PREFIX_LENGTH'],
+        max_results=config['MAX_RESULTS'],
+        dense_range=config['PRECOMPUTE_MIN_RANGE'],
+    )
+
+
+# --- Per-process service ---
+class AutocompleteService:
+    def __init__(self):
+        self.indexes = {}
+        self.built_at = {}
+        self.lock = threading.Lock()
+        self.refreshing = set()
+
+    def get_index(self, kind):
+        index = self.indexes.get(kind)
+        if index is None:
+            with self.lock:
+                index = self.indexes.get(kind)
+                if index is None:
+                    self.rebuild(kind)
+                    index = self.indexes[kind]
+        elif time.monotonic() - self.built_at[kind] > get_config()['REFRESH_SECONDS']:
+            self._refresh_in_background(kind)
+        return index
+
+    def rebuild(self, kind):
+        index = build_index(kind)
+        # Swapping the reference is atomic; readers keep the old index until then
+        self.indexes[kind] = index
+        self.built_at[kind] = time.monotonic()
+        return index
+
+    def _refresh_in_background(self, kind):
+        with self.lock:
+            if kind in self.refreshing:
+                return
+            self.refreshing.add(kind)
+
+        def run():
+            from django.db import connections
+            try:
+                self.rebuild(kind)
+            finally:
+                connections.close_all()
+                with self.lock:
+                    self.refreshing.discard(kind)
+
+        threading.Thread(target=run, name=f'autocomplete-refresh-{kind}', daemon=True).start()
+
+    def add(self, kind, terms):
+        # Nothing to update until someone has asked for completions
+        index = self.indexes.get(kind)
+        if index is not None:
+            for term in terms:
+                index.add(term)
+
+    def reset(self):
+        with self.lock:
+            self.indexes.clear()
+            self.built_at.clear()
+
+
+service = AutocompleteService()
+
+
+def complete(prefix, kind=None, k=None):
+    """
+    [{'term': .., 'kind': .., 'weight': ..}] best first. Without a kind,
+    titles and skills are merged by weight.
+    """
+    k = min(k or get_config()['MAX_RESULTS'], get_config()['MAX_RESULTS'])
+    kinds = [kind] if kind else KINDS
+    results = []
+    for name in kinds:
+        results += [
+            {'term': term, 'kind': name, 'weight': weight}
+            for term, weight in service.get_index(name).complete(prefix, k)
+        ]
+    if len(kinds) > 1:
+        results.sort(key=lambda r: -r['weight'])
+    return results[:k]
+
+
+def add_title(title):
+    service.add('title', title_terms(title))
+
+
+def add_skills(skills):
+    service.add('skill', split_skills(skills))
+
+
+def warm():
+    for kind in KINDS:
+        service.get_index(kind)
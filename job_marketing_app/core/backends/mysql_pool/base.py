@@ -0,0 +1,11 @@
+from django.db.backends.mysql import base as mysql
+
+from core.pool import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, mysql.DatabaseWrapper):
+    """The MySQL backend with OPTIONS['POOL'] support (see core/pool.py)"""
+
+    def pool_ping(self, conn):
+        # mysqlclient's ping is a COM_PING round trip, no statement parsing
+        conn.ping()
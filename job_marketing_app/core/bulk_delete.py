@@ -0,0 +1,253 @@
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+
+from .applicant_ranking import invalidate_rankings
+from .applied_jobs import invalidate_applied_jobs
+from .calendar_feed import bump_interview_version
+from .locations import LOCATIONS_CACHE_KEY
+from .object_cache import job_details
+
+# --- Bulk deletion of users, clients, freelancers and jobs ---
+# Django's cascade collector loads every dependent row (jobs, their
+# applications, their interviews...) into memory and fires signals per
+# object before deleting anything. This walks the same tree bottom-up
+# with set-based DELETE ... WHERE id IN (...) statements instead:
+#
+#     interviews -> applications -> job index rows -> jobs -> profile -> user
+#
+# Each batch is its own short transaction and picks its ids from what is
+# still in the database, so an interrupted run is resumed by running it
+# again. Caches and counters the ORM signals would have kept in sync
+# (applied jobs, applicant rankings, job detail records, location job
+# counts, calendar versions) are updated as each batch commits.
+#
+# Every reverse relation of these models must appear here; a test checks
+# that against the model metadata so a new FK can't be silently orphaned.
+
+DEFAULTS = {
+    # Ids per DELETE statement / transaction
+    'BATCH_SIZE': 500,
+}
+
+# (table, column) rows referencing each kind of row, deleted before it
+DEPENDENTS = {
+    'core_application': [('core_interview', 'application_id')],
+    'core_joblisting': [('core_jobsignature', 'job_id'), ('core_joblshbucket', 'job_id')],
+    'core_user': [
+        ('core_user_groups', 'user_id'),
+        ('core_user_user_permissions', 'user_id'),
+        ('django_admin_log', 'user_id'),
+    ],
+}
+
+
+def get_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, 'BULK_DELETE', {}))
+    return config
+
+
+def _placeholders(ids):
+    return ', '.join(['%s'] * len(ids))
+
+
+def _chunks(ids, size):
+    ids = list(ids)
+    for i in range(0, len(ids), size):
+        yield ids[i:i + size]
+
+
+class BulkDeleter:
+    def __init__(self, batch_size=None, progress=None):
+        self.batch_size = batch_size or get_config()['BATCH_SIZE']
+        # progress(table, deleted_so_far) after every committed batch
+        self.progress = progress
+        self.deleted = {}
+
+    def _delete(self, cursor, table, column, ids):
+        cursor.execute(f"DELETE FROM {table} WHERE {column} IN ({_placeholders(ids)})", ids)
+        self.deleted[table] = self.deleted.get(table, 0) + cursor.rowcount
+
+    def _delete_rows(self, cursor, table, ids):
+        for dep_table, column in DEPENDENTS.get(table, ()):
+            self._delete(cursor, dep_table, column, ids)
+        self._delete(cursor, table, 'id', ids)
+
+    def _report(self, table):
+        if self.progress:
+            self.progress(table, self.deleted.get(table, 0))
+
+    # --- Applications (and their interviews) ---
+    def _delete_applications_where(self, where, params):
+        """Delete applications matching `where` batch by batch"""
+        while True:
+            with transaction.atomic(), connection.cursor() as cursor:
+                cursor.execute(f"""
+                    SELECT a.id, a.freelancer_id, c.user_id, f.user_id, i.id, a.job_id
+                    FROM core_application a
+                    JOIN core_joblisting j ON a.job_id = j.id
+                    JOIN core_client c ON j.client_id = c.id
+                    JOIN core_freelancer f ON a.freelancer_id = f.id
+                    LEFT JOIN core_interview i ON i.application_id = a.id
+                    WHERE {where}
+                    ORDER BY a.id
+                    LIMIT %s
+                """, params + [self.batch_size])
+                rows = cursor.fetchall()
+                if not rows:
+                    return
+                self._delete_rows(cursor, 'core_application', [row[0] for row in rows])
+
+                # Bound now: inside an outer atomic block these run after the loop
+                for freelancer_id in {row[1] for row in rows}:
+                    transaction.on_commit(partial(invalidate_applied_jobs, freelancer_id))
+                transaction.on_commit(partial(invalidate_rankings, *{row[5] for row in rows}))
+                # Calendars of both sides lose the interview
+                participants = {uid for row in rows if row[4] for uid in row[2:4]}
+                bump_interview_version(*participants)
+            self._report('core_application')
+
+    # --- Jobs ---
+    def delete_jobs(self, job_ids):
+        for chunk in _chunks(job_ids, self.batch_size):
+            self._delete_applications_where(f"a.job_id IN ({_placeholders(chunk)})", list(chunk))
+            with transaction.atomic(), connection.cursor() as cursor:
+                # Active jobs leave their client's location count
+                cursor.execute(f"""
+                    SELECT c.resolved_location_id, COUNT(*)
+                    FROM core_joblisting j
+                    JOIN core_client c ON j.client_id = c.id
+                    WHERE j.id IN ({_placeholders(chunk)})
+                      AND j.is_active = 1 AND c.resolved_location_id IS NOT NULL
+                    GROUP BY c.resolved_location_id
+                """, chunk)
+                counts = cursor.fetchall()
+                self._delete_rows(cursor, 'core_joblisting', chunk)
+                transaction.on_commit(partial(job_details.invalidate, *chunk))
+                cursor.executemany("""
+                    UPDATE core_location
+                    SET job_count = CASE WHEN job_count < %s THEN 0 ELSE job_count - %s END
+                    WHERE id = %s
+                """, [(n, n, location_id) for location_id, n in counts])
+                if counts:
+                    transaction.on_commit(partial(cache.delete, LOCATIONS_CACHE_KEY))
+            self._report('core_joblisting')
+        return self.deleted
+
+    def _delete_jobs_where(self, column, ids):
+        """All jobs with `column` in ids, fetched a batch at a time"""
+        while True:
+            with connection.cursor() as cursor:
+                cursor.execute(f"""
+                    SELECT id FROM core_joblisting
+                    WHERE {column} IN ({_placeholders(ids)})
+                    ORDER BY id LIMIT %s
+                """, list(ids) + [self.batch_size])
+                job_ids = [row[0] for row in cursor.fetchall()]
+            if not job_ids:
+                return
+            self.delete_jobs(job_ids)
+
+    # --- Profiles ---
+    def delete_clients(self, client_ids):
+        for chunk in _chunks(client_ids, self.batch_size):
+            self._delete_jobs_where('client_id', chunk)
+            with transaction.atomic(), connection.cursor() as cursor:
+                self._delete_rows(cursor, 'core_client', chunk)
+            self._report('core_client')
+        return self.deleted
+
+    def delete_freelancers(self, freelancer_ids):
+        for chunk in _chunks(freelancer_ids, self.batch_size):
+            self._delete_applications_where(f"a.freelancer_id IN ({_placeholders(chunk)})", list(chunk))
+            with transaction.atomic(), connection.cursor() as cursor:
+                self._delete_rows(cursor, 'core_freelancer', chunk)
+            self._report('core_freelancer')
+        return self.deleted
+
+    # --- Users ---
+    def delete_users(self, user_ids):
+        for chunk in _chunks(user_ids, self.batch_size):
+            placeholders = _placeholders(chunk)
+            with connection.cursor() as cursor:
+                cursor.execute(f"SELECT id FROM core_client WHERE user_id IN ({placeholders})", chunk)
+                client_ids = [row[0] for row in cursor.fetchall()]
+                cursor.execute(f"SELECT id FROM core_freelancer WHERE user_id IN ({placeholders})", chunk)
+                freelancer_ids = [row[0] for row in cursor.fetchall()]
+            self.delete_clients(client_ids)
+            self.delete_freelancers(freelancer_ids)
+            with transaction.atomic(), connection.cursor() as cursor:
+                self._delete_rows(cursor, 'core_user', chunk)
+            self._report('core_user')
+        return self.deleted
+
+
+# kind -> (table, BulkDeleter method)
+KINDS = {
+    'user': ('core_user', 'delete_users'),
+    'client': ('core_client', 'delete_clients'),
+    'freelancer': ('core_freelancer', 'delete_freelancers'),
+    'job': ('core_joblisting', 'delete_jobs'),
+}
+
+
+def bulk_delete(kind, ids, batch_size=None, progress=None):
+    """Delete rows of `kind` and everything under them; returns {table: rows deleted}"""
+    deleter = BulkDeleter(batch_size, progress)
+    getattr(deleter, KINDS[kind][1])(list(ids))
+    return deleter.deleted
+
+
+def count_dependents(kind, ids):
+    """
+    {table: rows} that bulk_delete(kind, ids) would remove, from COUNT(*)
+    queries only. Used for dry runs and the admin confirmation page.
+    """
+    ids = list(ids)
+    if not ids:
+        return {}
+    # (sql selecting ids, params) for each level that is affected
+    id_list = (_placeholders(ids), ids)
+    users = clients = freelancers = jobs = None
+    if kind == 'user':
+        users = id_list
+        clients = (f"SELECT id FROM core_client WHERE user_id IN ({id_list[0]})", ids)
+        freelancers = (f"SELECT id FROM core_freelancer WHERE user_id IN ({id_list[0]})", ids)
+    elif kind == 'client':
+        clients = id_list
+    elif kind == 'freelancer':
+        freelancers = id_list
+    else:
+        jobs = id_list
+    if clients:
+        jobs = (f"SELECT id FROM core_joblisting WHERE client_id IN ({clients[0]})", clients[1])
+
+    application_filters = [
+        (f"{column} IN ({sub[0]})", sub[1])
+        for column, sub in (('job_id', jobs), ('freelancer_id', freelancers)) if sub
+    ]
+    applications = (
+        ' OR '.join(sql for sql, _ in application_filters),
+        [p for _, params in application_filters for p in params],
+    )
+
+    queries = [
+        ('core_interview', (
+            f"application_id IN (SELECT id FROM core_application WHERE {applications[0]})", applications[1]
+        )),
+        ('core_application', applications),
+    ]
+    for table, sub in (('core_joblisting', jobs), ('core_client', clients),
+                       ('core_freelancer', freelancers), ('core_user', users)):
+        if sub:
+            queries.append((table, (f"id IN ({sub[0]})", sub[1])))
+
+    counts = {}
+    with connection.cursor() as cursor:
+        for table, (where, params) in queries:
+            cursor.execute(f"SELECT COUNT(*) FROM {table} WHERE {where}", params)
+            counts[table] = cursor.fetchone()[0]
+    return counts
@@ -0,0 +1,116 @@
+from datetime import timezone as dt_timezone
+
+from django.core import signing
+from django.db import connection
+from django.utils import timezone
+
+# --- iCalendar interview feeds ---
+# Calendar apps poll the .ics URL. Each user row carries an interview
+# version (core_user.interview_version) that schedule/reschedule/delete
+# bump in the same transaction as the change, and the feed's ETag is built
+# from it. An unchanged calendar answers 304 after one primary key lookup,
+# and every worker agrees on the version whatever cache backend is in use.
+
+TOKEN_SALT = 'core.interview-calendar'
+
+
+def feed_token(user_id):
+    return signing.Signer(salt=TOKEN_SALT).sign(str(user_id))
+
+
+def user_id_from_token(token):
+    try:
+        return int(signing.Signer(salt=TOKEN_SALT).unsign(token))
+    except (signing.BadSignature, ValueError):
+        return None
+
+
+def bump_interview_version(*user_ids):
+    if not user_ids:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"""
+            UPDATE core_user SET interview_version = interview_version + 1
+            WHERE id IN ({', '.join(['%s'] * len(user_ids))})
+        """, list(user_ids))
+
+
+def bump_application_participants(application_id):
+    """Bump both the client and the freelancer behind an application; returns their user ids"""
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT c.user_id, f.user_id
+            FROM core_application a
+            JOIN core_joblisting j ON a.job_id = j.id
+            JOIN core_client c ON j.client_id = c.id
+            JOIN core_freelancer f ON a.freelancer_id = f.id
+            WHERE a.id = %s
+        """, [application_id])
+        row = cursor.fetchone()
+    if row:
+        bump_interview_version(*row)
+    return row or ()
+
+
+def etag_for(user_id, version):
+    return f'"{user_id}-{version}"'
+
+
+def _escape(value):
+    return (
+        str(value or '')
+        .replace('\\', '\\\\')
+        .replace(';', '\\;')
+        .replace(',', '\\,')
+        .replace('\r\n', '\\n')
+        .replace('\n', '\\n')
+    )
+
+
+def _fold(line):
+    """RFC 5545: lines longer than 75 octets continue with a leading space"""
+    out = []
+    while len(line.encode()) > 75:
+        cut = 75
+        while len(line[:cut].encode()) > 75:
+            cut -= 1
+        out.append(line[:cut])
+        line = ' ' + line[cut:]
+    out.append(line)
+    return '\r\n'.join(out)
+
+
+def _format_dt(value):
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value, timezone.get_default_timezone())
+    return value.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def render_ics(interviews, calendar_name):
+    """
+    interviews: dicts with id, date_time, link_or_location, summary
+    """
+    stamp = _format_dt(timezone.now())
+    lines = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//Job Market//Interviews//EN',
+        'CALSCALE:GREGORIAN',
+        f'X-WR-CALNAME:{_escape(calendar_name)}',
+    ]
+    for interview in interviews:
+        location = interview['link_or_location']
+        lines += [
+            'BEGIN:VEVENT',
+            f"UID:interview-{interview['id']}@job-market",
+            f'DTSTAMP:{stamp}',
+            f"DTSTART:{_format_dt(interview['date_time'])}",
+            'DURATION:PT1H',
+            f"SUMMARY:{_escape(interview['summary'])}",
+            f'LOCATION:{_escape(location)}',
+        ]
+        if location and location.startswith(('http://', 'https://')):
+            lines.append(f'URL:{location}')
+        lines.append('END:VEVENT')
+    lines.append('END:VCALENDAR')
+    return '\r\n'.join(_fold(line) for line in lines) + '\r\n'
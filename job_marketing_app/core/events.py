@@ -0,0 +1,241 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+# --- Live dashboard events (server-sent events) ---
+# Views publish small events ("new applicant for job 12") to per-user
+# channels; /events/ streams them to open dashboards so they don't need
+# to be reloaded.
+#
+#   view (any thread/process) --broker--> EventHub (one per ASGI process)
+#                                            |-- queue --> SSE stream
+#                                            |-- queue --> SSE stream ...
+#
+# Each connection is one coroutine waiting on its own queue, so
+# thousands of idle dashboards cost a few KB each and no threads.
+#
+# LocalBroker hands events straight to this process's hub. It only
+# reaches dashboards connected to the same process, so it suits a
+# single ASGI server serving the whole site (and tests). RedisBroker
+# fans events out through Redis pub/sub to every ASGI process, which is
+# what you want when pages are served by gunicorn/WSGI and /events/ by a
+# separate ASGI server (e.g. uvicorn job_market.asgi:application).
+
+DEFAULTS = {
+    'BROKER': 'core.events.LocalBroker',
+    # Comment line sent to idle streams so proxies don't time them out
+    'HEARTBEAT_SECONDS': 15,
+    # Undelivered events per connection before it is dropped (it reconnects and replays)
+    'QUEUE_SIZE': 100,
+    # Recent events kept per channel for Last-Event-ID replay...
+    'REPLAY_SIZE': 20,
+    # ...for at most this many channels (least recently used dropped)
+    'REPLAY_CHANNELS': 10000,
+    'RETRY_MS': 5000,
+}
+
+CHANNEL_PREFIX = 'events:'
+_OVERFLOW = object()
+
+
+def get_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, 'EVENTS', {}))
+    return config
+
+
+def user_channel(user_id):
+    return f"user:{user_id}"
+
+
+class Subscription:
+    def __init__(self, channel, queue_size):
+        self.channel = channel
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.backlog = []
+
+
+class EventHub:
+    """
+    In-process fan-out; all methods except publish_threadsafe run on the
+    event loop. The replay buffer is also written from view threads
+    before any loop runs (and from every thread under WSGI), so it has
+    its own lock.
+    """
+
+    def __init__(self):
+        self.subscribers = {}
+        self.recent = OrderedDict()
+        self.recent_lock = threading.Lock()
+        self.loop = None
+        self.started = None
+
+    async def subscribe(self, channel, last_event_id=None):
+        config = get_config()
+        await self._ensure_broker()
+        subscription = Subscription(channel, config['QUEUE_SIZE'])
+        if last_event_id is not None:
+            with self.recent_lock:
+                subscription.backlog = [e for e in self.recent.get(channel, ()) if e['id'] > last_event_id]
+        self.subscribers.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        subscribers = self.subscribers.get(subscription.channel)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self.subscribers[subscription.channel]
+
+    async def _ensure_broker(self):
+        loop = asyncio.get_running_loop()
+        if loop is not self.loop:
+            # First stream in this process (or a new loop, e.g. between tests)
+            self.loop = loop
+            self.started = asyncio.ensure_future(get_broker().start(self))
+        await asyncio.shield(self.started)
+
+    def remember(self, channel, event):
+        """Keep the event for Last-Event-ID replay"""
+        config = get_config()
+        with self.recent_lock:
+            recent = self.recent.get(channel)
+            if recent is None:
+                recent = self.recent[channel] = deque(maxlen=config['REPLAY_SIZE'])
+                while len(self.recent) > config['REPLAY_CHANNELS']:
+                    self.recent.popitem(last=False)
+            else:
+                self.recent.move_to_end(channel)
+            recent.append(event)
+
+    def dispatch(self, channel, event):
+        self.remember(channel, event)
+        for subscription in list(self.subscribers.get(channel, ())):
+            try:
+                subscription.queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # A stalled client: end its stream; it reconnects with Last-Event-ID
+                self.unsubscribe(subscription)
+                subscription.queue.get_nowait()
+                subscription.queue.put_nowait(_OVERFLOW)
+
+    def publish_threadsafe(self, channel, event):
+        loop = self.loop
+        if loop is not None and loop.is_running():
+            loop.call_soon_threadsafe(self.dispatch, channel, event)
+        else:
+            # No loop, so no subscribers to wake (and their queues aren't
+            # thread-safe); keep it for streams that open later
+            self.remember(channel, event)
+
+    def connection_count(self):
+        return sum(len(s) for s in self.subscribers.values())
+
+    def reset(self):
+        self.subscribers.clear()
+        with self.recent_lock:
+            self.recent.clear()
+        self.loop = None
+        self.started = None
+
+
+hub = EventHub()
+
+
+# --- Brokers ---
+class LocalBroker:
+    def publish(self, channel, event):
+        hub.publish_threadsafe(channel, event)
+
+    async def start(self, hub):
+        pass
+
+
+class RedisBroker:
+    """Redis pub/sub between processes; needs the `redis` package (as RedisCache does)"""
+
+    def __init__(self, url=None):
+        import redis
+
+        self.url = url or os.environ['REDIS_URL']
+        self.client = redis.Redis.from_url(self.url)
+
+    def publish(self, channel, event):
+        self.client.publish(CHANNEL_PREFIX + channel, json.dumps(event))
+
+    async def start(self, hub):
+        import redis.asyncio
+
+        pubsub = redis.asyncio.Redis.from_url(self.url).pubsub()
+        await pubsub.psubscribe(CHANNEL_PREFIX + '*')
+        asyncio.ensure_future(self._listen(pubsub, hub))
+
+    async def _listen(self, pubsub, hub):
+        while True:
+            try:
+                async for message in pubsub.listen():
+                    if message['type'] == 'pmessage':
+                        channel = message['channel'].decode()[len(CHANNEL_PREFIX):]
+                        hub.dispatch(channel, json.loads(message['data']))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Connection dropped: back off, then resubscribe
+                await asyncio.sleep(1)
+                await pubsub.psubscribe(CHANNEL_PREFIX + '*')
+
+
+_broker = None
+
+
+def get_broker():
+    global _broker
+    if _broker is None:
+        _broker = import_string(get_config()['BROKER'])()
+    return _broker
+
+
+# --- Publishing (from ordinary sync views) ---
+def publish(user_ids, event_type, **data):
+    """Send an event to these users' dashboards once the current transaction commits"""
+    event = {'id': time.time_ns(), 'type': event_type, 'data': data}
+
+    def send():
+        broker = get_broker()
+        for user_id in set(user_ids):
+            broker.publish(user_channel(user_id), event)
+
+    transaction.on_commit(send)
+
+
+# --- SSE stream ---
+def format_event(event):
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {json.dumps(event['data'])}\n\n"
+
+
+async def stream(subscription):
+    config = get_config()
+    try:
+        yield f"retry: {config['RETRY_MS']}\n\n"
+        for event in subscription.backlog:
+            yield format_event(event)
+        while True:
+            try:
+                # asyncio.timeout rather than wait_for: no extra task per wait
+                async with asyncio.timeout(config['HEARTBEAT_SECONDS']):
+                    event = await subscription.queue.get()
+            except TimeoutError:
+                yield ": ping\n\n"
+                continue
+            if event is _OVERFLOW:
+                return
+            yield format_event(event)
+    finally:
+        hub.unsubscribe(subscription)
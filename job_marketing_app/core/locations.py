@@ -0,0 +1,155 @@
+import re
+
+from django.core.cache import cache
+from django.db import IntegrityError, connection, transaction
+
+from .models import Location, LocationAlias
+
+# --- Normalised locations ---
+# Client.location stays free text for display; resolved_location points
+# at one canonical Location so job_list can filter on an indexed id.
+
+# Seeded by migration 0008; new spellings are added as they are resolved
+SEED_ALIASES = {
+    'New York': ['new york', 'nyc', 'new york city', 'new york ny', 'ny ny', 'manhattan', 'brooklyn'],
+    'San Francisco': ['san francisco', 'sf', 'san francisco ca', 'bay area', 'sf bay area'],
+    'Los Angeles': ['los angeles', 'los angeles ca'],
+    'London': ['london', 'london uk', 'london england'],
+    'Dhaka': ['dhaka', 'dhaka bangladesh', 'dacca'],
+    'Remote': ['remote', 'anywhere', 'worldwide', 'work from home', 'wfh'],
+}
+
+_PUNCT_RE = re.compile(r'[^\w\s]')
+_SPACE_RE = re.compile(r'\s+')
+
+LOCATIONS_CACHE_KEY = 'locations:with_jobs'
+
+
+def normalize(text):
+    """'  New York, NY.' -> 'new york ny'"""
+    text = _PUNCT_RE.sub(' ', (text or '').lower())
+    return _SPACE_RE.sub(' ', text).strip()
+
+
+def _lookup(cursor, key):
+    cursor.execute("SELECT location_id FROM core_locationalias WHERE alias = %s", [key])
+    row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def _add_alias(key, location_id):
+    try:
+        with transaction.atomic():
+            LocationAlias.objects.create(alias=key, location_id=location_id)
+    except IntegrityError:
+        pass  # Another request added it first
+
+
+def resolve_location(text):
+    """Location id for free text, creating a new Location if nothing matches"""
+    key = normalize(text)
+    if not key:
+        return None
+
+    with connection.cursor() as cursor:
+        location_id = _lookup(cursor, key)
+        if location_id:
+            return location_id
+
+        # "Austin, TX" -> try "austin" before giving up
+        if ',' in text:
+            head = normalize(text.split(',')[0])
+            location_id = _lookup(cursor, head) if head else None
+            if location_id:
+                _add_alias(key, location_id)
+                return location_id
+
+    name = _SPACE_RE.sub(' ', text.strip())
+    if name.islower():
+        name = name.title()
+    try:
+        with transaction.atomic():
+            location, _ = Location.objects.get_or_create(name=name[:255])
+    except IntegrityError:
+        location = Location.objects.get(name=name[:255])
+    _add_alias(key, location.id)
+    return location.id
+
+
+def adjust_job_count(location_id, delta):
+    if not location_id or not delta:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            UPDATE core_location
+            SET job_count = CASE WHEN job_count + %s < 0 THEN 0 ELSE job_count + %s END
+            WHERE id = %s
+        """, [delta, delta, location_id])
+    cache.delete(LOCATIONS_CACHE_KEY)
+
+
+def counted_location(job_id):
+    """Location whose job_count includes this job (active, client resolved), or None"""
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT c.resolved_location_id
+            FROM core_joblisting j
+            JOIN core_client c ON j.client_id = c.id
+            WHERE j.id = %s AND j.is_active = 1
+        """, [job_id])
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def client_location(client_id):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT resolved_location_id FROM core_client WHERE id = %s", [client_id])
+        row = cursor.fetchone()
+    return row[0] if row else None
+
+
+def move_client_jobs(client_id, old_location_id, new_location_id):
+    """A client changed location: move their active jobs between the counts"""
+    if old_location_id == new_location_id:
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM core_joblisting WHERE client_id = %s AND is_active = 1", [client_id])
+        active = cursor.fetchone()[0]
+    adjust_job_count(old_location_id, -active)
+    adjust_job_count(new_location_id, active)
+
+
+def recompute_job_counts():
+    """Exact recount in one grouped pass; corrects drift from admin edits"""
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute("UPDATE core_location SET job_count = 0")
+        cursor.execute("""
+            SELECT c.resolved_location_id, COUNT(*)
+            FROM core_joblisting j
+            JOIN core_client c ON j.client_id = c.id
+            WHERE j.is_active = 1 AND c.resolved_location_id IS NOT NULL
+            GROUP BY c.resolved_location_id
+        """)
+        counts = cursor.fetchall()
+        cursor.executemany(
+            "UPDATE core_location SET job_count = %s WHERE id = %s",
+            [(n, location_id) for location_id, n in counts]
+        )
+    cache.delete(LOCATIONS_CACHE_KEY)
+    return len(counts)
+
+
+def get_locations():
+    """Locations that currently have jobs, busiest first (job_list filter)"""
+    locations = cache.get(LOCATIONS_CACHE_KEY)
+    if locations is None:
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT id, name, job_count FROM core_location
+                WHERE job_count > 0
+                ORDER BY job_count DESC, name
+            """)
+            columns = [col[0] for col in cursor.description]
+            locations = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        cache.set(LOCATIONS_CACHE_KEY, locations, 60 * 5)
+    return locations
@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from core.locations import recompute_job_counts, resolve_location
+
+
+class Command(BaseCommand):
+    help = "Resolve free-text Client.location into normalised locations, in batches, then recount jobs"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        resolved = {}  # free text -> location id, shared across batches
+        last_id = 0
+        total = 0
+
+        while True:
+            with connection.cursor() as cursor:
+                cursor.execute("""
+                    SELECT id, location FROM core_client
+                    WHERE id > %s AND resolved_location_id IS NULL
+                      AND location IS NOT NULL AND location <> ''
+                    ORDER BY id
+                    LIMIT %s
+                """, [last_id, batch_size])
+                rows = cursor.fetchall()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+
+            by_location = {}
+            for client_id, text in rows:
+                if text not in resolved:
+                    resolved[text] = resolve_location(text)
+                if resolved[text]:
+                    by_location.setdefault(resolved[text], []).append(client_id)
+
+            # One UPDATE per distinct location in the batch
+            with transaction.atomic(), connection.cursor() as cursor:
+                for location_id, client_ids in by_location.items():
+                    placeholders = ', '.join(['%s'] * len(client_ids))
+                    cursor.execute(
+                        f"UPDATE core_client SET resolved_location_id = %s WHERE id IN ({placeholders})",
+                        [location_id] + client_ids
+                    )
+
+            total += len(rows)
+            self.stdout.write(f"Resolved {total} clients (up to id {last_id})")
+
+        locations = recompute_job_counts()
+        self.stdout.write(self.style.SUCCESS(f"Done. {total} clients resolved, {locations} locations with jobs."))
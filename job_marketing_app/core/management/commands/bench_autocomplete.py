@@ -0,0 +1,72 @@
+import random
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+
+from core.autocomplete import PrefixIndex, get_config, title_terms
+
+SYLLABLES = (
+    "py dev ops data web app front back end script cloud net soft ware design er ist man ager "
+    "lead ana lyt ics mark eting wri ter edi tor sec ure mo bile test qa sup port "
+    "lo go brand shop ify word press fig ma ux ui ml bot auto mation"
+).split()
+
+
+def make_term(rng):
+    return ''.join(rng.choices(SYLLABLES, k=rng.randint(2, 4))).capitalize()
+
+
+class Command(BaseCommand):
+    help = "Benchmark autocomplete lookups and report the index memory footprint (no database)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--titles', type=int, default=200_000)
+        parser.add_argument('--queries', type=int, default=20_000)
+
+    def handle(self, *args, **options):
+        rng = random.Random(0)
+        vocabulary = [make_term(rng) for _ in range(5000)]
+        counts = {}
+        for _ in range(options['titles']):
+            # Zipf-ish: a few words are in most titles
+            words = [vocabulary[min(int(rng.paretovariate(1.2)) - 1, len(vocabulary) - 1)] for _ in range(3)]
+            for term in title_terms(' '.join(words)):
+                counts[term] = counts.get(term, 0) + 1
+
+        config = get_config()
+        tracemalloc.start()
+        start = time.perf_counter()
+        index = PrefixIndex(
+            counts, config['PRECOMPUTE_PREFIX_LENGTH'], config['MAX_RESULTS'], config['PRECOMPUTE_MIN_RANGE']
+        )
+        build = time.perf_counter() - start
+        traced, _peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.stdout.write(
+            f"Built index of {len(index):,} terms from {options['titles']:,} titles in {build * 1000:.0f} ms"
+        )
+        self.stdout.write(
+            f"Memory: {traced / 2**20:.1f} MiB allocated (tracemalloc), "
+            f"{index.memory_bytes() / 2**20:.1f} MiB estimated, "
+            f"{len(index.top):,} precomputed prefixes"
+        )
+
+        keys = index.keys
+        for label, lengths in (('short (1-3 chars)', (1, 3)), ('long (4-8 chars)', (4, 8))):
+            timings = []
+            for _ in range(options['queries']):
+                key = keys[rng.randrange(len(keys))]
+                prefix = key[:rng.randint(*lengths)]
+                t0 = time.perf_counter()
+                index.complete(prefix)
+                timings.append(time.perf_counter() - t0)
+            timings.sort()
+            p50 = timings[len(timings) // 2] * 1000
+            p99 = timings[int(len(timings) * 0.99)] * 1000
+            self.stdout.write(f"Lookup {label}: p50 {p50:.4f} ms, p99 {p99:.4f} ms")
+
+        start = time.perf_counter()
+        for _ in range(1000):
+            index.add(make_term(rng))
+        self.stdout.write(f"Incremental add: {(time.perf_counter() - start):.3f} ms per term")
@@ -0,0 +1,67 @@
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# Runs in a fresh interpreter so nothing is warm yet
+CHILD = r"""
+import json, os, sys, time
+start = time.perf_counter()
+from job_market.wsgi import application
+from job_market import warmup
+if warmup.is_enabled():
+    warmup.warm_connections()
+ready = time.perf_counter()
+
+from django.test import Client
+client = Client(HTTP_HOST='localhost')
+timings = []
+for _ in range(2):
+    t0 = time.perf_counter()
+    status = client.get(sys.argv[1]).status_code
+    timings.append(time.perf_counter() - t0)
+
+print(json.dumps({
+    'ready_ms': (ready - start) * 1000,
+    'first_ms': timings[0] * 1000,
+    'second_ms': timings[1] * 1000,
+    'status': status,
+}))
+"""
+
+
+class Command(BaseCommand):
+    help = "Measure time to first request and first-request latency with and without worker warm-up"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default='/jobs/')
+        parser.add_argument('--runs', type=int, default=5)
+
+    def run_child(self, path, warm):
+        env = dict(os.environ, DJANGO_WARMUP='1' if warm else '0')
+        env.setdefault('DJANGO_SETTINGS_MODULE', os.environ.get('DJANGO_SETTINGS_MODULE', 'job_market.settings'))
+        out = subprocess.run(
+            [sys.executable, '-c', CHILD, path],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True, check=True,
+        )
+        return json.loads(out.stdout.strip().splitlines()[-1])
+
+    def handle(self, *args, **options):
+        path = options['path']
+        self.stdout.write(f"{'':10} {'ready':>10} {'1st req':>10} {'2nd req':>10} {'ready+1st':>10}")
+        for warm in (False, True):
+            results = [self.run_child(path, warm) for _ in range(options['runs'])]
+
+            def median(key):
+                values = sorted(r[key] for r in results)
+                return values[len(values) // 2]
+
+            label = 'warm-up' if warm else 'cold'
+            self.stdout.write(
+                f"{label:10} {median('ready_ms'):8.1f}ms {median('first_ms'):8.1f}ms "
+                f"{median('second_ms'):8.1f}ms {median('ready_ms') + median('first_ms'):8.1f}ms"
+                f"  (HTTP {results[-1]['status']}, median of {len(results)})"
+            )
@@ -0,0 +1,105 @@
+import os
+import tempfile
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.utils import load_backend
+
+from core.pool import PooledDatabaseWrapperMixin, close_pools, get_pool_config
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+class Command(BaseCommand):
+    help = (
+        "Load test: concurrent 'requests' (connect, one raw cursor query, close) against the "
+        "configured database, with per-request connections and with the connection pool"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--requests', type=int, default=500, help="per thread")
+        parser.add_argument('--pool-size', type=int, default=None, help="defaults to --threads")
+
+    def handle(self, *args, **options):
+        settings_dict = dict(connections[options['database']].settings_dict)
+        settings_dict['OPTIONS'] = {k: v for k, v in settings_dict['OPTIONS'].items() if k != 'POOL'}
+        settings_dict['CONN_MAX_AGE'] = 0
+        plain_class = load_backend(settings_dict['ENGINE']).DatabaseWrapper
+        tmp = None
+        if getattr(plain_class(settings_dict), 'is_in_memory_db', lambda: False)():
+            # An in-memory sqlite connection is never really closed; use a file
+            fd, tmp = tempfile.mkstemp(suffix='.sqlite3')
+            os.close(fd)
+            settings_dict['NAME'] = tmp
+
+        pooled_class = plain_class
+        if not issubclass(plain_class, PooledDatabaseWrapperMixin):
+            pooled_class = type('Pooled' + plain_class.__name__, (PooledDatabaseWrapperMixin, plain_class), {})
+
+        pooled_settings = dict(settings_dict, OPTIONS=dict(settings_dict['OPTIONS'], POOL={
+            'MAX_SIZE': options['pool_size'] or options['threads'],
+            'PUBLISH_INTERVAL': 3600,
+        }))
+        self.stdout.write(
+            f"{settings_dict['ENGINE']}: {options['threads']} threads x {options['requests']} requests"
+        )
+        self.stdout.write(f"{'':12} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+        try:
+            for label, wrapper_class, wrapper_settings in (
+                ('no pool', plain_class, settings_dict),
+                ('pool', pooled_class, pooled_settings),
+            ):
+                timings, elapsed = self.run(wrapper_class, wrapper_settings, options)
+                self.stdout.write(
+                    f"{label:12} {len(timings) / elapsed:8.0f} "
+                    + ' '.join(f"{percentile(timings, p):6.2f}ms" for p in (0.5, 0.95, 0.99))
+                    + f" {max(timings):6.2f}ms"
+                )
+            pool_config = get_pool_config(pooled_settings)
+            stats = pooled_class(pooled_settings, alias='bench_db_pool').pool.snapshot()
+            self.stdout.write(
+                f"Pool (MAX_SIZE {pool_config['MAX_SIZE']}): {stats['created']} connections opened "
+                f"for {stats['checkouts']:,} checkouts, wait avg "
+                f"{stats['wait_ms_total'] / max(stats['checkouts'], 1):.3f} ms / max {stats['wait_ms_max']:.1f} ms, "
+                f"{stats['timeouts']} timeouts"
+            )
+        finally:
+            close_pools('bench_db_pool')
+            if tmp:
+                os.unlink(tmp)
+
+    def run(self, wrapper_class, settings_dict, options):
+        timings = []
+        lock = threading.Lock()
+        barrier = threading.Barrier(options['threads'] + 1)
+
+        def worker():
+            wrapper = wrapper_class(dict(settings_dict), alias='bench_db_pool')
+            local = []
+            barrier.wait()
+            for _ in range(options['requests']):
+                start = time.perf_counter()
+                with wrapper.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                    cursor.fetchone()
+                # What the request_finished handler does with CONN_MAX_AGE = 0
+                wrapper.close()
+                local.append((time.perf_counter() - start) * 1000)
+            with lock:
+                timings.extend(local)
+
+        threads = [threading.Thread(target=worker) for _ in range(options['threads'])]
+        for thread in threads:
+            thread.start()
+        barrier.wait()
+        start = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        return timings, time.perf_counter() - start
@@ -0,0 +1,159 @@
+import os
+import random
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from core.models import Client, JobListing
+from core.similarity import band_keys, estimate_similarity, find_similar, minhash
+
+WORDS = (
+    "python django react developer designer senior junior remote contract website mobile app "
+    "backend frontend api database mysql postgres cloud aws devops marketing seo writer content "
+    "video editor logo brand ecommerce shopify wordpress data analyst machine learning scraping "
+    "automation testing qa support translation spanish french illustration figma ui ux"
+).split()
+
+
+def make_listing(seed):
+    rng = random.Random(seed)
+    title = ' '.join(rng.choices(WORDS, k=4))
+    description = ' '.join(rng.choices(WORDS, k=40))
+    return title, description
+
+
+def signatures_for(seeds):
+    out = []
+    for seed in seeds:
+        title, description = make_listing(seed)
+        sig = minhash(title, description)
+        out.append((seed, sig, band_keys(sig)))
+    return out
+
+
+def near_duplicate(rng, n):
+    """A listing's seed and its signature with one description word changed"""
+    target = rng.randrange(n)
+    title, description = make_listing(target)
+    words = description.split()
+    words[rng.randrange(len(words))] = rng.choice(WORDS)
+    return target, minhash(title, ' '.join(words))
+
+
+def percentiles(timings):
+    timings = sorted(timings)
+    return timings[len(timings) // 2] * 1000, timings[int(len(timings) * 0.99)] * 1000
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark MinHash signing and LSH lookups on synthetic listings. By default the index "
+        "is kept in memory; --db writes it to the configured database and times find_similar() "
+        "(everything is rolled back afterwards)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--n', type=int, default=1_000_000)
+        parser.add_argument('--workers', type=int, default=os.cpu_count())
+        parser.add_argument('--queries', type=int, default=1000)
+        parser.add_argument('--db', action='store_true', help="benchmark the database-backed find_similar()")
+
+    def signatures(self, n, workers):
+        chunk = 2000
+        seeds = [range(i, min(i + chunk, n)) for i in range(0, n, chunk)]
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            yield from pool.map(signatures_for, seeds)
+
+    def handle(self, *args, **options):
+        if options['db']:
+            self.bench_database(options)
+        else:
+            self.bench_memory(options)
+
+    def bench_memory(self, options):
+        n = options['n']
+        start = time.perf_counter()
+        signatures = {}
+        buckets = defaultdict(list)
+        for rows in self.signatures(n, options['workers']):
+            for job_id, sig, keys in rows:
+                signatures[job_id] = sig
+                for key in keys:
+                    buckets[key].append(job_id)
+        build = time.perf_counter() - start
+        self.stdout.write(
+            f"Built in-memory index for {n:,} listings in {build:.1f}s "
+            f"({n / build:,.0f} listings/s, {options['workers']} workers, {len(buckets):,} buckets)"
+        )
+
+        rng = random.Random(0)
+        timings = []
+        found = 0
+        for _ in range(options['queries']):
+            target, sig = near_duplicate(rng, n)
+            t0 = time.perf_counter()
+            candidates = set()
+            for key in band_keys(sig):
+                candidates.update(buckets.get(key, ()))
+            best = max(candidates, key=lambda c: estimate_similarity(sig, signatures[c]), default=None)
+            timings.append(time.perf_counter() - t0)
+            found += best == target
+
+        p50, p99 = percentiles(timings)
+        self.stdout.write(
+            f"Lookup (signature -> best match): p50 {p50:.3f} ms, p99 {p99:.3f} ms, "
+            f"near-duplicate recall {found / len(timings):.1%}"
+        )
+
+    def bench_database(self, options):
+        n = options['n']
+        with transaction.atomic():
+            user = get_user_model().objects.create(username=f'bench-similarity-{os.getpid()}', is_client=True)
+            client = Client.objects.create(user=user)
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT COALESCE(MAX(id), 0) FROM core_joblisting")
+                base = cursor.fetchone()[0] + 1
+
+            start = time.perf_counter()
+            with connection.cursor() as cursor:
+                for rows in self.signatures(n, options['workers']):
+                    jobs = []
+                    for seed, _, _ in rows:
+                        title, description = make_listing(seed)
+                        jobs.append(JobListing(
+                            id=base + seed, client=client, title=title, description=description, budget=10
+                        ))
+                    JobListing.objects.bulk_create(jobs)
+                    cursor.executemany(
+                        "INSERT INTO core_jobsignature (job_id, minhash) VALUES (%s, %s)",
+                        [(base + seed, sig.tobytes()) for seed, sig, _ in rows]
+                    )
+                    cursor.executemany(
+                        "INSERT INTO core_joblshbucket (bucket, job_id) VALUES (%s, %s)",
+                        [(key, base + seed) for seed, _, keys in rows for key in keys]
+                    )
+            build = time.perf_counter() - start
+            self.stdout.write(
+                f"Indexed {n:,} listings into {connection.vendor} in {build:.1f}s ({n / build:,.0f} listings/s)"
+            )
+
+            rng = random.Random(0)
+            timings = []
+            found = 0
+            for _ in range(options['queries']):
+                target, sig = near_duplicate(rng, n)
+                t0 = time.perf_counter()
+                best = find_similar(sig, threshold=0, limit=1)
+                timings.append(time.perf_counter() - t0)
+                found += bool(best) and best[0]['id'] == base + target
+
+            p50, p99 = percentiles(timings)
+            self.stdout.write(
+                f"find_similar() (signature -> best match): p50 {p50:.3f} ms, p99 {p99:.3f} ms, "
+                f"near-duplicate recall {found / len(timings):.1%}"
+            )
+            transaction.set_rollback(True)
@@ -0,0 +1,72 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from core.similarity import band_keys, minhash
+
+
+def signature_rows(jobs):
+    """Runs in a worker process: (job_id, title, description) -> rows to insert"""
+    signatures = []
+    buckets = []
+    for job_id, title, description in jobs:
+        sig = minhash(title, description or '')
+        signatures.append((job_id, sig.tobytes()))
+        buckets.extend((key, job_id) for key in band_keys(sig))
+    return signatures, buckets
+
+
+class Command(BaseCommand):
+    help = "Build the MinHash/LSH similar-jobs index for jobs that are not indexed yet"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--workers', type=int, default=os.cpu_count())
+        parser.add_argument('--rebuild', action='store_true', help="Drop the index and rebuild every job")
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        workers = options['workers']
+
+        if options['rebuild']:
+            with connection.cursor() as cursor:
+                cursor.execute("DELETE FROM core_joblshbucket")
+                cursor.execute("DELETE FROM core_jobsignature")
+
+        total = 0
+        last_id = 0
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            while True:
+                with connection.cursor() as cursor:
+                    cursor.execute("""
+                        SELECT j.id, j.title, j.description
+                        FROM core_joblisting j
+                        LEFT JOIN core_jobsignature s ON s.job_id = j.id
+                        WHERE j.id > %s AND s.job_id IS NULL
+                        ORDER BY j.id
+                        LIMIT %s
+                    """, [last_id, batch_size])
+                    jobs = cursor.fetchall()
+                if not jobs:
+                    break
+                last_id = jobs[-1][0]
+
+                # Split the batch so every worker gets a share
+                step = max(1, len(jobs) // workers)
+                chunks = [jobs[i:i + step] for i in range(0, len(jobs), step)]
+
+                with transaction.atomic(), connection.cursor() as cursor:
+                    for signatures, buckets in pool.map(signature_rows, chunks):
+                        cursor.executemany(
+                            "INSERT INTO core_jobsignature (job_id, minhash) VALUES (%s, %s)", signatures
+                        )
+                        cursor.executemany(
+                            "INSERT INTO core_joblshbucket (bucket, job_id) VALUES (%s, %s)", buckets
+                        )
+
+                total += len(jobs)
+                self.stdout.write(f"Indexed {total} jobs (up to id {last_id})")
+
+        self.stdout.write(self.style.SUCCESS(f"Done. {total} jobs indexed."))
@@ -0,0 +1,43 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.bulk_delete import KINDS, bulk_delete, count_dependents
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete users, clients, freelancers or jobs and everything under them in small "
+        "set-based batches. Safe to re-run after an interruption: it resumes where it stopped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=sorted(KINDS))
+        parser.add_argument('ids', nargs='*', type=int)
+        parser.add_argument('--ids-file', help="File with one id per line")
+        parser.add_argument('--batch-size', type=int, default=None)
+        parser.add_argument('--dry-run', action='store_true', help="Only count what would be deleted")
+
+    def handle(self, *args, **options):
+        ids = list(options['ids'])
+        if options['ids_file']:
+            with open(options['ids_file']) as f:
+                ids += [int(line) for line in f if line.strip()]
+        if not ids:
+            raise CommandError("Give at least one id, or --ids-file.")
+
+        counts = count_dependents(options['kind'], ids)
+        for table, n in counts.items():
+            self.stdout.write(f"{table}: {n} row(s)")
+        if options['dry_run']:
+            return
+
+        def progress(table, deleted):
+            self.stdout.write(f"  {table}: {deleted} deleted so far")
+
+        start = time.perf_counter()
+        deleted = bulk_delete(options['kind'], ids, options['batch_size'], progress)
+        summary = ', '.join(f"{table} {n}" for table, n in deleted.items() if n)
+        self.stdout.write(self.style.SUCCESS(
+            f"Done in {time.perf_counter() - start:.1f}s. Deleted: {summary or 'nothing'}."
+        ))
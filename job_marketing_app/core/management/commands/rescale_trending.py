@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.trending import rescale
+
+
+class Command(BaseCommand):
+    help = "Move the trending epoch to now and rescale stored scores (run e.g. daily from cron)"
+
+    def handle(self, *args, **options):
+        rescaled, factor = rescale()
+        self.stdout.write(self.style.SUCCESS(f"Rescaled {rescaled} job(s) by {factor:.6g}."))
@@ -0,0 +1,24 @@
+import logging
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.reminders import LocalQueue, ReminderScheduler
+
+
+class Command(BaseCommand):
+    help = "Run the interview reminder scheduler (one instance per deployment; restart it on exit)"
+
+    def handle(self, *args, **options):
+        logging.basicConfig(level=logging.INFO)
+        scheduler = ReminderScheduler()
+        if isinstance(scheduler.changes, LocalQueue):
+            # The web processes' schedule/reschedule messages would never arrive
+            raise CommandError(
+                "INTERVIEW_REMINDERS['QUEUE'] is LocalQueue, which only works inside one process; "
+                "use core.reminders.DatabaseQueue or core.reminders.RedisQueue"
+            )
+        self.stdout.write("Interview reminder scheduler started.")
+        try:
+            scheduler.run_forever()
+        except KeyboardInterrupt:
+            self.stdout.write(f"Stopped after sending {scheduler.sent} reminder(s).")
@@ -0,0 +1,32 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from core.querylog import HISTOGRAM_BOUNDS, top_fingerprints
+
+
+class Command(BaseCommand):
+    help = "List the most expensive SQL fingerprints recorded by the query observer across workers"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=20)
+        parser.add_argument('--order-by', choices=['total_ms', 'count', 'max_ms'], default='total_ms')
+        parser.add_argument('--explain', action='store_true', help="Show captured EXPLAIN plans")
+
+    def handle(self, *args, **options):
+        rows = top_fingerprints(limit=options['limit'], order_by=options['order_by'])
+        if not rows:
+            self.stdout.write("No queries recorded yet.")
+            return
+
+        labels = [f"<{b}ms" for b in HISTOGRAM_BOUNDS] + [f">={HISTOGRAM_BOUNDS[-1]}ms"]
+        for i, row in enumerate(rows, 1):
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f"#{i}  total {row['total_ms']:.1f}ms  count {row['count']}  "
+                f"avg {row['avg_ms']:.2f}ms  max {row['max_ms']:.1f}ms"
+            ))
+            self.stdout.write(f"    {row['fingerprint']}")
+            histogram = ', '.join(f"{label}: {n}" for label, n in zip(labels, row['histogram']) if n)
+            self.stdout.write(f"    {histogram}")
+            if options['explain'] and row['explain']:
+                self.stdout.write(f"    EXPLAIN: {json.dumps(row['explain'], default=str)}")
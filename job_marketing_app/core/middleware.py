@@ -0,0 +1,206 @@
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+
+# --- Admission Control ---
+# Counters live in a Django cache so every gunicorn worker sees the same
+# numbers. In production point the alias at Redis (see CACHES in settings);
+# tests and local runs fall back to the in-memory LocMemCache.
+
+DEFAULTS = {
+    'CACHE_ALIAS': 'default',
+    'KEY_PREFIX': 'admission',
+    # url name -> {'concurrency': max running, 'queue': max waiting, 'timeout': seconds to wait}
+    'LIMITS': {},
+    # url name -> {'rate': tokens per second, 'burst': bucket size}, POST only
+    'RATE_LIMITS': {},
+    'POLL_INTERVAL': 0.05,
+    # Counters expire so a worker killed mid-request can't leak a slot forever
+    'COUNTER_TTL': 300,
+}
+
+
+def get_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, 'ADMISSION_CONTROL', {}))
+    return config
+
+
+def _store(config):
+    return caches[config['CACHE_ALIAS']]
+
+
+def _incr(store, key, ttl, delta=1):
+    """
+    Atomic increment that creates the key on first use. Each call pushes
+    the expiry out again, so a counter in use never expires under its
+    in-flight requests; only one left idle for `ttl` seconds does.
+    """
+    store.add(key, 0, ttl)
+    try:
+        value = store.incr(key, delta)
+    except ValueError:
+        # Key expired between add() and incr()
+        store.add(key, 0, ttl)
+        value = store.incr(key, delta)
+    if ttl is not None:
+        store.touch(key, ttl)
+    return value
+
+
+def _decr(store, key, ttl):
+    value = _incr(store, key, ttl, -1)
+    if value < 0:
+        # The counter was lost (evicted or flushed) while requests held it
+        value = store.incr(key, -value)
+    return value
+
+
+def record_rejection(config, url_name, reason):
+    store = _store(config)
+    _incr(store, f"{config['KEY_PREFIX']}:rejected:{url_name}:{reason}", None)
+    _incr(store, f"{config['KEY_PREFIX']}:rejected:total", None)
+
+
+def rejection_metrics():
+    """Return rejection counts per url name and reason"""
+    config = get_config()
+    store = _store(config)
+    prefix = config['KEY_PREFIX']
+
+    keys = {}
+    for url_name in set(config['LIMITS']) | set(config['RATE_LIMITS']):
+        for reason in ('overloaded', 'queue_timeout', 'rate_limited'):
+            keys[f"{prefix}:rejected:{url_name}:{reason}"] = (url_name, reason)
+
+    values = store.get_many(list(keys) + [f"{prefix}:rejected:total"])
+    metrics = {'total': values.get(f"{prefix}:rejected:total", 0), 'endpoints': {}}
+    for key, (url_name, reason) in keys.items():
+        if values.get(key):
+            metrics['endpoints'].setdefault(url_name, {})[reason] = values[key]
+    return metrics
+
+
+def _rejected(status, retry_after, message):
+    response = HttpResponse(message, status=status, content_type='text/plain')
+    response['Retry-After'] = str(max(1, math.ceil(retry_after)))
+    return response
+
+
+def acquire_slot(config, url_name, limit):
+    """
+    Try to take one of the endpoint's concurrency slots.
+    Returns None on success or the reason the request was rejected.
+    """
+    store = _store(config)
+    ttl = config['COUNTER_TTL']
+    active_key = f"{config['KEY_PREFIX']}:active:{url_name}"
+    waiting_key = f"{config['KEY_PREFIX']}:waiting:{url_name}"
+
+    if _incr(store, active_key, ttl) <= limit['concurrency']:
+        return None
+    _decr(store, active_key, ttl)
+
+    # All slots busy: join the queue if there is room, otherwise fail fast
+    if _incr(store, waiting_key, ttl) > limit.get('queue', 0):
+        _decr(store, waiting_key, ttl)
+        return 'overloaded'
+
+    try:
+        deadline = time.monotonic() + limit.get('timeout', 1.0)
+        while time.monotonic() < deadline:
+            time.sleep(config['POLL_INTERVAL'])
+            if _incr(store, active_key, ttl) <= limit['concurrency']:
+                return None
+            _decr(store, active_key, ttl)
+        return 'queue_timeout'
+    finally:
+        _decr(store, waiting_key, ttl)
+
+
+def release_slot(config, url_name):
+    store = _store(config)
+    _decr(store, f"{config['KEY_PREFIX']}:active:{url_name}", config['COUNTER_TTL'])
+
+
+def take_token(config, url_name, identity, rate_limit):
+    """
+    Rate limit per user and endpoint: `burst` requests per burst / rate
+    seconds, counted over a sliding window (the current window's count
+    plus the previous one's, weighted by how much of it still overlaps).
+    Counts are cache.incr()s, so concurrent requests can't both spend
+    the same token. Returns 0 if allowed, otherwise seconds to wait.
+    """
+    store = _store(config)
+    rate = rate_limit['rate']
+    burst = rate_limit['burst']
+    period = burst / rate
+    now = time.time()
+    window = int(now // period)
+    overlap = 1 - (now - window * period) / period
+    key = f"{config['KEY_PREFIX']}:bucket:{url_name}:{identity}"
+    # The previous window is read until this one ends
+    ttl = math.ceil(2 * period)
+
+    current = _incr(store, f"{key}:{window}", ttl)
+    previous = store.get(f"{key}:{window - 1}", 0)
+    if previous * overlap + current <= burst:
+        return 0
+
+    # Rejected requests don't count
+    current = _decr(store, f"{key}:{window}", ttl)
+    if current + 1 > burst or not previous:
+        # Full on its own: wait for the next window
+        return overlap * period
+    # Wait until enough of the previous window has slid out
+    return (previous * overlap + current + 1 - burst) * period / previous
+
+
+class AdmissionControlMiddleware:
+    """
+    Sheds load per URL name (from core/urls.py) before the view runs.
+    Expensive pages get a concurrency + queue limit (503 when full),
+    write endpoints get a per-user token bucket (429 when empty).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request._admission_slot = None
+        try:
+            return self.get_response(request)
+        finally:
+            if request._admission_slot:
+                release_slot(get_config(), request._admission_slot)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        url_name = request.resolver_match.url_name if request.resolver_match else None
+        if not url_name:
+            return None
+
+        config = get_config()
+
+        rate_limit = config['RATE_LIMITS'].get(url_name)
+        if rate_limit and request.method == 'POST':
+            if request.user.is_authenticated:
+                identity = f"user:{request.user.id}"
+            else:
+                identity = f"ip:{request.META.get('REMOTE_ADDR')}"
+            wait = take_token(config, url_name, identity, rate_limit)
+            if wait:
+                record_rejection(config, url_name, 'rate_limited')
+                return _rejected(429, wait, 'Too many requests, please slow down.')
+
+        limit = config['LIMITS'].get(url_name)
+        if limit:
+            reason = acquire_slot(config, url_name, limit)
+            if reason:
+                record_rejection(config, url_name, reason)
+                return _rejected(503, limit.get('retry_after', 1), 'Server is busy, please try again shortly.')
+            request._admission_slot = url_name
+
+        return None
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_remove_verification_user_remove_client_description_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='application',
+            name='status',
+            field=models.CharField(db_index=True, default='Pending', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='joblisting',
+            name='is_active',
+            field=models.BooleanField(db_index=True, default=True),
+        ),
+    ]
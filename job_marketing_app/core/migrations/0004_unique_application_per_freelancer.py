@@ -0,0 +1,58 @@
+from django.db import migrations, models
+from django.db.models import Count
+
+BATCH_SIZE = 1000
+
+
+def remove_duplicate_applications(apps, schema_editor):
+    """
+    Keep one application per (job, freelancer) before adding the constraint.
+    The one with an interview wins, otherwise the oldest.
+    """
+    Application = apps.get_model('core', 'Application')
+    Interview = apps.get_model('core', 'Interview')
+
+    duplicates = (
+        Application.objects.values('job_id', 'freelancer_id')
+        .annotate(n=Count('id'))
+        .filter(n__gt=1)
+        .order_by()
+    )
+
+    to_delete = []
+    for dup in duplicates.iterator():
+        ids = list(
+            Application.objects.filter(job_id=dup['job_id'], freelancer_id=dup['freelancer_id'])
+            .order_by('id')
+            .values_list('id', flat=True)
+        )
+        with_interview = set(
+            Interview.objects.filter(application_id__in=ids).values_list('application_id', flat=True)
+        )
+        keep = next((i for i in ids if i in with_interview), ids[0])
+        to_delete.extend(i for i in ids if i != keep)
+
+        if len(to_delete) >= BATCH_SIZE:
+            Application.objects.filter(id__in=to_delete).delete()
+            to_delete = []
+
+    if to_delete:
+        Application.objects.filter(id__in=to_delete).delete()
+
+
+class Migration(migrations.Migration):
+
+    # Each batch commits on its own so a big cleanup doesn't hold one huge transaction
+    atomic = False
+
+    dependencies = [
+        ('core', '0003_admin_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_applications, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='application',
+            constraint=models.UniqueConstraint(fields=('job', 'freelancer'), name='unique_application_per_freelancer'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_job_similarity_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='joblisting',
+            name='views',
+            field=models.PositiveIntegerField(db_index=True, default=0),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:40
+
+import time
+
+from django.db import migrations, models
+
+HALF_LIFE = 24 * 3600
+
+
+def seed_trending(apps, schema_editor):
+    """Create the epoch row and score existing applications from their timestamps"""
+    TrendingState = apps.get_model('core', 'TrendingState')
+    Application = apps.get_model('core', 'Application')
+    JobListing = apps.get_model('core', 'JobListing')
+
+    epoch = int(time.time())
+    TrendingState.objects.update_or_create(id=1, defaults={'epoch': epoch})
+
+    scores = {}
+    for job_id, created_at in Application.objects.values_list('job_id', 'created_at').iterator(chunk_size=5000):
+        w = 2 ** ((created_at.timestamp() - epoch) / HALF_LIFE)
+        scores[job_id] = scores.get(job_id, 0) + w
+
+    batch = [JobListing(id=job_id, trending_score=score) for job_id, score in scores.items() if score >= 1e-6]
+    JobListing.objects.bulk_update(batch, ['trending_score'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_joblisting_views'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrendingState',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('epoch', models.BigIntegerField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='joblisting',
+            name='trending_score',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='joblisting',
+            index=models.Index(fields=['is_active', '-trending_score'], name='joblisting_trending_idx'),
+        ),
+        migrations.RunPython(seed_trending, migrations.RunPython.noop),
+    ]
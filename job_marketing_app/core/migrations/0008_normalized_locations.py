@@ -0,0 +1,55 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Frozen copy of core.locations.SEED_ALIASES
+SEED_ALIASES = {
+    'New York': ['new york', 'nyc', 'new york city', 'new york ny', 'ny ny', 'manhattan', 'brooklyn'],
+    'San Francisco': ['san francisco', 'sf', 'san francisco ca', 'bay area', 'sf bay area'],
+    'Los Angeles': ['los angeles', 'la', 'los angeles ca'],
+    'London': ['london', 'london uk', 'london england'],
+    'Dhaka': ['dhaka', 'dhaka bangladesh', 'dacca'],
+    'Remote': ['remote', 'anywhere', 'worldwide', 'work from home', 'wfh'],
+}
+
+
+def seed_aliases(apps, schema_editor):
+    Location = apps.get_model('core', 'Location')
+    LocationAlias = apps.get_model('core', 'LocationAlias')
+    for name, aliases in SEED_ALIASES.items():
+        location, _ = Location.objects.get_or_create(name=name)
+        for alias in aliases:
+            LocationAlias.objects.get_or_create(alias=alias, defaults={'location': location})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_trending_score'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Location',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('job_count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='client',
+            name='resolved_location',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='clients', to='core.location'),
+        ),
+        migrations.CreateModel(
+            name='LocationAlias',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('alias', models.CharField(max_length=255, unique=True)),
+                ('location', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='core.location')),
+            ],
+        ),
+        migrations.RunPython(seed_aliases, migrations.RunPython.noop),
+    ]
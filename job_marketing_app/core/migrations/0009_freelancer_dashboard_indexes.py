@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_normalized_locations'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['freelancer', 'created_at', 'id'], name='application_freelancer_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['freelancer', 'status', 'created_at', 'id'], name='application_fl_status_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-19 19:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_freelancer_dashboard_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReminderState',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('dispatched_until', models.BigIntegerField()),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='interview',
+            index=models.Index(fields=['date_time'], name='interview_date_time_idx'),
+        ),
+    ]
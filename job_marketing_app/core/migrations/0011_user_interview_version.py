@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 19:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_interview_reminders'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='interview_version',
+            field=models.BigIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-19 19:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_user_interview_version'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='joblisting',
+            name='joblisting_trending_idx',
+        ),
+        migrations.AddIndex(
+            model_name='joblisting',
+            index=models.Index(fields=['is_active', '-trending_score', '-id'], name='joblisting_trending_idx'),
+        ),
+    ]
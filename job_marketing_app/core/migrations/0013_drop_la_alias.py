@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-19 20:04
+
+from django.db import migrations
+
+
+def drop_la_alias(apps, schema_editor):
+    # "la" is as likely Louisiana as Los Angeles; let it resolve on its own
+    LocationAlias = apps.get_model('core', 'LocationAlias')
+    LocationAlias.objects.filter(alias='la', location__name='Los Angeles').delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_joblisting_trending_idx_id'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_la_alias, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-19 20:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_drop_la_alias'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReminderChange',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('interview_id', models.BigIntegerField()),
+                ('date_time', models.BigIntegerField()),
+                ('queued_at', models.FloatField()),
+            ],
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-19 20:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_reminderchange'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='joblisting',
+            index=models.Index(fields=['is_active', 'title'], name='joblisting_title_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 20:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_joblisting_title_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='reminderchange',
+            name='queued_at',
+            field=models.FloatField(db_index=True),
+        ),
+    ]
@@ -5,12 +5,33 @@ class User(AbstractUser):
     is_client = models.BooleanField(default=False)
     is_freelancer = models.BooleanField(default=False)
     is_admin = models.BooleanField(default=False)
+    # Bumped with every change to the user's interviews; the calendar feed's ETag
+    interview_version = models.BigIntegerField(default=0)
+
+class Location(models.Model):
+    # Canonical place name, e.g. "New York"
+    name = models.CharField(max_length=255, unique=True)
+    # Active jobs posted by clients here; maintained by core/locations.py
+    job_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return self.name
+
+class LocationAlias(models.Model):
+    # Normalised spelling ("nyc", "new york ny") -> Location
+    alias = models.CharField(max_length=255, unique=True)
+    location = models.ForeignKey(Location, on_delete=models.CASCADE, related_name='aliases')
+
+    def __str__(self):
+        return self.alias
 
 class Client(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='client_profile')
     # New fields for Profile Update
     company_name = models.CharField(max_length=255, blank=True, null=True)
     location = models.CharField(max_length=255, blank=True, null=True)
+    # `location` resolved against the alias dictionary on write
+    resolved_location = models.ForeignKey(Location, on_delete=models.SET_NULL, null=True, blank=True, related_name='clients')
 
     def __str__(self):
         return self.company_name or self.user.username
@@ -36,8 +57,20 @@ class JobListing(models.Model):
     description = models.TextField()
     budget = models.DecimalField(max_digits=10, decimal_places=2)
     category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True)
-    is_active = models.BooleanField(default=True)
+    is_active = models.BooleanField(default=True, db_index=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Written in batches by core/view_counter.py
+    views = models.PositiveIntegerField(default=0, db_index=True)
+    # Time-decayed application count, see core/trending.py
+    trending_score = models.FloatField(default=0)
+
+    class Meta:
+        indexes = [
+            # Trending board: ORDER BY trending_score DESC, id DESC LIMIT n
+            models.Index(fields=['is_active', '-trending_score', '-id'], name='joblisting_trending_idx'),
+            # Board search: WHERE is_active = 1 AND title LIKE 'q%'
+            models.Index(fields=['is_active', 'title'], name='joblisting_title_idx'),
+        ]
 
     def __str__(self):
         return self.title
@@ -47,9 +80,20 @@ class Application(models.Model):
     freelancer = models.ForeignKey(Freelancer, on_delete=models.CASCADE, related_name='applications')
     proposal_text = models.TextField()
     expected_payment = models.DecimalField(max_digits=10, decimal_places=2)
-    status = models.CharField(max_length=20, default='Pending') # Pending, Approved, Rejected
+    status = models.CharField(max_length=20, default='Pending', db_index=True) # Pending, Approved, Rejected
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['job', 'freelancer'], name='unique_application_per_freelancer'),
+        ]
+        indexes = [
+            # Freelancer dashboard: keyset pages over (created_at, id), with
+            # and without a status filter, and the per-status counts
+            models.Index(fields=['freelancer', 'created_at', 'id'], name='application_freelancer_idx'),
+            models.Index(fields=['freelancer', 'status', 'created_at', 'id'], name='application_fl_status_idx'),
+        ]
+
     def __str__(self):
         return f"{self.freelancer} applied for {self.job}"
 
@@ -58,6 +102,36 @@ class Interview(models.Model):
     date_time = models.DateTimeField()
     # Stores either a link (https://zoom.us...) or a location (Office Room 4)
     link_or_location = models.CharField(max_length=500)
+
+    class Meta:
+        indexes = [
+            # Reminder scheduler: loads the next window of interviews (core/reminders.py)
+            models.Index(fields=['date_time'], name='interview_date_time_idx'),
+        ]
     
     def __str__(self):
-        return f"Interview for {self.application.job.title}"
\ No newline at end of file
+        return f"Interview for {self.application.job.title}"
+
+class ReminderState(models.Model):
+    # Single row (id=1): every reminder due at or before this unix time has been sent
+    dispatched_until = models.BigIntegerField()
+
+class ReminderChange(models.Model):
+    # Schedule/reschedule messages waiting for the reminder scheduler (reminders.DatabaseQueue)
+    interview_id = models.BigIntegerField()
+    # Unix times: the interview, and when the change was made
+    date_time = models.BigIntegerField()
+    queued_at = models.FloatField(db_index=True)
+
+class TrendingState(models.Model):
+    # Single row (id=1): unix time the stored trending scores are relative to
+    epoch = models.BigIntegerField()
+
+# --- Similar jobs index (see core/similarity.py) ---
+class JobSignature(models.Model):
+    job = models.OneToOneField(JobListing, on_delete=models.CASCADE, primary_key=True, related_name='signature')
+    minhash = models.BinaryField()
+
+class JobLSHBucket(models.Model):
+    bucket = models.BigIntegerField(db_index=True)
+    job = models.ForeignKey(JobListing, on_delete=models.CASCADE, related_name='lsh_buckets')
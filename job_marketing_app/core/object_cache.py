@@ -0,0 +1,242 @@
+import math
+import os
+import random
+import threading
+import time
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+
+from . import worker_metrics
+
+# --- Read-through object cache ---
+# get(id) returns the cached record, or loads it from the database and
+# caches it. Invalidation is a delete once the writing transaction has
+# committed.
+#
+# Stampede protection for popular records:
+#   single flight  on a miss only the request that wins cache.add() on
+#                  the lock key runs the query; the others poll the
+#                  cache for up to LOCK_WAIT seconds, then load it
+#                  themselves rather than fail
+#   early refresh  entries carry a soft expiry and outlive it by
+#                  STALE_TIMEOUT. Near the soft expiry a request refreshes
+#                  with a probability that rises as expiry approaches and
+#                  scales with how long the load takes (XFetch). Only the
+#                  lock holder refreshes; everyone else keeps serving the
+#                  cached value, so a hot key never goes cold.
+#
+# A load that raced with an invalidation (it read the row before the
+# writer committed) is returned but not stored.
+#
+# Counters are per worker and published through worker_metrics for
+# /metrics/object-cache/.
+
+DEFAULTS = {
+    # Seconds until an entry is due for refresh
+    'TIMEOUT': 10 * 60,
+    # Seconds it may still be served while one request refreshes it
+    'STALE_TIMEOUT': 60,
+    # XFetch beta: > 1 refreshes earlier, 0 turns early refresh off
+    'EARLY_REFRESH_BETA': 1.0,
+    'LOCK_TIMEOUT': 10,
+    # Seconds a request waits for another request's load
+    'LOCK_WAIT': 0.5,
+    'PUBLISH_INTERVAL': 10,
+}
+
+POLL_INTERVAL = 0.01
+
+
+def get_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, 'OBJECT_CACHE', {}))
+    return config
+
+
+class ReadThroughCache:
+    def __init__(self, name, loader, config=None):
+        """loader(id) -> record, or None when there is no such row (not cached)"""
+        self.name = name
+        self.loader = loader
+        self.config = config
+        self.lock = threading.Lock()
+        self.last_publish = time.monotonic()
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            # Misses answered by another request's load
+            'coalesced': 0,
+            'early_refreshes': 0,
+            # Expired entries served while another request refreshed them
+            'stale_hits': 0,
+            'loads': 0,
+            'load_ms_total': 0.0,
+            'lock_timeouts': 0,
+            'invalidations': 0,
+        }
+
+    def get_config(self):
+        return self.config or get_config()
+
+    def _key(self, ident):
+        return f"objcache:{self.name}:{ident}"
+
+    def _count(self, name, n=1):
+        with self.lock:
+            self.stats[name] += n
+        if time.monotonic() - self.last_publish >= self.get_config()['PUBLISH_INTERVAL']:
+            publish_metrics()
+
+    def get(self, ident):
+        config = self.get_config()
+        key = self._key(ident)
+        entry = cache.get(key)
+        if entry is not None:
+            now = time.time()
+            if not self._refresh_due(entry, now, config['EARLY_REFRESH_BETA']):
+                self._count('hits')
+                return entry['value']
+            if cache.add(f"{key}:lock", 1, config['LOCK_TIMEOUT']):
+                self._count('early_refreshes')
+                return self._load(ident, key, config, locked=True)
+            self._count('stale_hits' if now >= entry['expires'] else 'hits')
+            return entry['value']
+
+        self._count('misses')
+        if cache.add(f"{key}:lock", 1, config['LOCK_TIMEOUT']):
+            return self._load(ident, key, config, locked=True)
+        deadline = time.monotonic() + config['LOCK_WAIT']
+        while time.monotonic() < deadline:
+            time.sleep(POLL_INTERVAL)
+            entry = cache.get(key)
+            if entry is not None:
+                self._count('coalesced')
+                return entry['value']
+            if cache.get(f"{key}:lock") is None:
+                # The other load found nothing, or wasn't allowed to store it
+                break
+        else:
+            self._count('lock_timeouts')
+        return self._load(ident, key, config, locked=False)
+
+    @staticmethod
+    def _refresh_due(entry, now, beta):
+        # XFetch: now - delta * beta * ln(rand) >= expiry
+        return now - entry['delta'] * beta * math.log(random.random() or 1e-12) >= entry['expires']
+
+    def _load(self, ident, key, config, locked):
+        started = time.time()
+        try:
+            value = self.loader(ident)
+            delta = time.time() - started
+            self._count('loads')
+            self._count('load_ms_total', delta * 1000)
+            if value is not None:
+                invalidated = cache.get(f"{key}:invalidated")
+                if invalidated is None or invalidated < started:
+                    cache.set(
+                        key,
+                        {'value': value, 'expires': time.time() + config['TIMEOUT'], 'delta': delta},
+                        config['TIMEOUT'] + config['STALE_TIMEOUT'],
+                    )
+            return value
+        finally:
+            if locked:
+                cache.delete(f"{key}:lock")
+
+    def invalidate(self, *idents):
+        """Drop these records now; use invalidate_on_commit() inside a write"""
+        if not idents:
+            return
+        config = self.get_config()
+        keys = [self._key(ident) for ident in idents]
+        cache.delete_many(keys)
+        # Loads that started before this must not store what they read
+        now = time.time()
+        cache.set_many({f"{key}:invalidated": now for key in keys}, config['LOCK_TIMEOUT'] + config['LOCK_WAIT'] + 1)
+        self._count('invalidations', len(idents))
+
+    def invalidate_on_commit(self, *idents):
+        transaction.on_commit(partial(self.invalidate, *idents))
+
+    def snapshot(self):
+        with self.lock:
+            return dict(self.stats, name=self.name, pid=os.getpid())
+
+
+_caches = []
+
+
+def register(object_cache):
+    _caches.append(object_cache)
+    return object_cache
+
+
+# --- Metrics ---
+def publish_metrics():
+    for object_cache in _caches:
+        object_cache.last_publish = time.monotonic()
+    worker_metrics.publish('objcache', [object_cache.snapshot() for object_cache in _caches])
+
+
+def cache_metrics():
+    """Per-worker counters and per-cache totals with hit rates"""
+    publish_metrics()
+    workers = []
+    for snapshots in worker_metrics.collect('objcache'):
+        workers.extend(snapshots)
+
+    totals = {}
+    for snapshot in workers:
+        total = totals.setdefault(snapshot['name'], {'workers': 0})
+        total['workers'] += 1
+        for name, value in snapshot.items():
+            if name not in ('name', 'pid'):
+                total[name] = total.get(name, 0) + value
+    for total in totals.values():
+        requests = total['hits'] + total['stale_hits'] + total['early_refreshes'] + total['misses']
+        # Requests that didn't wait on the database: hits and stale hits
+        total['hit_rate'] = (total['hits'] + total['stale_hits']) / requests if requests else 0.0
+        total['db_load_rate'] = total['loads'] / requests if requests else 0.0
+        total['load_ms_avg'] = total['load_ms_total'] / total['loads'] if total['loads'] else 0.0
+
+    return {'caches': totals, 'workers': sorted(workers, key=lambda s: (s['name'], s['pid']))}
+
+
+# --- Job detail records ---
+def load_job_detail(job_id):
+    """The job_detail page's job + client + owner row, or None"""
+    with connection.cursor() as cursor:
+        # Not j.*: views and trending_score change constantly and the page doesn't show them
+        cursor.execute("""
+            SELECT
+                j.id, j.client_id, j.title, j.description, j.budget,
+                j.category_id, j.is_active, j.created_at,
+                c.company_name,
+                c.location,
+                c.user_id AS client_user_id,
+                u.username AS client_username
+            FROM core_joblisting j
+            LEFT JOIN core_client c ON j.client_id = c.id
+            LEFT JOIN core_user u ON c.user_id = u.id
+            WHERE j.id = %s
+        """, [job_id])
+        row = cursor.fetchone()
+        if row is None:
+            return None
+        columns = [col[0] for col in cursor.description]
+    return dict(zip(columns, row))
+
+
+job_details = register(ReadThroughCache('job_detail', load_job_detail))
+
+
+def invalidate_client_jobs(client_id):
+    """The client's name or location is on all their job records"""
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT id FROM core_joblisting WHERE client_id = %s", [client_id])
+        job_ids = [row[0] for row in cursor.fetchall()]
+    job_details.invalidate_on_commit(*job_ids)
@@ -0,0 +1,52 @@
+import base64
+from datetime import datetime
+
+from django.db import connection
+
+from .timeutils import as_utc
+
+# --- Keyset (cursor) pagination ---
+# Pages are "rows older than the last one shown", i.e.
+#     WHERE (created_at, id) < (cursor_created_at, cursor_id)
+#     ORDER BY created_at DESC, id DESC LIMIT page_size + 1
+# so each page is an index range scan of page_size rows, however deep
+# the user pages. The cursor is the (created_at, id) of the last row,
+# wrapped in an opaque url-safe token.
+
+
+def encode_cursor(created_at, row_id):
+    raw = f"{created_at.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token):
+    """Token -> (created_at, id), or None if missing or malformed"""
+    if not token:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)).decode()
+        created_at, row_id = raw.rsplit('|', 1)
+        created_at = datetime.fromisoformat(created_at)
+        row_id = int(row_id)
+    except (ValueError, UnicodeDecodeError):
+        return None
+    return as_utc(created_at), row_id
+
+
+def keyset_condition(alias, cursor):
+    """SQL fragment + params for rows after `cursor` in (created_at DESC, id DESC) order"""
+    # Spelled out rather than a row comparison, which older MySQL can't range-scan
+    sql = f" AND ({alias}.created_at < %s OR ({alias}.created_at = %s AND {alias}.id < %s))"
+    created_at, row_id = cursor
+    # Raw params skip field adaptation; do what the ORM would (naive UTC on MySQL)
+    created_at = connection.ops.adapt_datetimefield_value(created_at)
+    return sql, [created_at, created_at, row_id]
+
+
+def split_page(rows, page_size):
+    """rows fetched with LIMIT page_size + 1 -> (page rows, next cursor or None)"""
+    if len(rows) <= page_size:
+        return rows, None
+    rows = rows[:page_size]
+    last = rows[-1]
+    return rows, encode_cursor(last['created_at'], last['id'])
@@ -0,0 +1,402 @@
+import os
+import random
+import threading
+import time
+from collections import deque
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db.utils import OperationalError
+
+from . import worker_metrics
+from .querylog import HISTOGRAM_BOUNDS
+
+# --- Database connection pool ---
+# Django opens a new MySQL connection per request (or keeps one per
+# worker thread with CONN_MAX_AGE). With the pool, connect() checks a
+# connection out and close() - at the end of every request - hands it
+# back, so a request only pays for the TCP connect and authentication
+# when the pool has to grow. Everything above the DB-API connection is
+# unchanged, so raw connection.cursor() code works as before.
+#
+# One pool per alias per process. Idle connections are reused most
+# recently used first, so the ones at the bottom of the stack are those
+# left over from a burst; they are closed as they pass MAX_LIFETIME.
+# A connection that has sat idle longer than HEALTH_CHECK_AFTER is
+# pinged before it is handed out (MySQL drops idle sessions after
+# wait_timeout).
+#
+# Each worker publishes its pools' counters through worker_metrics for
+# /metrics/db-pool/.
+
+DEFAULTS = {
+    'MAX_SIZE': 10,
+    # Opened by the worker warm-up
+    'MIN_SIZE': 0,
+    # Seconds to wait for a free connection before giving up
+    'TIMEOUT': 10,
+    # Seconds; each connection gets up to 10% less so they don't all expire together
+    'MAX_LIFETIME': 30 * 60,
+    'HEALTH_CHECK_AFTER': 30,
+    'PUBLISH_INTERVAL': 10,
+}
+
+
+class PoolTimeout(OperationalError):
+    pass
+
+
+def get_pool_config(settings_dict):
+    """OPTIONS['POOL'] over DEFAULTS, or None when the alias isn't pooled"""
+    options = settings_dict.get('OPTIONS', {}).get('POOL')
+    if not options:
+        return None
+    config = dict(DEFAULTS)
+    if isinstance(options, dict):
+        config.update(options)
+    return config
+
+
+class ConnectionPool:
+    def __init__(self, alias, max_size=10, min_size=0, timeout=10, max_lifetime=1800,
+                 health_check_after=30, publish_interval=10, signature=None):
+        self.alias = alias
+        # Which database the connections are to (see get_pool)
+        self.signature = signature
+        self.pid = os.getpid()
+        # Replaced in the registry; connections still out are closed on checkin
+        self.closed = False
+        self.max_size = max_size
+        self.min_size = min_size
+        self.timeout = timeout
+        self.max_lifetime = max_lifetime
+        self.health_check_after = health_check_after
+        self.publish_interval = publish_interval
+        self.cond = threading.Condition()
+        # (connection, last used) pairs, most recently used last
+        self.idle = deque()
+        # Open connections, idle or checked out, or being opened
+        self.size = 0
+        self.expires = {}
+        self.last_publish = time.monotonic()
+        self.stats = {
+            'checkouts': 0,
+            'timeouts': 0,
+            'wait_ms_total': 0.0,
+            'wait_ms_max': 0.0,
+            'wait_histogram': [0] * (len(HISTOGRAM_BOUNDS) + 1),
+            'created': 0,
+            'connect_ms_total': 0.0,
+            'discarded': 0,
+            'health_checks': 0,
+            'failed_health_checks': 0,
+        }
+
+    def checkout(self, connect, ping):
+        """(connection, created) - a pooled connection, or a new one if there is room"""
+        start = time.monotonic()
+        deadline = start + self.timeout
+        while True:
+            with self.cond:
+                while not self.idle and self.size >= self.max_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.stats['timeouts'] += 1
+                        raise PoolTimeout(
+                            f"No connection available in the '{self.alias}' pool "
+                            f"within {self.timeout}s ({self.max_size} in use)"
+                        )
+                    self.cond.wait(remaining)
+                if self.idle:
+                    conn, last_used = self.idle.pop()
+                else:
+                    conn = None
+                    self.size += 1
+                self._record_wait((time.monotonic() - start) * 1000)
+
+            if conn is None:
+                return self._create(connect), True
+            now = time.monotonic()
+            if now >= self.expires.get(id(conn), 0):
+                self._discard(conn)
+                continue
+            if now - last_used >= self.health_check_after:
+                if not self._healthy(conn, ping):
+                    self._discard(conn)
+                    continue
+            return conn, False
+
+    def checkin(self, conn, discard=False):
+        if (
+            discard or self.closed or os.getpid() != self.pid
+            or time.monotonic() >= self.expires.get(id(conn), 0)
+        ):
+            self._discard(conn)
+        else:
+            expired = []
+            with self.cond:
+                self.idle.append((conn, time.monotonic()))
+                # Leftovers from a burst sit at the bottom; close them as they expire
+                now = time.monotonic()
+                while len(self.idle) > max(self.min_size, 1) and now >= self.expires.get(id(self.idle[0][0]), 0):
+                    expired.append(self.idle.popleft()[0])
+                self.cond.notify()
+            for old in expired:
+                self._discard(old)
+        if time.monotonic() - self.last_publish >= self.publish_interval:
+            publish_metrics()
+
+    def prefill(self, connect):
+        """Open connections until MIN_SIZE are idle or open"""
+        opened = 0
+        while True:
+            with self.cond:
+                if self.size >= self.min_size:
+                    return opened
+                self.size += 1
+            conn = self._create(connect)
+            with self.cond:
+                self.idle.appendleft((conn, time.monotonic()))
+                self.cond.notify()
+            opened += 1
+
+    def close(self):
+        with self.cond:
+            self.closed = True
+            idle, self.idle = self.idle, deque()
+        for conn, _ in idle:
+            self._discard(conn)
+
+    # --- Internals ---
+    def _create(self, connect):
+        start = time.monotonic()
+        try:
+            conn = connect()
+        except BaseException:
+            with self.cond:
+                self.size -= 1
+                self.cond.notify()
+            raise
+        now = time.monotonic()
+        lifetime = self.max_lifetime * random.uniform(0.9, 1.0)
+        with self.cond:
+            self.expires[id(conn)] = now + lifetime
+            self.stats['created'] += 1
+            self.stats['connect_ms_total'] += (now - start) * 1000
+        return conn
+
+    def _healthy(self, conn, ping):
+        try:
+            ping(conn)
+            healthy = True
+        except Exception:
+            healthy = False
+        with self.cond:
+            self.stats['health_checks'] += 1
+            self.stats['failed_health_checks'] += not healthy
+        return healthy
+
+    def _discard(self, conn):
+        with self.cond:
+            self.expires.pop(id(conn), None)
+            self.size -= 1
+            self.stats['discarded'] += 1
+            self.cond.notify()
+        if os.getpid() == self.pid:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def _record_wait(self, wait_ms):
+        # Called with the lock held
+        stats = self.stats
+        stats['checkouts'] += 1
+        stats['wait_ms_total'] += wait_ms
+        stats['wait_ms_max'] = max(stats['wait_ms_max'], wait_ms)
+        for i, bound in enumerate(HISTOGRAM_BOUNDS):
+            if wait_ms < bound:
+                stats['wait_histogram'][i] += 1
+                break
+        else:
+            stats['wait_histogram'][-1] += 1
+
+    def snapshot(self):
+        with self.cond:
+            idle = len(self.idle)
+            return dict(
+                self.stats,
+                wait_histogram=list(self.stats['wait_histogram']),
+                alias=self.alias,
+                pid=self.pid,
+                max_size=self.max_size,
+                size=self.size,
+                idle=idle,
+                in_use=self.size - idle,
+            )
+
+
+# --- Per-process registry ---
+_pools = {}
+_pools_lock = threading.Lock()
+# Pools inherited across fork. Their sockets belong to the parent, so
+# they are kept referenced (never closed or garbage collected) here.
+_inherited = []
+
+
+def get_pool(alias, config, signature=None):
+    pool = _pools.get(alias)
+    if pool is None or pool.pid != os.getpid() or pool.signature != signature:
+        with _pools_lock:
+            pool = _pools.get(alias)
+            if pool is not None and pool.pid != os.getpid():
+                _inherited.append(pool)
+                pool = None
+            elif pool is not None and pool.signature != signature:
+                # The alias now points elsewhere (e.g. the test runner
+                # switching NAME to the test database)
+                pool.close()
+                pool = None
+            if pool is None:
+                pool = _pools[alias] = ConnectionPool(
+                    alias,
+                    max_size=config['MAX_SIZE'],
+                    min_size=config['MIN_SIZE'],
+                    timeout=config['TIMEOUT'],
+                    max_lifetime=config['MAX_LIFETIME'],
+                    health_check_after=config['HEALTH_CHECK_AFTER'],
+                    publish_interval=config['PUBLISH_INTERVAL'],
+                    signature=signature,
+                )
+    return pool
+
+
+def close_pools(alias=None):
+    with _pools_lock:
+        aliases = [alias] if alias else list(_pools)
+        pools = [_pools.pop(a) for a in aliases if a in _pools]
+    for pool in pools:
+        pool.close()
+
+
+class PooledDatabaseWrapperMixin:
+    """
+    Mixed into a backend's DatabaseWrapper (see core/backends/mysql_pool).
+    Pooling is on when the alias has OPTIONS['POOL'] (True or a dict of
+    DEFAULTS overrides); otherwise the backend behaves as usual.
+    """
+
+    @property
+    def pool_config(self):
+        return get_pool_config(self.settings_dict)
+
+    @property
+    def pool(self):
+        config = self.pool_config
+        if not config:
+            return None
+        signature = tuple(self.settings_dict.get(key) for key in ('NAME', 'USER', 'HOST', 'PORT'))
+        return get_pool(self.alias, config, signature)
+
+    def check_settings(self):
+        super().check_settings()
+        if self.pool_config and self.settings_dict['CONN_MAX_AGE'] != 0:
+            raise ImproperlyConfigured(
+                f"DATABASES[{self.alias!r}] uses OPTIONS['POOL']; connections are "
+                "returned to the pool after each request, so set CONN_MAX_AGE to 0."
+            )
+
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        # Backends pass OPTIONS through to the driver's connect()
+        params.pop('POOL', None)
+        return params
+
+    def get_new_connection(self, conn_params):
+        pool = self.pool
+        if pool is None:
+            return super().get_new_connection(conn_params)
+        conn, created = pool.checkout(
+            lambda: super(PooledDatabaseWrapperMixin, self).get_new_connection(conn_params),
+            self.pool_ping,
+        )
+        # get_pool() may hand out a different pool by the time this is closed
+        # (after a fork, or a settings change); the connection goes back here
+        self.checkout_pool = pool
+        self.pool_reused = not created
+        return conn
+
+    def init_connection_state(self):
+        # Session settings survive on a reused connection
+        if not getattr(self, 'pool_reused', False):
+            super().init_connection_state()
+
+    def pool_ping(self, conn):
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT 1")
+        finally:
+            cursor.close()
+
+    def _close(self):
+        pool = getattr(self, 'checkout_pool', None)
+        if pool is None or self.connection is None:
+            return super()._close()
+        conn = self.connection
+        # Closed inside atomic() or after an error it can't recover from
+        discard = self.in_atomic_block or (self.errors_occurred and not self.is_usable())
+        if not discard and not self.get_autocommit():
+            try:
+                conn.rollback()
+            except Exception:
+                discard = True
+        pool.checkin(conn, discard=discard)
+        self.checkout_pool = None
+        self.pool_reused = False
+
+    def prefill_pool(self):
+        pool = self.pool
+        if pool is None:
+            return 0
+        params = self.get_connection_params()
+        return pool.prefill(lambda: super(PooledDatabaseWrapperMixin, self).get_new_connection(params))
+
+
+# --- Metrics ---
+def publish_metrics():
+    """Write this worker's pool counters to the shared cache"""
+    pid = os.getpid()
+    snapshots = [pool.snapshot() for pool in list(_pools.values()) if pool.pid == pid]
+    for pool in _pools.values():
+        pool.last_publish = time.monotonic()
+    worker_metrics.publish('db_pool', snapshots)
+
+
+def pool_metrics():
+    """Per-worker pool snapshots plus totals per alias"""
+    if _pools:
+        publish_metrics()
+    workers = []
+    for snapshots in worker_metrics.collect('db_pool'):
+        workers.extend(snapshots)
+
+    totals = {}
+    for snapshot in workers:
+        total = totals.get(snapshot['alias'])
+        if total is None:
+            totals[snapshot['alias']] = dict(snapshot, wait_histogram=list(snapshot['wait_histogram']), workers=1)
+            del totals[snapshot['alias']]['pid']
+            continue
+        total['workers'] += 1
+        for key in ('checkouts', 'timeouts', 'wait_ms_total', 'created', 'connect_ms_total', 'discarded',
+                    'health_checks', 'failed_health_checks', 'max_size', 'size', 'idle', 'in_use'):
+            total[key] += snapshot[key]
+        total['wait_ms_max'] = max(total['wait_ms_max'], snapshot['wait_ms_max'])
+        total['wait_histogram'] = [a + b for a, b in zip(total['wait_histogram'], snapshot['wait_histogram'])]
+    for total in totals.values():
+        total['wait_ms_avg'] = total['wait_ms_total'] / total['checkouts'] if total['checkouts'] else 0.0
+
+    return {
+        'histogram_bounds_ms': list(HISTOGRAM_BOUNDS),
+        'aliases': totals,
+        'workers': sorted(workers, key=lambda s: (s['alias'], s['pid'])),
+    }
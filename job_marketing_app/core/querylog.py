@@ -0,0 +1,235 @@
+import queue
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from . import worker_metrics
+
+# --- Slow query fingerprint log ---
+# Every statement run through connection.execute_wrapper is normalised
+# into a fingerprint (literals and placeholders replaced by ?), and
+# counted with a latency histogram in a bounded per-process store. Each
+# worker publishes a snapshot to the shared cache so the management
+# command and staff view can show all workers together. Slow SELECTs are
+# sampled for EXPLAIN on a background thread, not on the request thread.
+
+DEFAULTS = {
+    'ENABLED': True,
+    'SLOW_MS': 100,
+    'EXPLAIN_SAMPLE_RATE': 0.1,
+    'MAX_FINGERPRINTS': 500,
+    'PUBLISH_INTERVAL': 10,
+    'EXPLAIN_QUEUE_SIZE': 100,
+}
+
+# Upper bounds in ms; the last bucket is everything slower
+HISTOGRAM_BOUNDS = (1, 5, 10, 50, 100, 500, 1000)
+
+
+def get_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, 'QUERY_LOG', {}))
+    return config
+
+
+_COMMENT_RE = re.compile(r'/\*.*?\*/|--[^\n]*', re.S)
+_STRING_RE = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+_PLACEHOLDER_RE = re.compile(r'%s|\?')
+_IN_LIST_RE = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+_VALUES_RE = re.compile(r'(values\s*\(\.\.\.\))(\s*,\s*\(\.\.\.\))+')
+_SPACE_RE = re.compile(r'\s+')
+
+
+def fingerprint(sql):
+    """
+    SELECT * FROM t WHERE id = 5 AND x IN (1, 2)  ->  select * from t where id = ? and x in (...)
+    """
+    sql = _COMMENT_RE.sub(' ', sql)
+    sql = _STRING_RE.sub('?', sql)
+    sql = _NUMBER_RE.sub('?', sql)
+    sql = _PLACEHOLDER_RE.sub('?', sql)
+    sql = _IN_LIST_RE.sub('(...)', sql)
+    sql = _SPACE_RE.sub(' ', sql).strip().lower()
+    return _VALUES_RE.sub(r'\1', sql)
+
+
+class QueryStats:
+    """Bounded per-process store: least recently seen fingerprints are evicted"""
+
+    def __init__(self, max_fingerprints):
+        self.max_fingerprints = max_fingerprints
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def record(self, fp, sql, duration_ms):
+        with self.lock:
+            entry = self.entries.get(fp)
+            if entry is None:
+                entry = self.entries[fp] = {
+                    'fingerprint': fp,
+                    'example': sql[:2000],
+                    'count': 0,
+                    'total_ms': 0.0,
+                    'max_ms': 0.0,
+                    'histogram': [0] * (len(HISTOGRAM_BOUNDS) + 1),
+                    'explain': None,
+                }
+                if len(self.entries) > self.max_fingerprints:
+                    self.entries.popitem(last=False)
+            else:
+                self.entries.move_to_end(fp)
+
+            entry['count'] += 1
+            entry['total_ms'] += duration_ms
+            entry['max_ms'] = max(entry['max_ms'], duration_ms)
+            bucket = next((i for i, bound in enumerate(HISTOGRAM_BOUNDS) if duration_ms < bound), len(HISTOGRAM_BOUNDS))
+            entry['histogram'][bucket] += 1
+
+    def set_explain(self, fp, plan):
+        with self.lock:
+            if fp in self.entries:
+                self.entries[fp]['explain'] = plan
+
+    def snapshot(self):
+        with self.lock:
+            return {fp: dict(entry, histogram=list(entry['histogram'])) for fp, entry in self.entries.items()}
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+def run_explain(sql, params, alias='default'):
+    """Plan for a SELECT as a list of text rows"""
+    with connections[alias].cursor() as cursor:
+        cursor.execute(f"EXPLAIN {sql}", params)
+        columns = [col[0] for col in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+class ExplainWorker:
+    """Background thread that runs EXPLAIN for sampled slow queries"""
+
+    def __init__(self, stats, maxsize):
+        self.stats = stats
+        self.jobs = queue.Queue(maxsize=maxsize)
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def submit(self, fp, sql, params, alias):
+        self.start()
+        try:
+            self.jobs.put_nowait((fp, sql, params, alias))
+        except queue.Full:
+            pass  # Dropping a sample is fine, blocking a request is not
+
+    def start(self):
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self.run, name='query-explain', daemon=True)
+                self.thread.start()
+
+    def run(self):
+        while True:
+            fp, sql, params, alias = self.jobs.get()
+            try:
+                self.stats.set_explain(fp, run_explain(sql, params, alias))
+            except Exception as e:
+                self.stats.set_explain(fp, [{'error': str(e)}])
+            finally:
+                connections.close_all()
+                self.jobs.task_done()
+
+
+class QueryObserver:
+    """Callable for connection.execute_wrapper()"""
+
+    def __init__(self, config=None):
+        self.config = config or get_config()
+        self.stats = QueryStats(self.config['MAX_FINGERPRINTS'])
+        self.explainer = ExplainWorker(self.stats, self.config['EXPLAIN_QUEUE_SIZE'])
+        self.last_publish = time.monotonic()
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            fp = fingerprint(sql)
+            self.stats.record(fp, sql, duration_ms)
+
+            if (
+                duration_ms >= self.config['SLOW_MS']
+                and not many
+                and fp.startswith('select')
+                and random.random() < self.config['EXPLAIN_SAMPLE_RATE']
+            ):
+                self.explainer.submit(fp, sql, params, context['connection'].alias)
+
+            if time.monotonic() - self.last_publish >= self.config['PUBLISH_INTERVAL']:
+                self.publish()
+
+    def publish(self):
+        self.last_publish = time.monotonic()
+        worker_metrics.publish('querylog', self.stats.snapshot())
+
+
+_observer = None
+_observer_lock = threading.Lock()
+
+
+def get_observer():
+    global _observer
+    with _observer_lock:
+        if _observer is None:
+            _observer = QueryObserver()
+        return _observer
+
+
+def top_fingerprints(limit=20, order_by='total_ms'):
+    """Fingerprints from every worker, merged, most expensive first"""
+    if _observer is not None:
+        _observer.publish()
+
+    merged = {}
+    for snapshot in worker_metrics.collect('querylog'):
+        for fp, entry in snapshot.items():
+            total = merged.get(fp)
+            if total is None:
+                merged[fp] = dict(entry, histogram=list(entry['histogram']))
+                continue
+            total['count'] += entry['count']
+            total['total_ms'] += entry['total_ms']
+            total['max_ms'] = max(total['max_ms'], entry['max_ms'])
+            total['histogram'] = [a + b for a, b in zip(total['histogram'], entry['histogram'])]
+            total['explain'] = total['explain'] or entry['explain']
+
+    rows = sorted(merged.values(), key=lambda e: e[order_by], reverse=True)[:limit]
+    for row in rows:
+        row['avg_ms'] = row['total_ms'] / row['count']
+    return rows
+
+
+class QueryObserverMiddleware:
+    """Wraps every request's queries in the process-wide observer"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = get_config()['ENABLED']
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+        observer = get_observer()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(observer))
+            return self.get_response(request)
@@ -0,0 +1,405 @@
+import heapq
+import json
+import logging
+import os
+import queue
+import time
+from collections import deque
+from datetime import datetime, timezone as dt_timezone
+from functools import partial
+
+from django.conf import settings
+from django.core.mail import send_mass_mail
+from django.db import close_old_connections, connection, transaction
+from django.utils.module_loading import import_string
+
+from . import events
+from .models import ReminderState
+from .timeutils import to_timestamp
+
+logger = logging.getLogger(__name__)
+
+# --- Interview reminders ---
+# One scheduler process (manage.py run_reminders) keeps the reminders
+# due within the next WINDOW in a min-heap keyed by reminder time. It
+# sleeps until the earliest one is due, then sends everything due in
+# batches.
+#
+#   schedule/reschedule view --queue--> scheduler: push onto the heap
+#   every WINDOW / 2: load the next slice through the date_time index
+#
+# The queue crosses processes: a change table (DatabaseQueue) by default,
+# a Redis list when REDIS_URL is set.
+#
+# A reschedule pushes a new entry. The old one stays in the heap and is
+# skipped when popped (lazy deletion), so nothing is searched or
+# rebuilt. Rows are re-read when their batch is sent, which also drops
+# reminders for interviews deleted or moved in the meantime.
+#
+# After each batch the reminder time reached is saved in ReminderState.
+# A restarted scheduler loads from there (at most MAX_CATCHUP back)
+# rather than rescanning the table, and sends what fell due while it
+# was down.
+
+DEFAULTS = {
+    # Seconds before the interview each reminder goes out
+    'LEAD_TIMES': (24 * 60 * 60, 60 * 60),
+    # Reminders held in the heap: those due within this many seconds
+    'WINDOW': 6 * 60 * 60,
+    'BATCH_SIZE': 200,
+    # After downtime, reminders overdue by more than this are dropped
+    'MAX_CATCHUP': 6 * 60 * 60,
+    # How views reach the scheduler process
+    'QUEUE': 'core.reminders.DatabaseQueue',
+    # Called with each batch (a list of reminder dicts)
+    'SENDER': 'core.reminders.send_reminders',
+    # Seconds before a batch that failed to send is retried
+    'RETRY_SECONDS': 60,
+}
+
+# Longest sleep between loop iterations
+MAX_SLEEP = 60
+# Seconds between checkpoint writes while nothing is being sent
+CHECKPOINT_INTERVAL = 60
+
+
+def get_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, 'INTERVIEW_REMINDERS', {}))
+    return config
+
+
+# --- Change queues (views -> scheduler) ---
+class LocalQueue:
+    """Same process only: tests, or a scheduler thread inside the web process"""
+
+    def __init__(self, maxsize=10000):
+        self.queue = queue.Queue(maxsize)
+
+    def put(self, message):
+        try:
+            self.queue.put_nowait(message)
+        except queue.Full:
+            # Nobody is consuming; the scheduler finds the row when its window gets there
+            pass
+
+    def get(self, timeout):
+        try:
+            return self.queue.get(timeout=timeout) if timeout > 0 else self.queue.get_nowait()
+        except queue.Empty:
+            return None
+
+
+class DatabaseQueue:
+    """
+    Rows in core_reminderchange, read oldest first by primary key. Taken
+    rows are deleted before they are applied; if the scheduler dies in
+    between, its restart loads those interviews from core_interview anyway.
+    For the same reason put() prunes rows nobody took within MAX_AGE, so
+    the table doesn't grow while no scheduler is running.
+    """
+
+    # Seconds between polls while get() waits
+    POLL_INTERVAL = 1.0
+    BATCH_SIZE = 100
+    MAX_AGE = 60 * 60
+    # Seconds between prunes from one process
+    PRUNE_INTERVAL = 60
+
+    def __init__(self):
+        self.buffer = deque()
+        self.last_prune = 0.0
+
+    def put(self, message):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "INSERT INTO core_reminderchange (interview_id, date_time, queued_at) VALUES (%s, %s, %s)",
+                [message['id'], int(message['date_time']), message['at']],
+            )
+            if message['at'] - self.last_prune >= self.PRUNE_INTERVAL:
+                self.last_prune = message['at']
+                cursor.execute("DELETE FROM core_reminderchange WHERE queued_at < %s", [message['at'] - self.MAX_AGE])
+
+    def _take(self):
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                SELECT id, interview_id, date_time, queued_at FROM core_reminderchange
+                ORDER BY id
+                LIMIT %s
+            """, [self.BATCH_SIZE])
+            rows = cursor.fetchall()
+            if rows:
+                cursor.execute(
+                    f"DELETE FROM core_reminderchange WHERE id IN ({', '.join(['%s'] * len(rows))})",
+                    [row[0] for row in rows],
+                )
+        self.buffer.extend({'id': row[1], 'date_time': row[2], 'at': row[3]} for row in rows)
+
+    def get(self, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            if not self.buffer:
+                self._take()
+            if self.buffer:
+                return self.buffer.popleft()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            time.sleep(min(self.POLL_INTERVAL, remaining))
+
+
+class RedisQueue:
+    """A Redis list; changes wait there while the scheduler restarts. Needs the `redis` package"""
+
+    KEY = 'reminders:changes'
+
+    def __init__(self, url=None):
+        import redis
+
+        self.client = redis.Redis.from_url(url or os.environ['REDIS_URL'])
+
+    def put(self, message):
+        self.client.lpush(self.KEY, json.dumps(message))
+
+    def get(self, timeout):
+        if timeout <= 0:
+            item = self.client.rpop(self.KEY)
+            return json.loads(item) if item else None
+        item = self.client.brpop(self.KEY, timeout=timeout)
+        return json.loads(item[1]) if item else None
+
+
+_queue = None
+
+
+def get_queue():
+    global _queue
+    if _queue is None:
+        _queue = import_string(get_config()['QUEUE'])()
+    return _queue
+
+
+def notify_interview(interview_id, date_time):
+    """Tell the scheduler an interview was scheduled or moved, once the transaction commits"""
+    message = {'id': interview_id, 'date_time': to_timestamp(date_time), 'at': time.time()}
+    transaction.on_commit(partial(get_queue().put, message))
+
+
+# --- Checkpoint ---
+def read_checkpoint(now):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT dispatched_until FROM core_reminderstate WHERE id = 1")
+        row = cursor.fetchone()
+    if row:
+        return row[0]
+    # First run: nothing before now is owed
+    state, _ = ReminderState.objects.get_or_create(id=1, defaults={'dispatched_until': int(now)})
+    return state.dispatched_until
+
+
+def write_checkpoint(until):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "UPDATE core_reminderstate SET dispatched_until = %s WHERE id = 1 AND dispatched_until < %s",
+            [until, until],
+        )
+
+
+# --- Loading and sending ---
+def _adapt(timestamp):
+    return connection.ops.adapt_datetimefield_value(datetime.fromtimestamp(timestamp, dt_timezone.utc))
+
+
+def load_interview_times(start, end):
+    """(id, unix time) of interviews with start < date_time <= end; a range scan on date_time"""
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT id, date_time FROM core_interview
+            WHERE date_time > %s AND date_time <= %s
+        """, [_adapt(start), _adapt(end)])
+        return [(row[0], int(to_timestamp(row[1]))) for row in cursor.fetchall()]
+
+
+def load_reminder_details(interview_ids):
+    """{interview id: row} with what a reminder needs about the interview and both participants"""
+    placeholders = ', '.join(['%s'] * len(interview_ids))
+    with connection.cursor() as cursor:
+        cursor.execute(f"""
+            SELECT i.id, i.date_time, i.link_or_location, i.application_id,
+                   j.title AS job_title, c.company_name,
+                   cu.id AS client_user_id, cu.username AS client_username, cu.email AS client_email,
+                   fu.id AS freelancer_user_id, fu.username AS freelancer_username,
+                   fu.email AS freelancer_email
+            FROM core_interview i
+            JOIN core_application a ON i.application_id = a.id
+            JOIN core_joblisting j ON a.job_id = j.id
+            JOIN core_client c ON j.client_id = c.id
+            JOIN core_user cu ON c.user_id = cu.id
+            JOIN core_freelancer f ON a.freelancer_id = f.id
+            JOIN core_user fu ON f.user_id = fu.id
+            WHERE i.id IN ({placeholders})
+        """, list(interview_ids))
+        columns = [col[0] for col in cursor.description]
+        rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+    for row in rows:
+        row['timestamp'] = int(to_timestamp(row['date_time']))
+    return {row['id']: row for row in rows}
+
+
+def send_reminders(reminders):
+    """Email both participants (one SMTP connection per batch) and notify their dashboards"""
+    messages = []
+    for r in reminders:
+        when = datetime.fromtimestamp(r['timestamp'], dt_timezone.utc)
+        company = r['company_name'] or r['client_username']
+        subject = f"Reminder: interview for {r['job_title']} at {when:%Y-%m-%d %H:%M} UTC"
+        for role, other in (('client', r['freelancer_username']), ('freelancer', company)):
+            if r[f'{role}_email']:
+                body = f"Your interview with {other} is at {when:%Y-%m-%d %H:%M} UTC.\n\n{r['link_or_location']}\n"
+                messages.append((subject, body, None, [r[f'{role}_email']]))
+        events.publish(
+            (r['client_user_id'], r['freelancer_user_id']), 'interview.reminder',
+            application_id=r['application_id'], job_title=r['job_title'],
+            date_time=when.isoformat(), link_or_location=r['link_or_location'],
+        )
+    send_mass_mail(messages, fail_silently=False)
+
+
+# --- Scheduler ---
+class ReminderScheduler:
+    def __init__(self, clock=time.time, sender=None, changes=None, config=None):
+        self.config = config or get_config()
+        # clock() -> unix time; tests pass a fake one
+        self.clock = clock
+        self.sender = sender or import_string(self.config['SENDER'])
+        self.changes = changes or get_queue()
+        self.leads = sorted(self.config['LEAD_TIMES'])
+        # (reminder time, interview id, lead)
+        self.heap = []
+        # (interview id, lead) -> reminder time of its live heap entry
+        self.pending = {}
+        # Every reminder due in (dispatched_until, loaded_until] is in the heap
+        self.dispatched_until = None
+        self.loaded_until = None
+        self.saved_until = None
+        self.retry_at = 0
+        self.sent = 0
+
+    def start(self):
+        now = int(self.clock())
+        saved = read_checkpoint(now)
+        self.dispatched_until = self.loaded_until = self.saved_until = max(saved, now - self.config['MAX_CATCHUP'])
+        self.load_until(now + self.config['WINDOW'])
+
+    def load_until(self, end):
+        start = self.loaded_until
+        if end <= start:
+            return 0
+        loaded = 0
+        for interview_id, at in load_interview_times(start + self.leads[0], end + self.leads[-1]):
+            for lead in self.leads:
+                if start < at - lead <= end:
+                    self._push(interview_id, lead, at - lead)
+                    loaded += 1
+        self.loaded_until = end
+        return loaded
+
+    def _push(self, interview_id, lead, remind_at):
+        self.pending[(interview_id, lead)] = remind_at
+        heapq.heappush(self.heap, (remind_at, interview_id, lead))
+
+    def interview_changed(self, message):
+        """A notify_interview() message: (re)place this interview's reminders"""
+        interview_id, at = message['id'], int(message['date_time'])
+        for lead in self.leads:
+            remind_at = at - lead
+            if remind_at <= message['at'] or remind_at > self.loaded_until:
+                # Already past when it was (re)scheduled, or beyond the window
+                # (loaded from the table when the window gets there)
+                self.pending.pop((interview_id, lead), None)
+            else:
+                self._push(interview_id, lead, remind_at)
+
+    def _pop_due(self, now):
+        """Next batch of live entries due by now; ties are never split across batches"""
+        batch = []
+        while self.heap and self.heap[0][0] <= now:
+            if len(batch) >= self.config['BATCH_SIZE'] and self.heap[0][0] != batch[-1][0]:
+                break
+            remind_at, interview_id, lead = heapq.heappop(self.heap)
+            if self.pending.get((interview_id, lead)) != remind_at:
+                continue  # Superseded by a reschedule, or a duplicate
+            del self.pending[(interview_id, lead)]
+            batch.append((remind_at, interview_id, lead))
+        return batch
+
+    def dispatch_due(self, now):
+        sent = 0
+        if now < self.retry_at:
+            return sent
+        while True:
+            batch = self._pop_due(now)
+            if not batch:
+                return sent
+            rows = load_reminder_details({interview_id for _, interview_id, _ in batch})
+            reminders = []
+            for remind_at, interview_id, lead in batch:
+                row = rows.get(interview_id)
+                # Deleted, moved (its new entry is elsewhere in the heap) or already started
+                if row is None or row['timestamp'] - lead != remind_at or row['timestamp'] <= now:
+                    continue
+                reminders.append(dict(row, lead=lead))
+            try:
+                if reminders:
+                    self.sender(reminders)
+            except Exception:
+                logger.exception("Sending %s interview reminders failed; retrying in %ss",
+                                 len(reminders), self.config['RETRY_SECONDS'])
+                for entry in batch:
+                    self._push(entry[1], entry[2], entry[0])
+                self.retry_at = now + self.config['RETRY_SECONDS']
+                return sent
+            sent += len(reminders)
+            self.sent += len(reminders)
+            self.dispatched_until = max(self.dispatched_until, batch[-1][0])
+            write_checkpoint(self.dispatched_until)
+            self.saved_until = self.dispatched_until
+
+    def _save_checkpoint(self, now):
+        # Everything due by now has been sent, unless a failed batch is waiting
+        if self.heap and self.heap[0][0] <= now:
+            until = self.heap[0][0] - 1
+        else:
+            until = now
+        self.dispatched_until = max(self.dispatched_until, until)
+        if self.dispatched_until - self.saved_until >= CHECKPOINT_INTERVAL:
+            write_checkpoint(self.dispatched_until)
+            self.saved_until = self.dispatched_until
+
+    def step(self):
+        """Apply queued changes, load the next slice if due, send what is due; returns reminders sent"""
+        now = int(self.clock())
+        if now + self.config['WINDOW'] // 2 >= self.loaded_until:
+            self.load_until(now + self.config['WINDOW'])
+        while (message := self.changes.get(0)) is not None:
+            self.interview_changed(message)
+        sent = self.dispatch_due(now)
+        self._save_checkpoint(now)
+        return sent
+
+    def seconds_until_next(self):
+        now = self.clock()
+        wake = self.loaded_until - self.config['WINDOW'] // 2
+        if self.heap:
+            wake = min(wake, max(self.heap[0][0], self.retry_at))
+        return min(max(wake - now, 0), MAX_SLEEP)
+
+    def run_forever(self):
+        self.start()
+        while True:
+            self.step()
+            # With CONN_MAX_AGE = 0 this hands the connection back between steps
+            close_old_connections()
+            message = self.changes.get(self.seconds_until_next())
+            if message is not None:
+                self.interview_changed(message)
@@ -0,0 +1,103 @@
+from django.core.cache import cache
+from django.db import connection
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from .applicant_ranking import invalidate_rankings
+from .applied_jobs import invalidate_applied_jobs
+from .calendar_feed import bump_application_participants
+from .locations import adjust_job_count, client_location, counted_location, move_client_jobs, resolve_location
+from .models import Application, Category, Client, Interview, JobListing
+from .object_cache import invalidate_client_jobs, job_details
+from .reminders import notify_interview
+from .similarity import index_job
+
+
+# Raw SQL inserts in views.py invalidate directly; these cover ORM writes
+# (admin, shell, cascades from deleting a job).
+@receiver(post_save, sender=Application)
+@receiver(post_delete, sender=Application)
+def application_changed(sender, instance, created=True, **kwargs):
+    invalidate_applied_jobs(instance.freelancer_id)
+    # Status edits don't change the ranking; new and deleted applications do
+    if created:
+        invalidate_rankings(instance.job_id)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def category_changed(sender, instance, **kwargs):
+    cache.delete('categories')
+
+
+@receiver(post_save, sender=Interview)
+@receiver(post_delete, sender=Interview)
+def interview_changed(sender, instance, **kwargs):
+    bump_application_participants(instance.application_id)
+
+
+@receiver(post_save, sender=Interview)
+def interview_saved(sender, instance, **kwargs):
+    notify_interview(instance.id, instance.date_time)
+
+
+@receiver(post_save, sender=JobListing)
+@receiver(post_delete, sender=JobListing)
+def job_changed(sender, instance, **kwargs):
+    job_details.invalidate_on_commit(instance.id)
+
+
+# Similar-jobs index: post_job indexes its raw INSERT; this covers ORM writes
+@receiver(pre_save, sender=JobListing)
+def job_text_about_to_save(sender, instance, **kwargs):
+    instance._indexed_text = None
+    if instance.pk:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT title, description FROM core_joblisting WHERE id = %s", [instance.pk])
+            instance._indexed_text = cursor.fetchone()
+
+
+@receiver(post_save, sender=JobListing)
+def job_text_saved(sender, instance, created=False, **kwargs):
+    if created or getattr(instance, '_indexed_text', None) != (instance.title, instance.description):
+        index_job(instance.id, instance.title, instance.description or '')
+
+
+# Location job counts: raw SQL paths adjust them directly
+@receiver(pre_save, sender=JobListing)
+def job_about_to_save(sender, instance, **kwargs):
+    instance._counted_location = counted_location(instance.pk) if instance.pk else None
+
+
+@receiver(post_save, sender=JobListing)
+def job_saved(sender, instance, **kwargs):
+    before = getattr(instance, '_counted_location', None)
+    after = client_location(instance.client_id) if instance.is_active else None
+    if before != after:
+        adjust_job_count(before, -1)
+        adjust_job_count(after, 1)
+
+
+@receiver(pre_delete, sender=JobListing)
+def job_about_to_delete(sender, instance, **kwargs):
+    adjust_job_count(counted_location(instance.pk), -1)
+
+
+# update_profile resolves and moves counts itself; these cover ORM writes
+@receiver(pre_save, sender=Client)
+def client_about_to_save(sender, instance, **kwargs):
+    old_text, old_location = None, None
+    if instance.pk:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT location, resolved_location_id FROM core_client WHERE id = %s", [instance.pk])
+            old_text, old_location = cursor.fetchone() or (None, None)
+    if instance.location != old_text:
+        instance.resolved_location_id = resolve_location(instance.location)
+    instance._old_location = old_location
+
+
+@receiver(post_save, sender=Client)
+def client_changed(sender, instance, created=False, **kwargs):
+    if not created:
+        move_client_jobs(instance.id, getattr(instance, '_old_location', None), instance.resolved_location_id)
+        invalidate_client_jobs(instance.id)
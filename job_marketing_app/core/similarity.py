@@ -0,0 +1,148 @@
+import hashlib
+import re
+from array import array
+
+from django.db import connection
+
+# --- MinHash / LSH index over job title + description ---
+# Each job gets a NUM_PERM value MinHash signature. The signature is cut
+# into BANDS bands of ROWS values; every band is hashed into one bucket
+# key. Two jobs sharing any bucket are candidates, and the fraction of
+# equal signature values estimates their Jaccard similarity.
+#
+# With 16 bands x 4 rows, jobs at 0.8 similarity collide with ~99.9%
+# probability and jobs at 0.3 with ~12%.
+
+NUM_PERM = 64
+BANDS = 16
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 2
+
+_EMPTY = array('I', [0xFFFFFFFF] * NUM_PERM)
+_WORD_RE = re.compile(r'[a-z0-9]+')
+
+
+def shingles(text):
+    """Set of word n-grams"""
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < SHINGLE_SIZE:
+        return set(words)
+    return {' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def minhash(title, description=''):
+    """
+    MinHash signature as NUM_PERM unsigned 32-bit ints.
+    One SHAKE-128 digest per shingle supplies all NUM_PERM hash functions
+    (4 bytes each), and the column-wise minimum is taken in C via zip/min.
+    That is ~3-4x faster than NUM_PERM modular hashes per shingle in Python.
+    """
+    values = shingles(f"{title} {description}")
+    if not values:
+        return array('I', _EMPTY)
+    rows = [
+        memoryview(hashlib.shake_128(v.encode()).digest(NUM_PERM * 4)).cast('I')
+        for v in values
+    ]
+    return array('I', map(min, zip(*rows)))
+
+
+def band_keys(signature):
+    """One signed 64-bit bucket key per band"""
+    keys = []
+    for band in range(BANDS):
+        chunk = signature[band * ROWS:(band + 1) * ROWS]
+        digest = hashlib.blake2b(band.to_bytes(1, 'big') + chunk.tobytes(), digest_size=8).digest()
+        keys.append(int.from_bytes(digest, 'big', signed=True))
+    return keys
+
+
+def estimate_similarity(sig_a, sig_b):
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / NUM_PERM
+
+
+def signature_from_bytes(raw):
+    sig = array('I')
+    sig.frombytes(bytes(raw))
+    return sig
+
+
+# --- Database backed index ---
+def index_job(job_id, title, description, cursor=None):
+    """(Re)index one job. Called when a job is posted or its text changes."""
+    signature = minhash(title, description)
+    rows = [(key, job_id) for key in band_keys(signature)]
+
+    def write(cursor):
+        cursor.execute("DELETE FROM core_joblshbucket WHERE job_id = %s", [job_id])
+        cursor.execute("DELETE FROM core_jobsignature WHERE job_id = %s", [job_id])
+        cursor.execute(
+            "INSERT INTO core_jobsignature (job_id, minhash) VALUES (%s, %s)",
+            [job_id, signature.tobytes()]
+        )
+        cursor.executemany("INSERT INTO core_joblshbucket (bucket, job_id) VALUES (%s, %s)", rows)
+
+    if cursor is not None:
+        write(cursor)
+    else:
+        with connection.cursor() as cursor:
+            write(cursor)
+    return signature
+
+
+def find_similar(signature, exclude_job_id=None, client_id=None, threshold=0.5, limit=5, max_candidates=200):
+    """
+    Active jobs whose signature shares a bucket with `signature`,
+    ranked by estimated similarity. When there are more than
+    max_candidates, the ones sharing the most bands are scored: the
+    number of matching bands rises with similarity.
+    """
+    keys = band_keys(signature)
+    placeholders = ', '.join(['%s'] * len(keys))
+    sql = f"""
+        SELECT j.id, j.title, j.client_id, s.minhash
+        FROM (
+            SELECT b.job_id, COUNT(*) AS bands FROM core_joblshbucket b
+            WHERE b.bucket IN ({placeholders})
+            GROUP BY b.job_id
+        ) cand
+        JOIN core_jobsignature s ON s.job_id = cand.job_id
+        JOIN core_joblisting j ON j.id = cand.job_id
+        WHERE j.is_active = 1
+    """
+    params = list(keys)
+    if exclude_job_id is not None:
+        sql += " AND j.id <> %s"
+        params.append(exclude_job_id)
+    if client_id is not None:
+        sql += " AND j.client_id = %s"
+        params.append(client_id)
+    sql += " ORDER BY cand.bands DESC, j.id DESC LIMIT %s"
+    params.append(max_candidates)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        candidates = cursor.fetchall()
+
+    results = []
+    for job_id, title, job_client_id, raw in candidates:
+        score = estimate_similarity(signature, signature_from_bytes(raw))
+        if score >= threshold:
+            results.append({'id': job_id, 'title': title, 'client_id': job_client_id, 'similarity': score})
+    results.sort(key=lambda r: (-r['similarity'], -r['id']))
+    return results[:limit]
+
+
+def similar_jobs(job_id, limit=5):
+    """Jobs similar to an indexed job, for the job_detail panel"""
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT minhash FROM core_jobsignature WHERE job_id = %s", [job_id])
+        row = cursor.fetchone()
+    if not row:
+        return []
+    return find_similar(signature_from_bytes(row[0]), exclude_job_id=job_id, threshold=0.3, limit=limit)
+
+
+def duplicate_postings(client_id, title, description, threshold=0.8):
+    """This client's active jobs that look like the same posting"""
+    return find_similar(minhash(title, description), client_id=client_id, threshold=threshold)
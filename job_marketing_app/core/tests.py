@@ -1,6 +1,40 @@
-from django.test import TestCase
+import asyncio
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from array import array
+from datetime import datetime, timezone as dt_timezone
+from io import StringIO
+from unittest import mock
+
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper as SQLiteDatabaseWrapper
+from django.test import TestCase, TransactionTestCase, override_settings
 from django.contrib.auth import get_user_model
-from .models import Client, Freelancer, JobListing, Application
+from django.core.cache import cache
+from django.utils import timezone
+from job_market import warmup
+from . import (
+    applicant_ranking, applied_jobs, autocomplete, bulk_delete, events, middleware, object_cache, pool, reminders,
+    view_counter, worker_metrics,
+)
+from .applied_jobs import get_applied_jobs
+from .calendar_feed import feed_token
+from .middleware import rejection_metrics
+from .locations import recompute_job_counts, resolve_location
+from .models import (
+    Client, Freelancer, JobListing, Application, Category, Interview, JobLSHBucket, JobSignature, Location,
+    LocationAlias, ReminderChange,
+)
+from .querylog import QueryObserver, fingerprint
+from . import trending
+from .similarity import similar_jobs
+from .view_counter import flush_views, record_view
+from .views import get_categories, submit_application
 
 User = get_user_model()
 
@@ -55,3 +89,1510 @@ class JobMarketTests(TestCase):
         response = self.client.get('/dashboard/')
         self.assertEqual(response.status_code, 302)
         self.assertRedirects(response, '/dashboard/freelancer/')
+
+
+@override_settings(ADMISSION_CONTROL={
+    'LIMITS': {'view_applications': {'concurrency': 1, 'queue': 0, 'timeout': 0.1}},
+    'RATE_LIMITS': {'post_job': {'rate': 0.01, 'burst': 2}},
+})
+class AdmissionControlTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client_user = User.objects.create_user(username='client1', password='password', is_client=True)
+        self.client_profile = Client.objects.create(user=self.client_user, company_name='Tech Corp')
+        self.category = Category.objects.create(name='IT')
+        self.job = JobListing.objects.create(
+            client=self.client_profile, title='Web Design', description='Design a site',
+            budget=500, category=self.category
+        )
+        self.client.login(username='client1', password='password')
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_write_endpoint_rate_limited_per_user(self):
+        data = {'title': 'Dev', 'description': 'Need a dev', 'budget': 100, 'category': self.category.id}
+        for _ in range(2):
+            self.assertEqual(self.client.post('/post-job/', dict(data, confirm_duplicate='1')).status_code, 302)
+
+        response = self.client.post('/post-job/', data)
+        self.assertEqual(response.status_code, 429)
+        self.assertTrue(int(response['Retry-After']) >= 1)
+
+        # Reads are not rate limited
+        self.assertEqual(self.client.get('/post-job/').status_code, 200)
+        self.assertEqual(rejection_metrics()['endpoints']['post_job']['rate_limited'], 1)
+
+    def test_overloaded_endpoint_fails_fast(self):
+        # Another worker is holding the only slot
+        cache.set('admission:active:view_applications', 1)
+        response = self.client.get(f'/job/{self.job.id}/applications/')
+        self.assertEqual(response.status_code, 503)
+        self.assertIn('Retry-After', response)
+
+        cache.set('admission:active:view_applications', 0)
+        response = self.client.get(f'/job/{self.job.id}/applications/')
+        self.assertEqual(response.status_code, 200)
+        # Slot is released once the response is done
+        self.assertEqual(cache.get('admission:active:view_applications'), 0)
+        self.assertEqual(rejection_metrics()['total'], 1)
+
+    def test_concurrent_requests_cannot_share_a_token(self):
+        config = dict(middleware.get_config())
+        rate_limit = {'rate': 0.01, 'burst': 3}
+        barrier = threading.Barrier(8)
+        waits = []
+
+        def take():
+            barrier.wait()
+            waits.append(middleware.take_token(config, 'post_job', 'user:1', rate_limit))
+
+        threads = [threading.Thread(target=take) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(waits.count(0), 3)
+        self.assertTrue(all(wait > 0 for wait in waits if wait))
+
+    def test_lost_slot_counter_does_not_go_negative(self):
+        config = middleware.get_config()
+        self.assertIsNone(middleware.acquire_slot(config, 'view_applications', config['LIMITS']['view_applications']))
+        # Evicted while the request was running
+        cache.delete('admission:active:view_applications')
+        middleware.release_slot(config, 'view_applications')
+        self.assertEqual(cache.get('admission:active:view_applications'), 0)
+
+
+class AdminChangelistTests(TestCase):
+    def setUp(self):
+        self.admin_user = User.objects.create_superuser(username='admin', password='password', email='a@example.com')
+        self.category = Category.objects.create(name='IT')
+        self.client.login(username='admin', password='password')
+
+    def make_rows(self, n):
+        start = Application.objects.count()
+        for i in range(start, start + n):
+            client_user = User.objects.create_user(username=f'c{i}', password='x', is_client=True)
+            client_profile = Client.objects.create(user=client_user)
+            freelancer_user = User.objects.create_user(username=f'f{i}', password='x', is_freelancer=True)
+            freelancer = Freelancer.objects.create(user=freelancer_user)
+            job = JobListing.objects.create(
+                client=client_profile, title=f'Job {i}', description='d', budget=10, category=self.category
+            )
+            application = Application.objects.create(
+                job=job, freelancer=freelancer, proposal_text='p', expected_payment=10
+            )
+            Interview.objects.create(application=application, date_time=timezone.now(), link_or_location='x')
+
+    def assert_fixed_queries(self, url, num):
+        self.make_rows(2)
+        with self.assertNumQueries(num):
+            self.assertEqual(self.client.get(url).status_code, 200)
+        # More rows on the page must not add queries
+        self.make_rows(10)
+        with self.assertNumQueries(num):
+            self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_application_changelist_query_count(self):
+        self.assert_fixed_queries('/admin/core/application/', 5)
+        self.assert_fixed_queries('/admin/core/application/?status__exact=Pending', 5)
+
+    def test_interview_changelist_query_count(self):
+        self.assert_fixed_queries('/admin/core/interview/', 4)
+
+    def test_joblisting_changelist_query_count(self):
+        self.assert_fixed_queries('/admin/core/joblisting/', 5)
+
+    def test_bulk_actions(self):
+        self.make_rows(3)
+        ids = list(Application.objects.values_list('id', flat=True))
+        self.client.post('/admin/core/application/', {
+            'action': 'approve_applications', '_selected_action': ids,
+        })
+        self.assertEqual(Application.objects.filter(status='Approved').count(), 3)
+
+        ids = list(JobListing.objects.values_list('id', flat=True))
+        self.client.post('/admin/core/joblisting/', {
+            'action': 'deactivate_jobs', '_selected_action': ids,
+        })
+        self.assertFalse(JobListing.objects.filter(is_active=True).exists())
+
+
+class ApplicationSubmissionTests(TransactionTestCase):
+    def setUp(self):
+        client_user = User.objects.create_user(username='client1', password='password', is_client=True)
+        client_profile = Client.objects.create(user=client_user)
+        self.freelancer_user = User.objects.create_user(username='freelancer1', password='password', is_freelancer=True)
+        self.freelancer = Freelancer.objects.create(user=self.freelancer_user)
+        self.job = JobListing.objects.create(client=client_profile, title='Web Design', description='d', budget=500)
+
+    def test_duplicate_submission_reports_already_applied(self):
+        self.assertTrue(submit_application(self.job.id, self.freelancer.id, 'first', 100))
+        self.assertFalse(submit_application(self.job.id, self.freelancer.id, 'second', 100))
+        self.assertEqual(Application.objects.get().proposal_text, 'first')
+
+        self.client.login(username='freelancer1', password='password')
+        response = self.client.post(f'/jobs/{self.job.id}/', {'proposal_text': 'again', 'expected_payment': 100})
+        self.assertRedirects(response, f'/jobs/{self.job.id}/')
+        self.assertEqual(Application.objects.count(), 1)
+
+    def test_concurrent_submissions_insert_once(self):
+        workers = 8
+        barrier = threading.Barrier(workers)
+        results = []
+        errors = []
+
+        def submit():
+            try:
+                barrier.wait()
+                results.append(submit_application(self.job.id, self.freelancer.id, 'double click', 100))
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=submit) for _ in range(workers)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(results.count(True), 1)
+        self.assertEqual(Application.objects.filter(job=self.job, freelancer=self.freelancer).count(), 1)
+
+
+class AppliedJobsCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        client_user = User.objects.create_user(username='client1', password='password', is_client=True)
+        self.client_profile = Client.objects.create(user=client_user)
+        freelancer_user = User.objects.create_user(username='freelancer1', password='password', is_freelancer=True)
+        self.freelancer = Freelancer.objects.create(user=freelancer_user)
+        self.jobs = [
+            JobListing.objects.create(client=self.client_profile, title=f'Job {i}', description='d', budget=10)
+            for i in range(3)
+        ]
+        self.client.login(username='freelancer1', password='password')
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_badges_and_has_applied_follow_new_application(self):
+        job = self.jobs[1]
+        response = self.client.get('/jobs/')
+        self.assertNotContains(response, '✅ Applied')
+
+        self.client.post(f'/jobs/{job.id}/', {'proposal_text': 'hi', 'expected_payment': 10})
+
+        response = self.client.get('/jobs/')
+        self.assertContains(response, '✅ Applied', count=1)
+        self.assertTrue(self.client.get(f'/jobs/{job.id}/').context['has_applied'])
+        self.assertFalse(self.client.get(f'/jobs/{self.jobs[0].id}/').context['has_applied'])
+
+    def test_cached_set_answers_without_queries(self):
+        Application.objects.create(job=self.jobs[0], freelancer=self.freelancer, proposal_text='p', expected_payment=1)
+        get_applied_jobs(self.freelancer.id)
+        with self.assertNumQueries(0):
+            applied = get_applied_jobs(self.freelancer.id)
+            self.assertIn(self.jobs[0].id, applied)
+            self.assertNotIn(self.jobs[2].id, applied)
+
+        # ORM deletes invalidate too
+        Application.objects.all().delete()
+        self.assertNotIn(self.jobs[0].id, get_applied_jobs(self.freelancer.id))
+
+    @override_settings(APPLIED_JOBS_CACHE={'MAX_IDS': 1})
+    def test_over_budget_freelancer_is_not_cached(self):
+        for job in self.jobs[:2]:
+            Application.objects.create(job=job, freelancer=self.freelancer, proposal_text='p', expected_payment=1)
+        page = [job.id for job in self.jobs]
+        get_applied_jobs(self.freelancer.id, page)
+        self.assertEqual(cache.get(f'applied_jobs:{self.freelancer.id}')[1], b'')
+
+        # Only the page's jobs are looked up, in one query
+        with self.assertNumQueries(1):
+            applied = get_applied_jobs(self.freelancer.id, page)
+        self.assertIn(self.jobs[1].id, applied)
+        self.assertNotIn(self.jobs[2].id, applied)
+
+    def test_load_racing_an_application_is_not_served_later(self):
+        load_applied_job_ids = applied_jobs.load_applied_job_ids
+
+        def load_then_apply(*args):
+            ids = load_applied_job_ids(*args)
+            # Another request applies (and invalidates) while this load is in flight
+            Application.objects.create(
+                job=self.jobs[0], freelancer=self.freelancer, proposal_text='p', expected_payment=1
+            )
+            return ids
+
+        with mock.patch('core.applied_jobs.load_applied_job_ids', side_effect=load_then_apply):
+            self.assertNotIn(self.jobs[0].id, get_applied_jobs(self.freelancer.id))
+        self.assertIn(self.jobs[0].id, get_applied_jobs(self.freelancer.id))
+
+
+@override_settings(ADMISSION_CONTROL={})
+class SimilarJobsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client_user = User.objects.create_user(username='client1', password='password', is_client=True)
+        self.client_profile = Client.objects.create(user=self.client_user)
+        self.category = Category.objects.create(name='IT')
+        self.client.login(username='client1', password='password')
+        self.description = 'Build a responsive online store with product search, cart and checkout using Django'
+
+    def tearDown(self):
+        cache.clear()
+
+    def post(self, title, description, **extra):
+        data = {'title': title, 'description': description, 'budget': 100, 'category': self.category.id}
+        data.update(extra)
+        return self.client.post('/post-job/', data)
+
+    def test_near_duplicate_posting_warns_then_allows(self):
+        self.assertEqual(self.post('Django shop developer', self.description).status_code, 302)
+
+        response = self.post('Django shop developer', self.description + ' quickly')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context['duplicates']), 1)
+        self.assertEqual(JobListing.objects.count(), 1)
+
+        response = self.post('Django shop developer', self.description + ' quickly', confirm_duplicate='1')
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(JobListing.objects.count(), 2)
+
+        # Unrelated postings go straight through
+        self.assertEqual(self.post('Logo design', 'Need a minimalist logo for a coffee brand').status_code, 302)
+
+    def test_job_detail_shows_similar_jobs(self):
+        self.post('Django shop developer', self.description)
+        self.post('Django store developer', self.description + ' and payments', confirm_duplicate='1')
+        self.post('Logo design', 'Need a minimalist logo for a coffee brand')
+        first, second, logo = JobListing.objects.order_by('id')
+
+        response = self.client.get(f'/jobs/{first.id}/')
+        self.assertEqual([j['id'] for j in response.context['similar_jobs']], [second.id])
+        self.assertEqual(self.client.get(f'/jobs/{logo.id}/').context['similar_jobs'], [])
+
+    def test_orm_writes_keep_the_index_current(self):
+        shop = JobListing.objects.create(client=self.client_profile, title='Django shop developer',
+                                         description=self.description, budget=10)
+        logo = JobListing.objects.create(client=self.client_profile, title='Logo design',
+                                         description='Need a minimalist logo for a coffee brand', budget=10)
+        self.assertEqual(similar_jobs(shop.id), [])
+
+        logo.title, logo.description = 'Django store developer', self.description + ' and payments'
+        logo.save()
+        self.assertEqual([j['id'] for j in similar_jobs(shop.id)], [logo.id])
+
+        # Saves that leave the text alone don't touch the index
+        with mock.patch('core.signals.index_job') as index:
+            logo.budget = 20
+            logo.save()
+        index.assert_not_called()
+
+    def test_build_command_indexes_existing_jobs(self):
+        for i in range(3):
+            JobListing.objects.create(client=self.client_profile, title='Django shop developer',
+                                      description=self.description, budget=10)
+        # Jobs from before the index existed
+        JobLSHBucket.objects.all().delete()
+        JobSignature.objects.all().delete()
+        call_command('build_job_signatures', workers=2, batch_size=2, stdout=StringIO())
+        self.assertEqual(JobSignature.objects.count(), 3)
+        job = JobListing.objects.first()
+        self.assertEqual(len(similar_jobs(job.id)), 2)
+
+
+class WarmupTests(TestCase):
+    def tearDown(self):
+        cache.clear()
+        autocomplete.service.reset()
+
+    def test_warm_code_compiles_project_templates(self):
+        self.assertGreaterEqual(warmup.compile_templates(), 13)
+        self.assertGreater(warmup.populate_url_resolvers(), 0)
+
+    def test_warm_connections_primes_category_cache(self):
+        Category.objects.create(name='IT')
+        cache.clear()
+        warmup.warm_connections()
+        with self.assertNumQueries(0):
+            self.assertEqual([c['name'] for c in get_categories()], ['IT'])
+
+        # Admin edits drop the cached list
+        Category.objects.create(name='Design')
+        self.assertEqual(len(get_categories()), 2)
+
+
+class QueryLogTests(TestCase):
+    def tearDown(self):
+        cache.clear()
+
+    def test_fingerprint_strips_literals(self):
+        self.assertEqual(
+            fingerprint("SELECT *  FROM core_joblisting WHERE id = 5 AND title = 'it''s' AND client_id IN (1, 2, 3)"),
+            "select * from core_joblisting where id = ? and title = ? and client_id in (...)",
+        )
+        self.assertEqual(
+            fingerprint("INSERT INTO t (a, b) VALUES (%s, %s), (%s, %s) -- bulk"),
+            fingerprint("insert into t (a, b) values (%s, %s)"),
+        )
+
+    def test_observer_aggregates_and_explains_slow_selects(self):
+        observer = QueryObserver({
+            'ENABLED': True, 'SLOW_MS': 0, 'EXPLAIN_SAMPLE_RATE': 1.0,
+            'MAX_FINGERPRINTS': 2, 'PUBLISH_INTERVAL': 0, 'EXPLAIN_QUEUE_SIZE': 10,
+        })
+        with connection.execute_wrapper(observer):
+            for i in range(3):
+                JobListing.objects.filter(id=i).exists()
+            Category.objects.count()
+            Client.objects.count()
+        observer.explainer.jobs.join()
+
+        snapshot = observer.stats.snapshot()
+        # Bounded: the oldest fingerprint was evicted
+        self.assertEqual(len(snapshot), 2)
+        entry = next(e for fp, e in snapshot.items() if 'core_category' in fp)
+        self.assertEqual(entry['count'], 1)
+        self.assertEqual(sum(entry['histogram']), 1)
+        self.assertTrue(entry['explain'])
+        # Published for the command/view of other processes
+        published = worker_metrics.collect('querylog')
+        self.assertTrue(any('core_category' in fp for snapshot in published for fp in snapshot))
+
+    def test_top_queries_command_and_staff_view(self):
+        User.objects.create_superuser(username='admin', password='password', email='a@example.com')
+        self.client.login(username='admin', password='password')
+        self.client.get('/jobs/')
+
+        out = StringIO()
+        call_command('top_queries', stdout=out)
+        self.assertIn('core_joblisting', out.getvalue())
+
+        response = self.client.get('/metrics/queries/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['rows'])
+
+
+class WorkerMetricsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def tearDown(self):
+        cache.clear()
+
+    def publish_as(self, pid, snapshot):
+        with mock.patch('core.worker_metrics.os.getpid', return_value=pid):
+            worker_metrics.publish('test', snapshot)
+
+    def test_workers_claim_and_reuse_slots(self):
+        for pid in (1, 2, 3):
+            self.publish_as(pid, pid)
+        self.publish_as(2, 'two')
+        self.assertEqual(sorted(map(str, worker_metrics.collect('test'))), ['1', '3', 'two'])
+
+        # Worker 2 goes quiet past the TTL: its slot is free for the next worker
+        cache.delete('test:worker:2')
+        self.publish_as(4, 4)
+        self.assertEqual(cache.get('test:slots'), 3)
+        self.assertEqual(cache.get('test:worker:2')['snapshot'], 4)
+
+        # Worker 2 comes back and takes a new slot instead of overwriting 4
+        self.publish_as(2, 'back')
+        self.assertEqual(sorted(map(str, worker_metrics.collect('test'))), ['1', '3', '4', 'back'])
+
+    def test_concurrent_first_publishes_get_distinct_slots(self):
+        barrier = threading.Barrier(8)
+
+        def publish(pid):
+            barrier.wait()
+            worker_metrics._claim('test', {'owner': pid, 'snapshot': pid})
+
+        threads = [threading.Thread(target=publish, args=(pid,)) for pid in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sorted(worker_metrics.collect('test')), list(range(8)))
+
+
+@override_settings(JOB_VIEW_COUNTER={'FLUSH_INTERVAL': None, 'BATCH_SIZE': 2})
+class JobViewCounterTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        flush_views()
+        self.client_user = User.objects.create_user(username='client1', password='password', is_client=True)
+        self.client_profile = Client.objects.create(user=self.client_user)
+        self.jobs = [
+            JobListing.objects.create(client=self.client_profile, title=f'Job {i}', description='d', budget=10)
+            for i in range(3)
+        ]
+        self.client.login(username='client1', password='password')
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_views_are_buffered_then_flushed_in_batches(self):
+        for _ in range(3):
+            self.client.get(f'/jobs/{self.jobs[2].id}/')
+        self.client.get(f'/jobs/{self.jobs[0].id}/')
+        self.client.get(f'/jobs/{self.jobs[1].id}/')
+
+        # Nothing written on the request path yet
+        self.assertEqual(sum(JobListing.objects.values_list('views', flat=True)), 0)
+        # ...and no flush thread writing behind the test's back
+        self.assertFalse(any(t.name == 'job-view-flush' for t in threading.enumerate()))
+
+        # 3 jobs with BATCH_SIZE 2 -> 2 UPDATE statements
+        with self.assertNumQueries(2):
+            self.assertEqual(flush_views(), 3)
+        views = dict(JobListing.objects.values_list('id', 'views'))
+        self.assertEqual([views[j.id] for j in self.jobs], [1, 1, 3])
+
+        response = self.client.get('/jobs/?sort=popular')
+        self.assertEqual(response.context['jobs'][0]['id'], self.jobs[2].id)
+        self.assertContains(self.client.get('/dashboard/client/'), '3 views')
+
+    def test_failed_flush_keeps_counts(self):
+        record_view(self.jobs[0].id)
+        with mock.patch('core.view_counter.flush_counts', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                flush_views()
+        flush_views()
+        self.assertEqual(JobListing.objects.get(id=self.jobs[0].id).views, 1)
+
+    @override_settings(JOB_VIEW_COUNTER={'FLUSH_INTERVAL': 0})
+    def test_flush_thread_logs_errors_and_keeps_running(self):
+        counter = view_counter.counter
+        with mock.patch.object(counter, 'flush', side_effect=[RuntimeError, SystemExit]) as flush:
+            with self.assertLogs('core.view_counter', 'ERROR'), self.assertRaises(SystemExit):
+                counter.run()
+        self.assertEqual(flush.call_count, 2)
+
+
+@override_settings(TRENDING={'HALF_LIFE_HOURS': 1})
+class TrendingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        client_user = User.objects.create_user(username='client1', password='password', is_client=True)
+        client_profile = Client.objects.create(user=client_user)
+        self.old, self.new, self.quiet = [
+            JobListing.objects.create(client=client_profile, title=f'Job {i}', description='d', budget=10)
+            for i in range(3)
+        ]
+        self.epoch = trending.get_epoch()
+
+    def tearDown(self):
+        cache.clear()
+
+    def score(self, job):
+        return JobListing.objects.get(id=job.id).trending_score
+
+    def test_recent_applications_outrank_older_ones(self):
+        # 3 applications two hours ago vs 1 just now (1h half-life): 0.75 < 1
+        for _ in range(3):
+            trending.record_application(self.old.id, at=self.epoch + 3600)
+        trending.record_application(self.new.id, at=self.epoch + 3 * 3600)
+
+        now = self.epoch + 3 * 3600
+        self.assertAlmostEqual(trending.decayed_score(self.score(self.old), at=now), 0.75)
+        self.assertAlmostEqual(trending.decayed_score(self.score(self.new), at=now), 1.0)
+
+        response = self.client.get('/jobs/?sort=trending')
+        self.assertEqual([j['id'] for j in response.context['jobs']], [self.new.id, self.old.id, self.quiet.id])
+
+    def test_rescale_keeps_scores_bounded_and_order_intact(self):
+        trending.record_application(self.old.id, at=self.epoch + 10 * 3600)
+        trending.record_application(self.new.id, at=self.epoch + 11 * 3600)
+        self.assertAlmostEqual(self.score(self.new), 2 ** 11)
+
+        out = StringIO()
+        with mock.patch('core.trending.time.time', return_value=self.epoch + 11 * 3600):
+            with self.captureOnCommitCallbacks(execute=True):
+                call_command('rescale_trending', stdout=out)
+        self.assertAlmostEqual(self.score(self.new), 1.0)
+        self.assertAlmostEqual(self.score(self.old), 0.5)
+
+        # Bumps after the rescale use the new epoch, even from a stale cache
+        cache.set(trending.EPOCH_CACHE_KEY, self.epoch)
+        self.assertTrue(trending.record_application(self.quiet.id, at=self.epoch + 11 * 3600))
+        self.assertAlmostEqual(self.score(self.quiet), 1.0)
+
+    def test_trending_board_is_paged(self):
+        trending.record_application(self.old.id, at=self.epoch)
+        trending.record_application(self.new.id, at=self.epoch + 3600)
+        with mock.patch('core.views.JOB_LIST_PAGE_SIZE', 2):
+            first = self.client.get('/jobs/?sort=trending')
+            second = self.client.get('/jobs/?sort=trending&page=2')
+        self.assertEqual([j['id'] for j in first.context['jobs']], [self.new.id, self.old.id])
+        self.assertTrue(first.context['has_next'])
+        self.assertContains(first, '?sort=trending&page=2')
+        self.assertEqual([j['id'] for j in second.context['jobs']], [self.quiet.id])
+        self.assertFalse(second.context['has_next'])
+
+    def test_new_application_bumps_score(self):
+        freelancer_user = User.objects.create_user(username='freelancer1', password='password', is_freelancer=True)
+        Freelancer.objects.create(user=freelancer_user)
+        self.client.login(username='freelancer1', password='password')
+        self.client.post(f'/jobs/{self.quiet.id}/', {'proposal_text': 'hi', 'expected_payment': 10})
+        self.assertGreater(self.score(self.quiet), 0)
+
+
+class InterviewCalendarTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client_user = User.objects.create_user(username='client1', password='password', is_client=True)
+        client_profile = Client.objects.create(user=self.client_user, company_name='Tech Corp')
+        self.freelancer_user = User.objects.create_user(username='freelancer1', password='password', is_freelancer=True)
+        freelancer = Freelancer.objects.create(user=self.freelancer_user)
+        job = JobListing.objects.create(client=client_profile, title='Web Design', description='d', budget=10)
+        self.application = Application.objects.create(
+            job=job, freelancer=freelancer, proposal_text='p', expected_payment=10, status='Approved'
+        )
+        self.client_url = f'/calendar/{feed_token(self.client_user.id)}/interviews.ics'
+        self.freelancer_url = f'/calendar/{feed_token(self.freelancer_user.id)}/interviews.ics'
+
+    def tearDown(self):
+        cache.clear()
+
+    def schedule(self, when):
+        self.client.login(username='client1', password='password')
+        return self.client.post(f'/application/{self.application.id}/schedule/', {
+            'date_time': when, 'platform': 'Zoom', 'meeting_link': 'https://zoom.us/j/123',
+        })
+
+    def test_feed_lists_interviews_for_both_sides(self):
+        self.schedule('2030-01-15T10:30')
+        body = self.client.get(self.client_url).content.decode()
+        self.assertIn('BEGIN:VCALENDAR', body)
+        self.assertIn('DTSTART:20300115T103000Z', body)
+        self.assertIn('SUMMARY:Interview: Web Design with freelancer1', body)
+        self.assertIn('SUMMARY:Interview: Web Design at Tech Corp', self.client.get(self.freelancer_url).content.decode())
+
+    def test_unchanged_feed_returns_304_after_one_query(self):
+        response = self.client.get(self.freelancer_url)
+        etag = response['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get(self.freelancer_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        # Scheduling and rescheduling both change the ETag
+        self.schedule('2030-01-15T10:30')
+        response = self.client.get(self.freelancer_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+
+        interview = Interview.objects.get()
+        self.client.post(f'/interview/{interview.id}/reschedule/', {
+            'date_time': '2030-01-16T09:00', 'platform': 'Zoom', 'meeting_link': 'https://zoom.us/j/123',
+        })
+        response = self.client.get(self.freelancer_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('DTSTART:20300116T090000Z', response.content.decode())
+
+    def test_failed_version_bump_rolls_back_the_interview(self):
+        with mock.patch('core.views.bump_interview_version', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                self.schedule('2030-01-15T10:30')
+        self.assertFalse(Interview.objects.exists())
+
+    def test_version_does_not_depend_on_the_cache(self):
+        etag = self.client.get(self.freelancer_url)['ETag']
+        self.schedule('2030-01-15T10:30')
+        # Another worker with its own (empty) cache sees the change too
+        cache.clear()
+        response = self.client.get(self.freelancer_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        cache.clear()
+        self.assertEqual(self.client.get(self.freelancer_url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        # ORM deletes (admin, cascades) bump it as well
+        Interview.objects.all().delete()
+        self.assertEqual(self.client.get(self.freelancer_url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_bad_token_is_404(self):
+        self.assertEqual(self.client.get(f'/calendar/{self.client_user.id}:forged/interviews.ics').status_code, 404)
+
+
+class LocationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def tearDown(self):
+        cache.clear()
+
+    def make_client(self, username, location=None):
+        user = User.objects.create_user(username=username, password='password', is_client=True)
+        return Client.objects.create(user=user, location=location)
+
+    def test_aliases_resolve_to_one_location(self):
+        nyc = resolve_location('NYC')
+        self.assertEqual(resolve_location('New York'), nyc)
+        self.assertEqual(resolve_location('  new york, NY. '), nyc)
+        self.assertIsNone(resolve_location(' , '))
+
+        # Unknown places are added, and "City, ST" falls back to the city
+        austin = resolve_location('Austin')
+        self.assertEqual(resolve_location('Austin, TX'), austin)
+        self.assertEqual(Location.objects.get(id=austin).name, 'Austin')
+        self.assertTrue(LocationAlias.objects.filter(alias='austin tx', location_id=austin).exists())
+
+    def test_update_profile_and_post_job_keep_filter_and_counts(self):
+        client_profile = self.make_client('client1')
+        self.client.login(username='client1', password='password')
+        self.client.post('/profile/update/', {'company_name': 'Tech Corp', 'location': 'nyc'})
+        nyc = Location.objects.get(name='New York')
+        self.assertEqual(Client.objects.get(id=client_profile.id).resolved_location_id, nyc.id)
+
+        category = Category.objects.create(name='IT')
+        with override_settings(ADMISSION_CONTROL={}):
+            self.client.post('/post-job/', {'title': 'Dev', 'description': 'Need a dev', 'budget': 1, 'category': category.id})
+        other = self.make_client('client2', 'London')
+        JobListing.objects.create(client=other, title='Other', description='d', budget=1)
+        self.assertEqual(Location.objects.get(id=nyc.id).job_count, 1)
+
+        response = self.client.get(f'/jobs/?location={nyc.id}')
+        self.assertEqual([j['title'] for j in response.context['jobs']], ['Dev'])
+        self.assertEqual([loc['name'] for loc in response.context['locations']], ['London', 'New York'])
+
+        # Moving the client moves their jobs between the counts
+        self.client.post('/profile/update/', {'company_name': 'Tech Corp', 'location': 'San Francisco, CA'})
+        self.assertEqual(Location.objects.get(id=nyc.id).job_count, 0)
+        self.assertEqual(Location.objects.get(name='San Francisco').job_count, 1)
+
+    def test_orm_writes_and_admin_actions_keep_counts(self):
+        client_profile = self.make_client('client1', 'NYC')
+        Client.objects.filter(id=client_profile.id).update(resolved_location_id=resolve_location('NYC'))
+        nyc = Location.objects.get(name='New York')
+        first, second = [
+            JobListing.objects.create(client=client_profile, title=f'Job {i}', description='d', budget=1)
+            for i in range(2)
+        ]
+        self.assertEqual(Location.objects.get(id=nyc.id).job_count, 2)
+
+        User.objects.create_superuser(username='admin', password='password', email='a@example.com')
+        self.client.login(username='admin', password='password')
+        for action, expected in (('deactivate_jobs', 0), ('deactivate_jobs', 0), ('activate_jobs', 2)):
+            self.client.post('/admin/core/joblisting/', {
+                'action': action, '_selected_action': [first.id, second.id],
+            })
+            self.assertEqual(Location.objects.get(id=nyc.id).job_count, expected)
+
+        first.refresh_from_db()
+        first.is_active = False
+        first.save()
+        self.assertEqual(Location.objects.get(id=nyc.id).job_count, 1)
+        second.delete()
+        self.assertEqual(Location.objects.get(id=nyc.id).job_count, 0)
+
+    def test_orm_location_change_moves_counts(self):
+        client_profile = self.make_client('client1', 'NYC')
+        nyc = Location.objects.get(name='New York')
+        self.assertEqual(client_profile.resolved_location_id, nyc.id)
+        for i in range(2):
+            JobListing.objects.create(client=client_profile, title=f'Job {i}', description='d', budget=1)
+        JobListing.objects.create(client=client_profile, title='Closed', description='d', budget=1, is_active=False)
+        self.assertEqual(Location.objects.get(id=nyc.id).job_count, 2)
+
+        client_profile.location = 'London, UK'
+        client_profile.save()
+        london = Location.objects.get(name='London')
+        self.assertEqual(Client.objects.get(id=client_profile.id).resolved_location_id, london.id)
+        self.assertEqual(Location.objects.get(id=nyc.id).job_count, 0)
+        self.assertEqual(Location.objects.get(id=london.id).job_count, 2)
+
+        # Saving other fields leaves the counts alone
+        client_profile.company_name = 'Tech Corp'
+        client_profile.save()
+        self.assertEqual(Location.objects.get(id=london.id).job_count, 2)
+
+    def test_la_is_not_los_angeles(self):
+        self.assertNotEqual(resolve_location('LA'), resolve_location('Los Angeles'))
+
+    def test_backfill_command(self):
+        first = self.make_client('c1', 'New York City')
+        second = self.make_client('c2', 'Dhaka, Bangladesh')
+        third = self.make_client('c3', 'NYC')
+        JobListing.objects.create(client=first, title='A', description='d', budget=1)
+        JobListing.objects.create(client=third, title='B', description='d', budget=1)
+        # Rows written before resolved_location existed
+        Client.objects.update(resolved_location=None)
+
+        call_command('backfill_locations', batch_size=2, stdout=StringIO())
+
+        nyc = Location.objects.get(name='New York')
+        self.assertEqual(Client.objects.get(id=first.id).resolved_location_id, nyc.id)
+        self.assertEqual(Client.objects.get(id=third.id).resolved_location_id, nyc.id)
+        self.assertEqual(Client.objects.get(id=second.id).resolved_location.name, 'Dhaka')
+        self.assertEqual(Location.objects.get(id=nyc.id).job_count, 2)
+
+
+class AutocompleteTests(TestCase):
+    def setUp(self):
+        autocomplete.service.reset()
+
+    def tearDown(self):
+        autocomplete.service.reset()
+        cache.clear()
+
+    def test_prefix_index_ranks_by_weight(self):
+        index = autocomplete.PrefixIndex(
+            {'Python': 5, 'PyTorch': 2, 'python ': 1, 'Perl': 3, 'PHP': 1},
+            precompute_length=2, dense_range=1,
+        )
+        self.assertEqual(len(index), 4)
+        self.assertEqual(index.complete('py'), [('Python', 6), ('PyTorch', 2)])
+        self.assertEqual(index.complete('p', k=2), [('Python', 6), ('Perl', 3)])
+        self.assertEqual(index.complete('pyth'), [('Python', 6)])
+        self.assertEqual(index.complete('ruby'), [])
+        self.assertEqual(index.complete('  '), [])
+
+        # Incremental adds update the precomputed lists too
+        index.add('Pygame', 7)
+        index.add('PHP', 4)
+        self.assertEqual(index.complete('p', k=3), [('Pygame', 7), ('Python', 6), ('PHP', 5)])
+        self.assertEqual(index.complete('py', k=1), [('Pygame', 7)])
+        self.assertGreater(index.memory_bytes(), 0)
+
+    def test_endpoint_merges_titles_and_skills(self):
+        user = User.objects.create_user(username='client1', password='password', is_client=True)
+        client_profile = Client.objects.create(user=user)
+        JobListing.objects.create(client=client_profile, title='Django Developer', description='d', budget=1)
+        JobListing.objects.create(client=client_profile, title='Senior Django Developer', description='d', budget=1)
+        JobListing.objects.create(client=client_profile, title='Dentist', description='d', budget=1, is_active=False)
+        freelancer_user = User.objects.create_user(username='free1', password='password', is_freelancer=True)
+        Freelancer.objects.create(user=freelancer_user, skills='Django, DevOps')
+
+        response = self.client.get('/autocomplete/', {'q': 'dj', 'kind': 'title'})
+        self.assertEqual([r['term'] for r in response.json()['results']], ['Django', 'Django Developer'])
+
+        results = self.client.get('/autocomplete/', {'q': 'd'}).json()['results']
+        self.assertEqual(results[0], {'term': 'Developer', 'kind': 'title', 'weight': 2})
+        self.assertIn({'term': 'DevOps', 'kind': 'skill', 'weight': 1}, results)
+        self.assertNotIn('Dentist', [r['term'] for r in results])
+        self.assertEqual(len(self.client.get('/autocomplete/', {'q': 'd', 'k': 2}).json()['results']), 2)
+        self.assertEqual(self.client.get('/autocomplete/', {'q': 'd', 'kind': 'bogus'}).status_code, 400)
+
+    @override_settings(ADMISSION_CONTROL={})
+    def test_writes_are_added_without_a_rebuild(self):
+        user = User.objects.create_user(username='client1', password='password', is_client=True)
+        Client.objects.create(user=user)
+        category = Category.objects.create(name='IT')
+        autocomplete.warm()
+
+        self.client.login(username='client1', password='password')
+        self.client.post('/post-job/', {
+            'title': 'Kotlin Engineer', 'description': 'Android app', 'budget': 10, 'category': category.id,
+        })
+        with self.assertNumQueries(0):
+            terms = [r['term'] for r in autocomplete.complete('kot', kind='title')]
+        self.assertEqual(terms, ['Kotlin', 'Kotlin Engineer'])
+
+        freelancer_user = User.objects.create_user(username='free1', password='password', is_freelancer=True)
+        Freelancer.objects.create(user=freelancer_user, skills='Rust')
+        self.client.login(username='free1', password='password')
+        self.client.post('/profile/update/', {'skills': 'Rust, Elixir', 'portfolio_link': ''})
+        self.assertEqual(autocomplete.complete('eli', kind='skill'), [{'term': 'Elixir', 'kind': 'skill', 'weight': 1}])
+
+        # Search box on the board filters by title
+        response = self.client.get('/jobs/', {'q': 'kotlin'})
+        self.assertEqual([j['title'] for j in response.context['jobs']], ['Kotlin Engineer'])
+        # Prefix match only, with LIKE wildcards taken literally
+        self.assertEqual(self.client.get('/jobs/', {'q': 'engineer'}).context['jobs'], [])
+        self.assertEqual(self.client.get('/jobs/', {'q': 'k_tlin'}).context['jobs'], [])
+        self.assertEqual(len(self.client.get('/jobs/', {'q': 'Kotlin E'}).context['jobs']), 1)
+
+
+class FreelancerDashboardPaginationTests(TestCase):
+    def setUp(self):
+        client_user = User.objects.create_user(username='client1', password='password', is_client=True)
+        client_profile = Client.objects.create(user=client_user, company_name='Tech Corp')
+        freelancer_user = User.objects.create_user(username='freelancer1', password='password', is_freelancer=True)
+        self.freelancer = Freelancer.objects.create(user=freelancer_user)
+
+        statuses = ['Pending', 'Approved', 'Rejected', 'Pending']
+        jobs = JobListing.objects.bulk_create([
+            JobListing(client=client_profile, title=f'Job {i}', description='d', budget=1) for i in range(45)
+        ])
+        Application.objects.bulk_create([
+            Application(job=job, freelancer=self.freelancer, proposal_text='x' * 5000,
+                        expected_payment=10, status=statuses[i % 4])
+            for i, job in enumerate(jobs)
+        ])
+        # Pairs of applications share a timestamp, so the id has to break ties
+        base = timezone.now()
+        for i, app in enumerate(Application.objects.order_by('id')):
+            Application.objects.filter(id=app.id).update(created_at=base - timezone.timedelta(minutes=i // 2))
+
+        self.client.login(username='freelancer1', password='password')
+
+    def walk(self, status=''):
+        seen, after, pages = [], '', 0
+        while True:
+            response = self.client.get('/dashboard/freelancer/', {'status': status, 'after': after})
+            seen += [app['id'] for app in response.context['applications']]
+            pages += 1
+            after = response.context['next_cursor']
+            if not after:
+                return seen, pages, response
+
+    def test_pages_cover_every_application_once_in_order(self):
+        seen, pages, response = self.walk()
+        expected = list(
+            Application.objects.filter(freelancer=self.freelancer)
+            .order_by('-created_at', '-id').values_list('id', flat=True)
+        )
+        self.assertEqual(seen, expected)
+        self.assertEqual(pages, 3)
+        self.assertNotIn('proposal_text', response.context['applications'][0])
+
+        self.assertEqual(response.context['total_applications'], 45)
+        self.assertEqual(
+            response.context['status_counts'], [('Pending', 23), ('Approved', 11), ('Rejected', 11)]
+        )
+
+    def test_status_filter(self):
+        seen, pages, _ = self.walk('Approved')
+        self.assertEqual(len(seen), 11)
+        self.assertEqual(pages, 1)
+        self.assertEqual(set(Application.objects.filter(id__in=seen).values_list('status', flat=True)), {'Approved'})
+
+        seen, pages, _ = self.walk('Pending')
+        self.assertEqual((len(seen), len(set(seen)), pages), (23, 23, 2))
+
+    def test_bad_cursor_or_status_falls_back_to_first_page(self):
+        response = self.client.get('/dashboard/freelancer/', {'after': 'not-a-cursor', 'status': 'Bogus'})
+        self.assertEqual(len(response.context['applications']), 20)
+        self.assertIsNone(response.context['status_filter'])
+        self.assertTrue(response.context['is_first_page'])
+
+
+class BulkDeleteTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name='IT')
+        self.freelancer = self.make_freelancer('free1')
+        self.client_profile = self.make_client('client1', jobs=5)
+        self.other_client = self.make_client('client2', jobs=1)
+
+    def tearDown(self):
+        cache.clear()
+
+    def make_freelancer(self, username):
+        user = User.objects.create_user(username=username, password='password', is_freelancer=True)
+        return Freelancer.objects.create(user=user)
+
+    def make_client(self, username, jobs):
+        user = User.objects.create_user(username=username, password='password', is_client=True)
+        client_profile = Client.objects.create(user=user, location='NYC', resolved_location_id=resolve_location('NYC'))
+        for i in range(jobs):
+            job = JobListing.objects.create(
+                client=client_profile, title=f'{username} job {i}', description='d', budget=1, category=self.category
+            )
+            application = Application.objects.create(
+                job=job, freelancer=self.freelancer, proposal_text='p', expected_payment=1
+            )
+            Interview.objects.create(application=application, date_time=timezone.now(), link_or_location='x')
+        return client_profile
+
+    def test_every_reverse_relation_is_handled(self):
+        # Edges bulk_delete walks explicitly, on top of DEPENDENTS
+        tree = {
+            'core_user': {'core_client', 'core_freelancer'},
+            'core_client': {'core_joblisting'},
+            'core_freelancer': {'core_application'},
+            'core_joblisting': {'core_application'},
+        }
+        for model in (User, Client, Freelancer, JobListing, Application):
+            table = model._meta.db_table
+            handled = tree.get(table, set()) | {t for t, _ in bulk_delete.DEPENDENTS.get(table, ())}
+            referencing = {rel.related_model._meta.db_table for rel in model._meta.related_objects}
+            referencing |= {f.m2m_db_table() for f in model._meta.many_to_many}
+            self.assertEqual(referencing - handled, set(), table)
+
+    def test_delete_client_in_batches_keeps_caches_and_counts(self):
+        location = Location.objects.get(name='New York')
+        recompute_job_counts()
+        self.assertEqual(Location.objects.get(id=location.id).job_count, 6)
+        self.assertEqual(len(get_applied_jobs(self.freelancer.id)), 6)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            deleted = bulk_delete.bulk_delete('client', [self.client_profile.id], batch_size=2)
+
+        self.assertEqual(deleted['core_joblisting'], 5)
+        self.assertEqual(deleted['core_application'], 5)
+        self.assertEqual(deleted['core_interview'], 5)
+        self.assertEqual(deleted['core_jobsignature'], 5)
+        self.assertFalse(Client.objects.filter(id=self.client_profile.id).exists())
+        # The user stays; the other client's tree is untouched
+        self.assertTrue(User.objects.filter(username='client1').exists())
+        self.assertEqual(JobListing.objects.count(), 1)
+        self.assertEqual(Interview.objects.count(), 1)
+
+        self.assertEqual(Location.objects.get(id=location.id).job_count, 1)
+        self.assertEqual(len(get_applied_jobs(self.freelancer.id)), 1)
+
+    def test_command_dry_run_and_resume(self):
+        users = list(User.objects.filter(username__in=['client1', 'free1']).values_list('id', flat=True))
+        out = StringIO()
+        call_command('bulk_delete', 'user', *map(str, users), '--dry-run', stdout=out)
+        self.assertIn('core_application: 6 row(s)', out.getvalue())
+        self.assertIn('core_joblisting: 5 row(s)', out.getvalue())
+        self.assertEqual(Application.objects.count(), 6)
+
+        # Stop after the first committed batch, then run again
+        def interrupt(table, deleted):
+            raise KeyboardInterrupt
+
+        with self.assertRaises(KeyboardInterrupt):
+            bulk_delete.bulk_delete('user', users, batch_size=2, progress=interrupt)
+        self.assertEqual(Application.objects.count(), 4)
+
+        call_command('bulk_delete', 'user', *map(str, users), '--batch-size', '2', stdout=StringIO())
+        self.assertFalse(User.objects.filter(id__in=users).exists())
+        self.assertEqual(list(Application.objects.values_list('freelancer_id', flat=True)), [])
+        self.assertEqual(JobListing.objects.get().client_id, self.other_client.id)
+
+    def test_admin_delete_action_uses_bulk_path(self):
+        User.objects.create_superuser(username='admin', password='password', email='a@example.com')
+        self.client.login(username='admin', password='password')
+        ids = [self.client_profile.id, self.other_client.id]
+
+        response = self.client.post('/admin/core/client/', {'action': 'delete_selected', '_selected_action': ids})
+        self.assertContains(response, 'Job listings: 6')
+        self.assertContains(response, 'Interviews: 6')
+
+        with mock.patch('django.db.models.deletion.Collector.collect') as collect:
+            self.client.post('/admin/core/client/', {
+                'action': 'delete_selected', '_selected_action': ids, 'post': 'yes',
+            })
+        collect.assert_not_called()
+        self.assertFalse(Client.objects.exists())
+        self.assertFalse(JobListing.objects.exists())
+
+
+class ApplicantRankingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        client_user = User.objects.create_user(username='client1', password='password', is_client=True)
+        self.client_profile = Client.objects.create(user=client_user)
+        self.job = JobListing.objects.create(
+            client=self.client_profile, title='Django Developer', description='REST API with Python and MySQL', budget=100
+        )
+        self.client.login(username='client1', password='password')
+
+    def tearDown(self):
+        cache.clear()
+
+    def apply(self, username, skills, bid, minutes_ago=0):
+        user = User.objects.create_user(username=username, password='password', is_freelancer=True)
+        freelancer = Freelancer.objects.create(user=user, skills=skills)
+        application = Application.objects.create(
+            job=self.job, freelancer=freelancer, proposal_text='p', expected_payment=bid
+        )
+        Application.objects.filter(id=application.id).update(
+            created_at=timezone.now() - timezone.timedelta(minutes=minutes_ago)
+        )
+        return application
+
+    def names(self, **params):
+        response = self.client.get(f'/job/{self.job.id}/applications/', params)
+        return [app['freelancer_name'] for app in response.context['applications']]
+
+    def test_score_combines_budget_skills_and_recency(self):
+        self.apply('expert', 'Python, Django, MySQL', 100, minutes_ago=60)
+        self.apply('pricey', 'Python, Django, MySQL', 190, minutes_ago=60)
+        self.apply('designer', 'Figma, Photoshop', 100, minutes_ago=60)
+        self.apply('latecomer', 'Python, Django, MySQL', 100, minutes_ago=0)
+
+        self.assertEqual(self.names(), ['latecomer', 'expert', 'pricey', 'designer'])
+        self.assertEqual(self.names(sort='bid_high')[0], 'pricey')
+        self.assertEqual(self.names(sort='oldest')[-1], 'latecomer')
+
+        response = self.client.get(f'/job/{self.job.id}/applications/')
+        top = response.context['applications'][0]
+        self.assertEqual(top['match'], {'budget': 1.0, 'skills': 1.0, 'recency': 1.0})
+        self.assertAlmostEqual(top['score'], 1.0)
+
+    @override_settings(APPLICANT_RANKING={'PAGE_SIZE': 2})
+    def test_ranking_is_cached_until_a_new_application(self):
+        for i in range(5):
+            self.apply(f'f{i}', 'Python', 100 + i)
+
+        self.assertEqual(self.names(sort='bid_low', page=3), ['f4'])
+        # Pages after the first reuse the cached orders: no per-applicant query
+        with self.assertNumQueries(0):
+            applicant_ranking.get_ranking(self.job.id)
+
+        self.apply('newcomer', 'Python', 50)
+        self.assertEqual(self.names(sort='bid_low'), ['newcomer', 'f0'])
+        self.assertEqual(self.client.get(f'/job/{self.job.id}/applications/').context['total_applications'], 6)
+
+    def test_ranked_ids_slices_in_both_directions(self):
+        packed = array('I', [5, 3, 9, 1]).tobytes()
+        self.assertEqual(applicant_ranking.RankedIds(packed)[1:3], [3, 9])
+        self.assertEqual(applicant_ranking.RankedIds(packed, reverse=True)[0:3], [1, 9, 3])
+        self.assertEqual(len(applicant_ranking.RankedIds(packed)), 4)
+
+
+class LiveEventsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        events.hub.reset()
+        self.user = User.objects.create_user(username='client1', password='password', is_client=True)
+
+    def tearDown(self):
+        events.hub.reset()
+        cache.clear()
+
+    def test_hub_fans_out_across_threads_and_drops_stalled_clients(self):
+        async def scenario():
+            first = await events.hub.subscribe('user:1')
+            second = await events.hub.subscribe('user:1')
+            other = await events.hub.subscribe('user:2')
+
+            # Views publish from worker threads
+            thread = threading.Thread(target=events.LocalBroker().publish, args=('user:1', {'id': 1, 'type': 't'}))
+            thread.start()
+            thread.join()
+            received = [await asyncio.wait_for(s.queue.get(), 1) for s in (first, second)]
+            self.assertTrue(other.queue.empty())
+
+            with override_settings(EVENTS={'QUEUE_SIZE': 2}):
+                stalled = await events.hub.subscribe('user:3')
+                for i in range(3):
+                    events.hub.dispatch('user:3', {'id': i, 'type': 't', 'data': {}})
+            self.assertNotIn(stalled, events.hub.subscribers.get('user:3', ()))
+            chunks = [chunk async for chunk in events.stream(stalled)]
+            # Retry hint and the newest event that still fitted, then the stream ends
+            self.assertEqual(len(chunks), 2)
+
+            replay = await events.hub.subscribe('user:3', last_event_id=0)
+            return received, [e['id'] for e in replay.backlog]
+
+        received, replayed = asyncio.run(scenario())
+        self.assertEqual(received, [{'id': 1, 'type': 't'}] * 2)
+        self.assertEqual(replayed, [1, 2])
+
+    @override_settings(EVENTS={'REPLAY_SIZE': 3, 'REPLAY_CHANNELS': 5})
+    def test_publishing_without_a_loop_only_fills_the_bounded_replay_buffer(self):
+        # WSGI: every view thread publishes and no event loop runs
+        def publish(worker):
+            for i in range(300):
+                events.hub.publish_threadsafe(f'user:{i % 20}', {'id': worker * 1000 + i, 'type': 't'})
+
+        threads = [threading.Thread(target=publish, args=(worker,)) for worker in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(events.hub.recent), 5)
+        self.assertTrue(all(len(recent) <= 3 for recent in events.hub.recent.values()))
+
+    async def test_stream_endpoint_sends_replay_and_live_events(self):
+        response = await self.async_client.get('/events/')
+        self.assertEqual(response.status_code, 403)
+
+        await self.async_client.aforce_login(self.user)
+        events.hub.dispatch(f'user:{self.user.id}', {'id': 5, 'type': 'application.new', 'data': {'job_id': 1}})
+        response = await self.async_client.get('/events/', headers={'Last-Event-ID': '4'})
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+
+        chunks = aiter(response.streaming_content)
+        self.assertEqual(await anext(chunks), b'retry: 5000\n\n')
+        self.assertEqual(await anext(chunks), b'id: 5\nevent: application.new\ndata: {"job_id": 1}\n\n')
+
+        events.LocalBroker().publish(f'user:{self.user.id}', {'id': 6, 'type': 'interview.scheduled', 'data': {}})
+        self.assertIn(b'event: interview.scheduled', await asyncio.wait_for(anext(chunks), 1))
+
+    def test_views_publish_to_the_right_users(self):
+        client_profile = Client.objects.create(user=self.user)
+        job = JobListing.objects.create(client=client_profile, title='Dev', description='d', budget=10)
+        freelancer_user = User.objects.create_user(username='free1', password='password', is_freelancer=True)
+        Freelancer.objects.create(user=freelancer_user)
+
+        self.client.login(username='free1', password='password')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f'/jobs/{job.id}/', {'proposal_text': 'Hi', 'expected_payment': 10})
+        event = events.hub.recent[f'user:{self.user.id}'][-1]
+        self.assertEqual((event['type'], event['data']['freelancer']), ('application.new', 'free1'))
+
+        application = Application.objects.get()
+        self.client.login(username='client1', password='password')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.get(f'/application/{application.id}/update/Rejected/')
+        event = events.hub.recent[f'user:{freelancer_user.id}'][-1]
+        self.assertEqual(event['data'], {
+            'application_id': application.id, 'job_id': job.id, 'job_title': 'Dev', 'status': 'Rejected',
+        })
+
+
+class PooledSQLiteWrapper(pool.PooledDatabaseWrapperMixin, SQLiteDatabaseWrapper):
+    pass
+
+
+class ConnectionPoolTests(TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix='.sqlite3')
+        os.close(fd)
+        self.wrappers = []
+
+    def tearDown(self):
+        for wrapper in self.wrappers:
+            wrapper.close()
+        pool.close_pools('pooltest')
+        os.unlink(self.path)
+        cache.clear()
+
+    def wrapper(self, **pool_options):
+        settings_dict = dict(
+            connection.settings_dict, NAME=self.path, CONN_MAX_AGE=0,
+            OPTIONS={'POOL': dict(pool_options, PUBLISH_INTERVAL=3600)},
+        )
+        wrapper = PooledSQLiteWrapper(settings_dict, alias='pooltest')
+        self.wrappers.append(wrapper)
+        return wrapper
+
+    def query(self, wrapper):
+        with wrapper.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            return cursor.fetchone()[0]
+
+    def test_close_returns_the_connection_for_reuse(self):
+        first, second = self.wrapper(), self.wrapper()
+        self.assertEqual(self.query(first), 1)
+        raw = first.connection
+        first.close()
+        self.assertIsNone(first.connection)
+
+        self.query(second)
+        self.assertIs(second.connection, raw)
+        self.query(first)
+        self.assertIsNot(first.connection, raw)
+
+        stats = first.pool.snapshot()
+        self.assertEqual((stats['checkouts'], stats['created'], stats['in_use']), (3, 2, 2))
+
+    def test_checkout_times_out_when_the_pool_is_exhausted(self):
+        first, second = self.wrapper(MAX_SIZE=1, TIMEOUT=0.05), self.wrapper(MAX_SIZE=1, TIMEOUT=0.05)
+        self.query(first)
+        with self.assertRaises(pool.PoolTimeout):
+            self.query(second)
+        self.assertEqual(first.pool.snapshot()['timeouts'], 1)
+
+        # A waiting checkout gets the connection as soon as it is returned
+        second.pool.timeout = 5
+        first.inc_thread_sharing()
+        threading.Timer(0.02, first.close).start()
+        self.assertEqual(self.query(second), 1)
+
+    def test_connection_goes_back_to_the_pool_it_came_from(self):
+        wrapper = self.wrapper()
+        self.query(wrapper)
+        raw, checked_out_from = wrapper.connection, wrapper.pool
+
+        # Forked: this process gets a new pool, and the socket is the parent's
+        checked_out_from.pid = -1
+        self.addCleanup(pool._inherited.remove, checked_out_from)
+        replacement = wrapper.pool
+        self.assertIsNot(replacement, checked_out_from)
+        wrapper.close()
+        self.assertEqual((replacement.size, len(replacement.idle)), (0, 0))
+        self.assertEqual(raw.execute("SELECT 1").fetchone()[0], 1)
+        raw.close()
+
+        # Replaced after a settings change: the old pool closes it on checkin
+        self.query(wrapper)
+        raw = wrapper.connection
+        pool.close_pools('pooltest')
+        wrapper.close()
+        self.assertEqual((replacement.size, len(replacement.idle)), (0, 0))
+        self.assertEqual(wrapper.pool.size, 0)
+        with self.assertRaises(sqlite3.ProgrammingError):
+            raw.execute("SELECT 1")
+
+    def test_expired_and_broken_connections_are_replaced(self):
+        wrapper = self.wrapper(MAX_LIFETIME=0)
+        self.query(wrapper)
+        raw = wrapper.connection
+        wrapper.close()
+        self.query(wrapper)
+        self.assertIsNot(wrapper.connection, raw)
+        self.assertEqual(wrapper.pool.snapshot()['discarded'], 1)
+
+        pool.close_pools('pooltest')
+        wrapper = self.wrapper(HEALTH_CHECK_AFTER=0)
+        self.query(wrapper)
+        raw = wrapper.connection
+        wrapper.close()
+        raw.close()  # e.g. dropped by the server's wait_timeout
+        self.assertEqual(self.query(wrapper), 1)
+        stats = wrapper.pool.snapshot()
+        self.assertEqual((stats['failed_health_checks'], stats['created'], stats['size']), (1, 2, 1))
+
+    def test_open_transaction_is_rolled_back_on_checkin(self):
+        wrapper = self.wrapper()
+        with wrapper.cursor() as cursor:
+            cursor.execute("CREATE TABLE t (x integer)")
+        wrapper.set_autocommit(False)
+        with wrapper.cursor() as cursor:
+            cursor.execute("INSERT INTO t VALUES (1)")
+        wrapper.close()
+        with wrapper.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM t")
+            self.assertEqual(cursor.fetchone()[0], 0)
+
+    def test_persistent_connections_are_rejected(self):
+        wrapper = self.wrapper()
+        wrapper.settings_dict['CONN_MAX_AGE'] = 60
+        with self.assertRaises(ImproperlyConfigured):
+            wrapper.ensure_connection()
+
+    def test_metrics_endpoint_merges_workers(self):
+        wrapper = self.wrapper()
+        self.query(wrapper)
+        snapshot = dict(wrapper.pool.snapshot(), pid=1)
+        with mock.patch('core.worker_metrics.os.getpid', return_value=1):
+            worker_metrics.publish('db_pool', [snapshot])
+
+        staff = User.objects.create_user(username='ops', password='password', is_staff=True)
+        self.client.force_login(staff)
+        data = self.client.get('/metrics/db-pool/').json()
+        self.assertEqual(len(data['workers']), 2)
+        totals = data['aliases']['pooltest']
+        self.assertEqual((totals['workers'], totals['checkouts'], totals['in_use']), (2, 2, 2))
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class InterviewReminderTests(TestCase):
+    # 2030-01-15 00:00 UTC
+    T0 = 1894665600
+
+    def setUp(self):
+        reminders._queue = None
+        self.client_user = User.objects.create_user(
+            username='client1', password='password', is_client=True, email='client@example.com'
+        )
+        client_profile = Client.objects.create(user=self.client_user, company_name='Tech Corp')
+        self.job = JobListing.objects.create(client=client_profile, title='Web Design', description='d', budget=10)
+        self.applications = []
+        for i in range(4):
+            user = User.objects.create_user(username=f'free{i}', password='password', email=f'free{i}@example.com')
+            self.applications.append(Application.objects.create(
+                job=self.job, freelancer=Freelancer.objects.create(user=user), proposal_text='p', expected_payment=10,
+            ))
+        self.clock = FakeClock(self.T0)
+        self.batches = []
+
+    def tearDown(self):
+        reminders._queue = None
+        cache.clear()
+
+    def interview(self, application, hours):
+        return Interview.objects.create(
+            application=application, link_or_location='Room 4',
+            date_time=datetime.fromtimestamp(self.T0 + hours * 3600, dt_timezone.utc),
+        )
+
+    def scheduler(self, **config):
+        config = dict(reminders.DEFAULTS, LEAD_TIMES=(3600,), WINDOW=4 * 3600, **config)
+        scheduler = reminders.ReminderScheduler(
+            clock=self.clock, sender=lambda batch: self.batches.append(batch),
+            changes=reminders.get_queue(), config=config,
+        )
+        scheduler.start()
+        return scheduler
+
+    def sent(self):
+        return [[(r['id'], r['lead']) for r in batch] for batch in self.batches]
+
+    def test_reminders_go_out_when_due_in_batches(self):
+        first, second, third = (self.interview(a, 3) for a in self.applications[:3])
+        later = self.interview(self.applications[3], 2.5)
+        scheduler = self.scheduler(BATCH_SIZE=1)
+        self.assertEqual(len(scheduler.heap), 4)
+
+        self.clock.now = self.T0 + 3600
+        self.assertEqual(scheduler.step(), 0)
+        self.clock.now = self.T0 + 2 * 3600
+        self.assertEqual(scheduler.step(), 4)
+        # Reminders due at the same time are never split across batches
+        self.assertEqual(self.sent(), [[(later.id, 3600)], [(first.id, 3600), (second.id, 3600), (third.id, 3600)]])
+        self.assertEqual(scheduler.seconds_until_next(), reminders.MAX_SLEEP)
+
+    def test_schedule_and_reschedule_update_the_heap_without_reloading(self):
+        scheduler = self.scheduler()
+        application = self.applications[0]
+        self.client.login(username='client1', password='password')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f'/application/{application.id}/schedule/', {
+                'date_time': '2030-01-15T03:00', 'platform': 'Zoom', 'meeting_link': 'https://zoom.us/j/1',
+            })
+        interview = Interview.objects.get()
+        with mock.patch.object(reminders, 'load_interview_times') as load:
+            scheduler.step()
+            self.assertFalse(load.called)
+        self.assertEqual(scheduler.pending, {(interview.id, 3600): self.T0 + 2 * 3600})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f'/interview/{interview.id}/reschedule/', {
+                'date_time': '2030-01-15T04:00', 'platform': 'Zoom', 'meeting_link': 'https://zoom.us/j/1',
+            })
+        self.clock.now = self.T0 + 2 * 3600
+        self.assertEqual(scheduler.step(), 0)
+        self.clock.now = self.T0 + 3 * 3600
+        self.assertEqual(scheduler.step(), 1)
+        self.assertEqual(self.batches[0][0]['timestamp'], self.T0 + 4 * 3600)
+
+    def test_database_queue_crosses_processes(self):
+        self.assertIsInstance(reminders.get_queue(), reminders.DatabaseQueue)
+        interview = self.interview(self.applications[0], 2)
+        with self.captureOnCommitCallbacks(execute=True):
+            reminders.notify_interview(interview.id, interview.date_time)
+        # What the scheduler process would read: a fresh queue, same table
+        changes = reminders.DatabaseQueue()
+        message = changes.get(0)
+        self.assertEqual((message['id'], message['date_time']), (interview.id, self.T0 + 2 * 3600))
+        self.assertIsNone(changes.get(0))
+        self.assertFalse(ReminderChange.objects.exists())
+
+    def test_database_queue_prunes_changes_nobody_took(self):
+        changes = reminders.DatabaseQueue()
+        now = time.time()
+        changes.put({'id': 1, 'date_time': self.T0, 'at': now - 2 * changes.MAX_AGE})
+        changes.put({'id': 2, 'date_time': self.T0, 'at': now - changes.MAX_AGE + 60})
+        changes.put({'id': 3, 'date_time': self.T0, 'at': now})
+        self.assertEqual(sorted(ReminderChange.objects.values_list('interview_id', flat=True)), [2, 3])
+
+    @override_settings(INTERVIEW_REMINDERS={'QUEUE': 'core.reminders.LocalQueue'})
+    def test_run_reminders_refuses_a_local_queue(self):
+        with self.assertRaises(CommandError):
+            call_command('run_reminders', stdout=StringIO())
+
+    def test_restart_resumes_from_the_checkpoint_window(self):
+        early, late = self.interview(self.applications[0], 2), self.interview(self.applications[1], 3)
+        self.interview(self.applications[2], 48)
+        scheduler = self.scheduler()
+        self.assertEqual(set(scheduler.pending), {(early.id, 3600), (late.id, 3600)})
+        self.clock.now = self.T0 + 3600
+        self.assertEqual(scheduler.step(), 1)
+
+        # Down for an hour; the restart owes only the reminder due meanwhile
+        self.clock.now = self.T0 + 2.5 * 3600
+        self.batches.clear()
+        restarted = self.scheduler()
+        self.assertEqual(restarted.step(), 1)
+        self.assertEqual(self.sent(), [[(late.id, 3600)]])
+
+    def test_failed_batch_is_retried(self):
+        interview = self.interview(self.applications[0], 2)
+        scheduler = self.scheduler(RETRY_SECONDS=60)
+        scheduler.sender = mock.Mock(side_effect=[OSError('smtp down'), None])
+        self.clock.now = self.T0 + 3600
+        with self.assertLogs('core.reminders', 'ERROR'):
+            self.assertEqual(scheduler.step(), 0)
+        self.clock.now += 60
+        self.assertEqual(scheduler.step(), 1)
+        self.assertEqual(scheduler.sender.call_args[0][0][0]['id'], interview.id)
+
+    def test_send_reminders_emails_both_participants(self):
+        from django.core import mail
+
+        interview = self.interview(self.applications[0], 2)
+        with self.captureOnCommitCallbacks(execute=True):
+            reminders.send_reminders([dict(reminders.load_reminder_details([interview.id])[interview.id], lead=3600)])
+        self.assertEqual(sorted(m.to[0] for m in mail.outbox), ['client@example.com', 'free0@example.com'])
+        self.assertIn('Tech Corp', next(m.body for m in mail.outbox if m.to == ['free0@example.com']))
+        self.assertEqual(events.hub.recent[f'user:{self.client_user.id}'][-1]['type'], 'interview.reminder')
+
+
+class JobDetailCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client_user = User.objects.create_user(username='client1', password='password', is_client=True)
+        self.profile = Client.objects.create(user=self.client_user, company_name='Tech Corp', location='Berlin')
+        self.job = JobListing.objects.create(client=self.profile, title='Web Design', description='d', budget=10)
+        self.client.login(username='client1', password='password')
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_detail_record_is_cached_until_the_client_changes(self):
+        self.assertContains(self.client.get(f'/jobs/{self.job.id}/'), 'Tech Corp')
+        with mock.patch.object(object_cache.job_details, 'loader') as loader:
+            self.assertContains(self.client.get(f'/jobs/{self.job.id}/'), 'Tech Corp')
+            self.assertFalse(loader.called)
+
+        # Same name and location: the record stays cached
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/profile/update/', {'company_name': 'Tech Corp', 'location': 'Berlin'})
+        self.assertIsNotNone(cache.get(f'objcache:job_detail:{self.job.id}'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post('/profile/update/', {'company_name': 'New Corp', 'location': 'Berlin'})
+        self.assertContains(self.client.get(f'/jobs/{self.job.id}/'), 'New Corp')
+
+        self.job.title = 'Logo Design'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.job.save()
+        self.assertContains(self.client.get(f'/jobs/{self.job.id}/'), 'Logo Design')
+
+    def test_concurrent_misses_run_one_load(self):
+        calls = []
+
+        def slow_loader(ident):
+            calls.append(ident)
+            time.sleep(0.1)
+            return {'id': ident}
+
+        records = object_cache.ReadThroughCache('slow', slow_loader, dict(object_cache.DEFAULTS, LOCK_WAIT=2))
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(records.get(7))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(calls, [7])
+        self.assertEqual(results, [{'id': 7}] * 8)
+        self.assertEqual(records.snapshot()['coalesced'], 7)
+
+    def test_near_expiry_one_request_refreshes_while_others_get_the_cached_value(self):
+        version = iter(range(1, 100))
+        records = object_cache.ReadThroughCache('versions', lambda ident: next(version), dict(object_cache.DEFAULTS))
+        self.assertEqual(records.get(1), 1)
+        entry = cache.get('objcache:versions:1')
+        cache.set('objcache:versions:1', dict(entry, expires=time.time() - 1))
+
+        cache.add('objcache:versions:1:lock', 1)
+        self.assertEqual(records.get(1), 1)  # Someone else is refreshing
+        cache.delete('objcache:versions:1:lock')
+        self.assertEqual(records.get(1), 2)
+        self.assertEqual(records.get(1), 2)
+        stats = records.snapshot()
+        self.assertEqual((stats['stale_hits'], stats['early_refreshes'], stats['hits']), (1, 1, 1))
+
+    def test_load_racing_an_invalidation_is_not_stored(self):
+        records = object_cache.ReadThroughCache('racy', lambda ident: records.invalidate(ident) or 'old', None)
+        self.assertEqual(records.get(1), 'old')
+        self.assertIsNone(cache.get('objcache:racy:1'))
+
+    def test_metrics_report_hit_rates(self):
+        object_cache.job_details.stats.update(dict.fromkeys(object_cache.job_details.stats, 0))
+        for _ in range(4):
+            self.client.get(f'/jobs/{self.job.id}/')
+        User.objects.filter(id=self.client_user.id).update(is_staff=True)
+        totals = self.client.get('/metrics/object-cache/').json()['caches']['job_detail']
+        self.assertEqual((totals['hits'], totals['misses'], totals['loads']), (3, 1, 1))
+        self.assertEqual(totals['hit_rate'], 0.75)
@@ -0,0 +1,15 @@
+from datetime import timezone
+
+# --- Datetimes from raw cursors ---
+# Raw cursors hand back naive UTC datetimes on MySQL (USE_TZ, but no
+# field conversion) and aware ones on other backends.
+
+
+def as_utc(value):
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def to_timestamp(value):
+    return as_utc(value).timestamp()
@@ -0,0 +1,116 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+
+from .models import TrendingState
+
+# --- Trending jobs ---
+# score(job) = sum over its applications of 2 ** ((t_apply - now) / HALF_LIFE)
+#
+# Instead of decaying every row as time passes, each application adds
+# 2 ** ((t_apply - epoch) / HALF_LIFE). All rows share the same epoch, so
+# ordering by the stored column is ordering by the decayed score, and
+# the board's top-N is an index range scan on (is_active, trending_score).
+#
+# The stored weights grow by 2x per half-life, so rescale() periodically
+# moves the epoch forward and multiplies every score down to match.
+
+DEFAULTS = {
+    'HALF_LIFE_HOURS': 24,
+}
+
+EPOCH_CACHE_KEY = 'trending:epoch'
+
+
+def get_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, 'TRENDING', {}))
+    return config
+
+
+def _half_life():
+    return get_config()['HALF_LIFE_HOURS'] * 3600
+
+
+def read_epoch(for_update=False):
+    """for_update (inside a transaction) locks the state row until commit"""
+    lock = ' FOR UPDATE' if for_update and connection.features.has_select_for_update else ''
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT epoch FROM core_trendingstate WHERE id = 1{lock}")
+        row = cursor.fetchone()
+    if row:
+        return row[0]
+    # The migration creates the row; this covers a freshly flushed database
+    state, _ = TrendingState.objects.get_or_create(id=1, defaults={'epoch': int(time.time())})
+    return state.epoch
+
+
+def get_epoch():
+    epoch = cache.get(EPOCH_CACHE_KEY)
+    if epoch is None:
+        epoch = read_epoch()
+        cache.set(EPOCH_CACHE_KEY, epoch, 60 * 60)
+    return epoch
+
+
+def weight(at, epoch):
+    return 2 ** ((at - epoch) / _half_life())
+
+
+def record_application(job_id, at=None):
+    """
+    O(1) bump when an application is inserted. The EXISTS guard makes the
+    increment a no-op if rescale() moved the epoch under us; we then
+    re-read the epoch and retry.
+    """
+    at = time.time() if at is None else at
+    epoch = get_epoch()
+    for _ in range(2):
+        with connection.cursor() as cursor:
+            cursor.execute("""
+                UPDATE core_joblisting
+                SET trending_score = trending_score + %s
+                WHERE id = %s
+                  AND EXISTS (SELECT 1 FROM core_trendingstate WHERE id = 1 AND epoch = %s)
+            """, [weight(at, epoch), job_id, epoch])
+            if cursor.rowcount:
+                return True
+        epoch = read_epoch()
+        cache.set(EPOCH_CACHE_KEY, epoch, 60 * 60)
+    return False
+
+
+def rescale(at=None, min_score=1e-6):
+    """
+    Move the epoch to `at` and scale every score by the matching factor.
+    Scores that have decayed below `min_score` are zeroed so they drop
+    out of the index range. Run periodically (manage.py rescale_trending).
+    """
+    new_epoch = int(time.time() if at is None else at)
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            # Taking the state row first makes concurrent bumps and rescales
+            # wait, and the factor comes from the epoch as of the lock
+            old_epoch = read_epoch(for_update=True)
+            cursor.execute("UPDATE core_trendingstate SET epoch = %s WHERE id = 1", [new_epoch])
+            factor = 2 ** ((old_epoch - new_epoch) / _half_life())
+            cursor.execute("""
+                UPDATE core_joblisting
+                SET trending_score = CASE
+                    WHEN trending_score * %s < %s THEN 0
+                    ELSE trending_score * %s
+                END
+                WHERE trending_score > 0
+            """, [factor, min_score, factor])
+            rescaled = cursor.rowcount
+        transaction.on_commit(lambda: cache.set(EPOCH_CACHE_KEY, new_epoch, 60 * 60))
+    return rescaled, factor
+
+
+def decayed_score(stored_score, at=None):
+    """Stored score -> decayed application count as of `at`"""
+    at = time.time() if at is None else at
+    return stored_score / weight(at, get_epoch())
@@ -21,6 +21,7 @@ urlpatterns = [
     path('post-job/', views.post_job, name='post_job'),
     path('jobs/', views.job_list, name='job_list'),
     path('jobs/<int:job_id>/', views.job_detail, name='job_detail'),
+    path('autocomplete/', views.autocomplete_terms, name='autocomplete'),
 
     # Application Management
     path('job/<int:job_id>/applications/', views.view_applications, name='view_applications'),
@@ -32,4 +33,14 @@ urlpatterns = [
     # Interviews
     path('application/<int:application_id>/schedule/', views.schedule_interview, name='schedule_interview'),
     path('interview/<int:interview_id>/reschedule/', views.reschedule_interview, name='reschedule_interview'),
+    path('calendar/<str:token>/interviews.ics', views.interview_calendar, name='interview_calendar'),
+
+    # Live dashboard updates (served by the ASGI app)
+    path('events/', views.event_stream, name='event_stream'),
+
+    # Monitoring
+    path('metrics/admission/', views.admission_metrics, name='admission_metrics'),
+    path('metrics/queries/', views.query_stats, name='query_stats'),
+    path('metrics/db-pool/', views.db_pool_metrics, name='db_pool_metrics'),
+    path('metrics/object-cache/', views.object_cache_metrics, name='object_cache_metrics'),
 ]
\ No newline at end of file
@@ -0,0 +1,118 @@
+import atexit
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection, connections
+
+logger = logging.getLogger(__name__)
+
+# --- Write-behind job view counters ---
+# job_detail only bumps an in-process dict. Every FLUSH_INTERVAL seconds
+# a background thread writes everything the worker has collected with ONE
+# batched UPDATE, instead of an UPDATE (and a row lock) per page view.
+# The request path never touches the database, so a slow or failing flush
+# can't turn a page view into an error; failed counts are kept for the
+# next flush.
+#
+# Loss is bounded: a graceful exit (gunicorn worker_exit hook, atexit)
+# flushes; a hard crash loses at most one interval of this worker's views.
+# With FLUSH_INTERVAL None (the test runner) no thread is started and
+# counts wait for flush_views().
+
+DEFAULTS = {
+    'FLUSH_INTERVAL': 10,
+    # Ids per UPDATE statement
+    'BATCH_SIZE': 500,
+}
+
+
+def get_config():
+    config = dict(DEFAULTS)
+    config.update(getattr(settings, 'JOB_VIEW_COUNTER', {}))
+    return config
+
+
+class ViewCounter:
+    def __init__(self):
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.last_flush = time.monotonic()
+        self.thread = None
+
+    def record(self, job_id):
+        with self.lock:
+            self.pending[job_id] = self.pending.get(job_id, 0) + 1
+        self.start()
+
+    def start(self):
+        if get_config()['FLUSH_INTERVAL'] is None:
+            return
+        # Started lazily so each forked worker gets its own thread
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self.run, name='job-view-flush', daemon=True)
+                self.thread.start()
+
+    def run(self):
+        while True:
+            time.sleep(max(0, self.last_flush + get_config()['FLUSH_INTERVAL'] - time.monotonic()))
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("Flushing job view counts failed; retrying next interval")
+            finally:
+                connections.close_all()
+
+    def flush(self):
+        with self.lock:
+            pending, self.pending = self.pending, {}
+            self.last_flush = time.monotonic()
+        if not pending:
+            return 0
+
+        try:
+            flush_counts(pending, get_config()['BATCH_SIZE'])
+        except Exception:
+            # Put the counts back so the next flush retries them
+            with self.lock:
+                for job_id, n in pending.items():
+                    self.pending[job_id] = self.pending.get(job_id, 0) + n
+            raise
+        return len(pending)
+
+
+def flush_counts(counts, batch_size=500):
+    """UPDATE core_joblisting SET views = views + CASE id WHEN .. END WHERE id IN (..)"""
+    items = sorted(counts.items())  # Fixed order: concurrent flushes lock rows in the same order
+    with connection.cursor() as cursor:
+        for i in range(0, len(items), batch_size):
+            batch = items[i:i + batch_size]
+            cases = ' '.join(['WHEN %s THEN %s'] * len(batch))
+            placeholders = ', '.join(['%s'] * len(batch))
+            params = [v for item in batch for v in item] + [job_id for job_id, _ in batch]
+            cursor.execute(f"""
+                UPDATE core_joblisting
+                SET views = views + CASE id {cases} ELSE 0 END
+                WHERE id IN ({placeholders})
+            """, params)
+
+
+counter = ViewCounter()
+
+
+def record_view(job_id):
+    counter.record(job_id)
+
+
+def flush_views():
+    return counter.flush()
+
+
+@atexit.register
+def _flush_on_exit():
+    try:
+        counter.flush()
+    except Exception:
+        pass
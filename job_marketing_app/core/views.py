@@ -1,10 +1,32 @@
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth import login
 from django.contrib.auth.decorators import login_required
-from django.db import connection
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connection, transaction
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, HttpResponse, HttpResponseNotModified, JsonResponse, StreamingHttpResponse
+from django.urls import reverse
 from django.utils import timezone
 
+from . import applicant_ranking, autocomplete, events
+from .applied_jobs import get_applied_jobs, invalidate_applied_jobs
+from .calendar_feed import (
+    bump_application_participants, bump_interview_version, etag_for, feed_token, render_ics, user_id_from_token
+)
+from .locations import adjust_job_count, get_locations, move_client_jobs, resolve_location
+from .middleware import rejection_metrics
 from .models import Client, Freelancer, JobListing, Application, Interview
+from .object_cache import cache_metrics, invalidate_client_jobs, job_details
+from .pagination import decode_cursor, keyset_condition, split_page
+from .pool import pool_metrics
+from .querylog import HISTOGRAM_BOUNDS, top_fingerprints
+from .reminders import notify_interview
+from .similarity import duplicate_postings, index_job, similar_jobs
+from .timeutils import to_timestamp
+from .trending import record_application
+from .view_counter import record_view
 from .forms import (
     CustomUserCreationForm, 
     JobListingForm, 
@@ -14,6 +36,10 @@ from .forms import (
     InterviewForm 
 )
 
+APPLICATION_STATUSES = ('Pending', 'Approved', 'Rejected')
+DASHBOARD_PAGE_SIZE = 20
+JOB_LIST_PAGE_SIZE = 20
+
 # --- Helper Function for Raw SQL ---
 def dictfetchall(cursor):
     """Return all rows from a cursor as a dict"""
@@ -23,6 +49,77 @@ def dictfetchall(cursor):
         for row in cursor.fetchall()
     ]
 
+def submit_application(job_id, freelancer_id, proposal_text, expected_payment):
+    """
+    Insert an application in one statement, relying on the unique
+    (job_id, freelancer_id) constraint to drop duplicates.
+    Returns True if a row was inserted, False if they had already applied.
+    """
+    if connection.vendor == 'mysql':
+        sql = """
+            INSERT IGNORE INTO core_application
+            (proposal_text, expected_payment, job_id, freelancer_id, status, created_at)
+            VALUES (%s, %s, %s, %s, 'Pending', %s)
+        """
+    else:
+        sql = """
+            INSERT INTO core_application
+            (proposal_text, expected_payment, job_id, freelancer_id, status, created_at)
+            VALUES (%s, %s, %s, %s, 'Pending', %s)
+            ON CONFLICT (job_id, freelancer_id) DO NOTHING
+        """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [proposal_text, expected_payment, job_id, freelancer_id, timezone.now()])
+        return cursor.rowcount == 1
+
+def get_categories():
+    """Category list for the job board, shared through the cache"""
+    categories = cache.get('categories')
+    if categories is None:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT * FROM core_category")
+            categories = dictfetchall(cursor)
+        cache.set('categories', categories, 60 * 10)
+    return categories
+
+def get_client_interviews(client_id):
+    """Interviews on a client's jobs (client dashboard + calendar feed)"""
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT 
+                i.id, i.date_time, i.link_or_location,
+                u.username AS freelancer_name,
+                u.email AS freelancer_email,
+                j.title AS job_title
+            FROM core_interview i
+            JOIN core_application a ON i.application_id = a.id
+            JOIN core_freelancer f ON a.freelancer_id = f.id
+            JOIN core_user u ON f.user_id = u.id
+            JOIN core_joblisting j ON a.job_id = j.id
+            WHERE j.client_id = %s
+            ORDER BY i.date_time ASC
+        """, [client_id])
+        return dictfetchall(cursor)
+
+def get_freelancer_interviews(freelancer_id):
+    """Interviews for a freelancer's applications (freelancer dashboard + calendar feed)"""
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT 
+                i.id, i.date_time, i.link_or_location,
+                j.title AS job_title,
+                c.company_name,
+                u.username AS client_username
+            FROM core_interview i
+            JOIN core_application a ON i.application_id = a.id
+            JOIN core_joblisting j ON a.job_id = j.id
+            JOIN core_client c ON j.client_id = c.id
+            JOIN core_user u ON c.user_id = u.id
+            WHERE a.freelancer_id = %s
+            ORDER BY i.date_time ASC
+        """, [freelancer_id])
+        return dictfetchall(cursor)
+
 # --- Views ---
 
 def home(request):
@@ -69,22 +166,7 @@ def client_dashboard(request):
         profile_data = rows[0] if rows else {}
 
     # 2. RAW SQL: Get Interviews
-    with connection.cursor() as cursor:
-        cursor.execute("""
-            SELECT 
-                i.id, i.date_time, i.link_or_location,
-                u.username AS freelancer_name,
-                u.email AS freelancer_email,
-                j.title AS job_title
-            FROM core_interview i
-            JOIN core_application a ON i.application_id = a.id
-            JOIN core_freelancer f ON a.freelancer_id = f.id
-            JOIN core_user u ON f.user_id = u.id
-            JOIN core_joblisting j ON a.job_id = j.id
-            WHERE j.client_id = %s
-            ORDER BY i.date_time ASC
-        """, [client_id])
-        interviews = dictfetchall(cursor)
+    interviews = get_client_interviews(client_id)
 
     # 3. RAW SQL: Get Jobs WITH Pending Count
     with connection.cursor() as cursor:
@@ -102,7 +184,8 @@ def client_dashboard(request):
     return render(request, 'dashboard/client_dashboard.html', {
         'jobs': jobs, 
         'interviews': interviews,
-        'profile': profile_data
+        'profile': profile_data,
+        'calendar_url': calendar_url(request),
     })
 
 @login_required
@@ -119,45 +202,66 @@ def freelancer_dashboard(request):
         profile_data = rows[0] if rows else {}
 
     # 2. RAW SQL: Get Interviews
+    interviews = get_freelancer_interviews(freelancer_id)
+
+    # 3. RAW SQL: Per-status counts (one grouped aggregate on the freelancer's index)
     with connection.cursor() as cursor:
         cursor.execute("""
-            SELECT 
-                i.id, i.date_time, i.link_or_location,
-                j.title AS job_title,
-                c.company_name,
-                u.username AS client_username
-            FROM core_interview i
-            JOIN core_application a ON i.application_id = a.id
-            JOIN core_joblisting j ON a.job_id = j.id
-            JOIN core_client c ON j.client_id = c.id
-            JOIN core_user u ON c.user_id = u.id
-            WHERE a.freelancer_id = %s
-            ORDER BY i.date_time ASC
+            SELECT status, COUNT(*) FROM core_application
+            WHERE freelancer_id = %s
+            GROUP BY status
         """, [freelancer_id])
-        interviews = dictfetchall(cursor)
+        counts = dict(cursor.fetchall())
+    status_counts = [(status, counts.get(status, 0)) for status in APPLICATION_STATUSES]
+    total_applications = sum(counts.values())
+
+    # 4. RAW SQL: One page of applications, only the displayed columns
+    status = request.GET.get('status')
+    if status not in APPLICATION_STATUSES:
+        status = None
+    page_cursor = decode_cursor(request.GET.get('after'))
+
+    sql_query = """
+        SELECT
+            a.id,
+            a.status,
+            a.expected_payment,
+            a.created_at,
+            j.id AS job_id,
+            j.title AS job_title,
+            c.company_name,
+            u.username AS client_username
+        FROM core_application a
+        JOIN core_joblisting j ON a.job_id = j.id
+        JOIN core_client c ON j.client_id = c.id
+        JOIN core_user u ON c.user_id = u.id
+        WHERE a.freelancer_id = %s
+    """
+    params = [freelancer_id]
+    if status:
+        sql_query += " AND a.status = %s"
+        params.append(status)
+    if page_cursor:
+        condition, condition_params = keyset_condition('a', page_cursor)
+        sql_query += condition
+        params += condition_params
+    sql_query += " ORDER BY a.created_at DESC, a.id DESC LIMIT %s"
+    params.append(DASHBOARD_PAGE_SIZE + 1)
 
-    # 3. RAW SQL: Get Applications
     with connection.cursor() as cursor:
-        cursor.execute("""
-            SELECT 
-                a.*, 
-                j.title AS job_title,
-                j.id AS job_id,
-                c.company_name,
-                u.username AS client_username
-            FROM core_application a
-            JOIN core_joblisting j ON a.job_id = j.id
-            JOIN core_client c ON j.client_id = c.id
-            JOIN core_user u ON c.user_id = u.id
-            WHERE a.freelancer_id = %s
-            ORDER BY a.created_at DESC
-        """, [freelancer_id])
-        applications = dictfetchall(cursor)
+        cursor.execute(sql_query, params)
+        applications, next_cursor = split_page(dictfetchall(cursor), DASHBOARD_PAGE_SIZE)
 
     return render(request, 'dashboard/freelancer_dashboard.html', {
         'applications': applications,
+        'status_counts': status_counts,
+        'total_applications': total_applications,
+        'status_filter': status,
+        'next_cursor': next_cursor,
+        'is_first_page': page_cursor is None,
         'interviews': interviews,
-        'profile': profile_data
+        'profile': profile_data,
+        'calendar_url': calendar_url(request),
     })
 
 @login_required
@@ -170,16 +274,25 @@ def post_job(request):
         if form.is_valid():
             d = form.cleaned_data
             client_id = request.user.client_profile.id
+
+            # Warn once about near-duplicates of this client's open jobs
+            if not request.POST.get('confirm_duplicate'):
+                duplicates = duplicate_postings(client_id, d['title'], d['description'])
+                if duplicates:
+                    return render(request, 'jobs/post_job.html', {'form': form, 'duplicates': duplicates})
             
             with connection.cursor() as cursor:
                 cursor.execute("""
                     INSERT INTO core_joblisting 
-                    (title, description, budget, category_id, client_id, is_active, created_at)
-                    VALUES (%s, %s, %s, %s, %s, 1, %s)
+                    (title, description, budget, category_id, client_id, is_active, created_at, views, trending_score)
+                    VALUES (%s, %s, %s, %s, %s, 1, %s, 0, 0)
                 """, [
                     d['title'], d['description'], d['budget'], 
                     d['category'].id, client_id, timezone.now()
                 ])
+                index_job(cursor.lastrowid, d['title'], d['description'], cursor=cursor)
+            adjust_job_count(request.user.client_profile.resolved_location_id, 1)
+            autocomplete.add_title(d['title'])
             return redirect('client_dashboard')
     else:
         form = JobListingForm()
@@ -187,10 +300,10 @@ def post_job(request):
 
 def job_list(request):
     category_id = request.GET.get('category')
+    location_id = request.GET.get('location')
+    q = request.GET.get('q', '').strip()
 
-    with connection.cursor() as cursor:
-        cursor.execute("SELECT * FROM core_category")
-        categories = dictfetchall(cursor)
+    categories = get_categories()
 
     sql_query = """
         SELECT 
@@ -208,71 +321,99 @@ def job_list(request):
         sql_query += " AND j.category_id = %s"
         params.append(category_id)
 
-    sql_query += " ORDER BY j.created_at DESC"
+    if location_id:
+        sql_query += " AND c.resolved_location_id = %s"
+        params.append(location_id)
+
+    if q:
+        # Titles starting with q: a range scan on joblisting_title_idx, where
+        # '%q%' would read every active job. Wildcards in q are escaped.
+        sql_query += f" AND j.title {connection.operators['istartswith']}"
+        params.append(f"{connection.ops.prep_for_like_query(q)}%")
+
+    sort = request.GET.get('sort')
+    if sort == 'popular':
+        sql_query += " ORDER BY j.views DESC, j.created_at DESC"
+    elif sort == 'trending':
+        # Matches joblisting_trending_idx (is_active, -trending_score, -id)
+        sql_query += " ORDER BY j.trending_score DESC, j.id DESC"
+    else:
+        sql_query += " ORDER BY j.created_at DESC"
+
+    # One page at a time; the extra row tells us whether there is a next page
+    try:
+        page = max(1, int(request.GET.get('page', 1)))
+    except ValueError:
+        page = 1
+    sql_query += " LIMIT %s OFFSET %s"
+    params += [JOB_LIST_PAGE_SIZE + 1, (page - 1) * JOB_LIST_PAGE_SIZE]
 
     with connection.cursor() as cursor:
         cursor.execute(sql_query, params)
         jobs = dictfetchall(cursor)
+    has_next = len(jobs) > JOB_LIST_PAGE_SIZE
+    jobs = jobs[:JOB_LIST_PAGE_SIZE]
+
+    filters = request.GET.copy()
+    filters.pop('page', None)
+
+    applied_jobs = ()
+    if request.user.is_authenticated and request.user.is_freelancer:
+        applied_jobs = get_applied_jobs(request.user.freelancer_profile.id, [job['id'] for job in jobs])
 
     context = {
         'jobs': jobs,
         'categories': categories,
+        'locations': get_locations(),
+        'applied_jobs': applied_jobs,
+        'page': page,
+        'has_next': has_next,
+        'filters': filters.urlencode(),
     }
     return render(request, 'core/job_list.html', context)
 
 @login_required
 def job_detail(request, job_id):
-    with connection.cursor() as cursor:
-        cursor.execute("""
-            SELECT 
-                j.*, 
-                c.company_name, 
-                c.location,
-                u.username AS client_username
-            FROM core_joblisting j
-            LEFT JOIN core_client c ON j.client_id = c.id
-            LEFT JOIN core_user u ON c.user_id = u.id
-            WHERE j.id = %s
-        """, [job_id])
-        rows = dictfetchall(cursor)
-        
-    if not rows:
+    # Job + client + owner, read through the object cache (core/object_cache.py)
+    job = job_details.get(job_id)
+    if job is None:
         return redirect('job_list')
-    
-    job = rows[0]
 
-    has_applied = False
-    if request.user.is_freelancer:
-        fid = request.user.freelancer_profile.id
-        with connection.cursor() as cursor:
-            cursor.execute("""
-                SELECT 1 FROM core_application 
-                WHERE job_id = %s AND freelancer_id = %s
-            """, [job_id, fid])
-            has_applied = cursor.fetchone() is not None
-    
+    if request.method == 'GET':
+        record_view(job['id'])
+
     if request.method == 'POST' and request.user.is_freelancer:
-        if has_applied:
-            return redirect('job_detail', job_id=job['id'])
-            
         form = ApplicationForm(request.POST)
         if form.is_valid():
             d = form.cleaned_data
-            
-            with connection.cursor() as cursor:
-                cursor.execute("""
-                    INSERT INTO core_application 
-                    (proposal_text, expected_payment, job_id, freelancer_id, status, created_at)
-                    VALUES (%s, %s, %s, %s, 'Pending', %s)
-                """, [
-                    d['proposal_text'], d['expected_payment'], 
-                    job_id, request.user.freelancer_profile.id, timezone.now()
-                ])
+            created = submit_application(
+                job_id, request.user.freelancer_profile.id,
+                d['proposal_text'], d['expected_payment']
+            )
+            if not created:
+                # Already applied: the detail page shows the notice
+                return redirect('job_detail', job_id=job['id'])
+            invalidate_applied_jobs(request.user.freelancer_profile.id)
+            applicant_ranking.invalidate_rankings(job_id)
+            record_application(job_id)
+            events.publish(
+                [job['client_user_id']] if job['client_user_id'] else [], 'application.new',
+                job_id=job['id'], job_title=job['title'], freelancer=request.user.username,
+            )
             return redirect('freelancer_dashboard')
     else:
         form = ApplicationForm()
 
-    return render(request, 'jobs/job_detail.html', {'job': job, 'form': form, 'has_applied': has_applied})
+    has_applied = False
+    if request.user.is_freelancer:
+        has_applied = job_id in get_applied_jobs(request.user.freelancer_profile.id, [job_id])
+
+    return render(request, 'jobs/job_detail.html', {
+        'job': job,
+        'form': form,
+        'has_applied': has_applied,
+        'similar_jobs': similar_jobs(job_id),
+    })
 
 @login_required
 def view_applications(request, job_id):
@@ -280,31 +421,65 @@ def view_applications(request, job_id):
     
     if request.user.client_profile != job.client:
         return redirect('home')
-        
-    with connection.cursor() as cursor:
-        cursor.execute("""
-            SELECT 
-                a.*, 
-                u.username AS freelancer_name 
-            FROM core_application a
-            JOIN core_freelancer f ON a.freelancer_id = f.id
-            JOIN core_user u ON f.user_id = u.id
-            WHERE a.job_id = %s
-        """, [job_id])
-        applications = dictfetchall(cursor)
+
+    sort = request.GET.get('sort')
+    if sort not in applicant_ranking.SORTS:
+        sort = 'score'
+
+    # Cached orders over every applicant; only the page's rows are fetched
+    ranking = applicant_ranking.get_ranking(job_id)
+    paginator = Paginator(applicant_ranking.ranked_ids(ranking, sort), applicant_ranking.get_config()['PAGE_SIZE'])
+    page = paginator.get_page(request.GET.get('page'))
+    page_ids = list(page.object_list)
+
+    applications = []
+    if page_ids:
+        placeholders = ', '.join(['%s'] * len(page_ids))
+        with connection.cursor() as cursor:
+            cursor.execute(f"""
+                SELECT 
+                    a.id,
+                    a.freelancer_id,
+                    a.proposal_text,
+                    a.expected_payment,
+                    a.status,
+                    a.created_at,
+                    f.skills,
+                    u.username AS freelancer_name 
+                FROM core_application a
+                JOIN core_freelancer f ON a.freelancer_id = f.id
+                JOIN core_user u ON f.user_id = u.id
+                WHERE a.id IN ({placeholders})
+            """, page_ids)
+            by_id = {row['id']: row for row in dictfetchall(cursor)}
+
+        context = applicant_ranking.JobContext(job.title, job.description, job.budget, ranking['newest'])
+        for application_id in page_ids:
+            app = by_id.get(application_id)
+            if app is None:
+                continue  # Deleted since the ranking was built
+            app['match'] = context.components(
+                app['expected_payment'], to_timestamp(app['created_at']), app['skills']
+            )
+            app['score'] = context.score(app['match'])
+            applications.append(app)
 
     return render(request, 'dashboard/job_applications.html', {
         'job': job, 
-        'applications': applications
+        'applications': applications,
+        'page_obj': page,
+        'sort': sort,
+        'total_applications': paginator.count,
     })
 
 @login_required
 def update_application_status(request, application_id, new_status):
     with connection.cursor() as cursor:
         cursor.execute("""
-            SELECT a.job_id, j.client_id 
+            SELECT a.job_id, j.client_id, j.title, f.user_id
             FROM core_application a
             JOIN core_joblisting j ON a.job_id = j.id
+            JOIN core_freelancer f ON a.freelancer_id = f.id
             WHERE a.id = %s
         """, [application_id])
         result = cursor.fetchone()
@@ -312,7 +487,7 @@ def update_application_status(request, application_id, new_status):
     if not result:
         return redirect('home')
         
-    job_id, job_client_id = result
+    job_id, job_client_id, job_title, freelancer_user_id = result
     
     if request.user.client_profile.id != job_client_id:
         return redirect('home')
@@ -324,6 +499,10 @@ def update_application_status(request, application_id, new_status):
                 SET status = %s 
                 WHERE id = %s
             """, [new_status, application_id])
+        events.publish(
+            [freelancer_user_id], 'application.status',
+            application_id=int(application_id), job_id=job_id, job_title=job_title, status=new_status,
+        )
 
         if new_status == 'Approved':
             return redirect('schedule_interview', application_id=application_id)
@@ -342,11 +521,21 @@ def schedule_interview(request, application_id):
         if form.is_valid():
             d = form.cleaned_data
             
-            with connection.cursor() as cursor:
+            participants = (application.job.client.user_id, application.freelancer.user_id)
+            # The feed version moves with the interview or not at all
+            with transaction.atomic(), connection.cursor() as cursor:
                 cursor.execute("""
                     INSERT INTO core_interview (date_time, link_or_location, application_id)
                     VALUES (%s, %s, %s)
                 """, [d['date_time'], d['meeting_link'], application_id])
+                interview_id = cursor.lastrowid
+                bump_interview_version(*participants)
+                notify_interview(interview_id, d['date_time'])
+            events.publish(
+                participants, 'interview.scheduled',
+                application_id=application.id, job_title=application.job.title,
+                date_time=d['date_time'].isoformat(), link_or_location=d['meeting_link'],
+            )
                 
             return redirect('view_applications', job_id=application.job.id)
     else:
@@ -369,12 +558,19 @@ def reschedule_interview(request, interview_id):
         if form.is_valid():
             d = form.cleaned_data
             
-            with connection.cursor() as cursor:
+            with transaction.atomic(), connection.cursor() as cursor:
                 cursor.execute("""
                     UPDATE core_interview 
                     SET date_time = %s, link_or_location = %s
                     WHERE id = %s
                 """, [d['date_time'], d['meeting_link'], interview_id])
+                participants = bump_application_participants(interview.application_id)
+                notify_interview(interview_id, d['date_time'])
+            events.publish(
+                participants, 'interview.rescheduled',
+                application_id=interview.application_id, job_title=interview.application.job.title,
+                date_time=d['date_time'].isoformat(), link_or_location=d['meeting_link'],
+            )
                 
             return redirect('client_dashboard')
     else:
@@ -400,23 +596,39 @@ def update_profile(request):
         return redirect('home')
 
     if request.method == 'POST':
+        # Read before is_valid(), which copies the submitted values onto the instance
+        old_skills = None if user.is_client else {
+            autocomplete.normalize(s) for s in autocomplete.split_skills(profile.skills)
+        }
+        old_client_fields = (profile.company_name, profile.location) if user.is_client else None
         form = FormClass(request.POST, instance=profile)
         if form.is_valid():
             d = form.cleaned_data
             
             with connection.cursor() as cursor:
                 if user.is_client:
+                    old_location_id = profile.resolved_location_id
+                    location_id = resolve_location(d.get('location'))
                     cursor.execute("""
                         UPDATE core_client 
-                        SET company_name = %s, location = %s 
+                        SET company_name = %s, location = %s, resolved_location_id = %s
                         WHERE id = %s
-                    """, [d.get('company_name'), d.get('location'), profile.id])
+                    """, [d.get('company_name'), d.get('location'), location_id, profile.id])
+                    move_client_jobs(profile.id, old_location_id, location_id)
+                    # Both are shown on the cached job detail records
+                    if (d.get('company_name'), d.get('location')) != old_client_fields:
+                        invalidate_client_jobs(profile.id)
                 else:
                     cursor.execute("""
                         UPDATE core_freelancer 
                         SET skills = %s, portfolio_link = %s 
                         WHERE id = %s
                     """, [d.get('skills'), d.get('portfolio_link'), profile.id])
+                    # Only skills this profile didn't list before add to the popularity weight
+                    autocomplete.add_skills(', '.join(
+                        s for s in autocomplete.split_skills(d.get('skills'))
+                        if autocomplete.normalize(s) not in old_skills
+                    ))
             
             if user.is_client:
                 return redirect('client_dashboard')
@@ -427,6 +639,19 @@ def update_profile(request):
 
     return render(request, 'update_profile.html', {'form': form})
 
+def autocomplete_terms(request):
+    kind = request.GET.get('kind') or None
+    if kind is not None and kind not in autocomplete.KINDS:
+        return JsonResponse({'error': 'unknown kind'}, status=400)
+    try:
+        k = int(request.GET.get('k', 0)) or None
+    except ValueError:
+        k = None
+    results = autocomplete.complete(request.GET.get('q', ''), kind=kind, k=k)
+    response = JsonResponse({'results': results})
+    response['Cache-Control'] = 'public, max-age=60'
+    return response
+
 # --- NEW VIEW FOR FREELANCER PUBLIC PROFILE ---
 @login_required
 def freelancer_public_profile(request, freelancer_id):
@@ -452,4 +677,92 @@ def freelancer_public_profile(request, freelancer_id):
         return redirect('dashboard')
     
     profile = rows[0]
-    return render(request, 'dashboard/freelancer_public_profile.html', {'profile': profile})
\ No newline at end of file
+    return render(request, 'dashboard/freelancer_public_profile.html', {'profile': profile})
+
+# --- Calendar Feeds ---
+def calendar_url(request):
+    return request.build_absolute_uri(reverse('interview_calendar', args=[feed_token(request.user.id)]))
+
+def interview_calendar(request, token):
+    user_id = user_id_from_token(token)
+    if user_id is None:
+        raise Http404
+
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            SELECT u.username, u.interview_version, c.id, f.id
+            FROM core_user u
+            LEFT JOIN core_client c ON c.user_id = u.id
+            LEFT JOIN core_freelancer f ON f.user_id = u.id
+            WHERE u.id = %s
+        """, [user_id])
+        row = cursor.fetchone()
+    if not row:
+        raise Http404
+    username, version, client_id, freelancer_id = row
+
+    # Unchanged polls stop here, before the interview queries
+    etag = etag_for(user_id, version)
+    if etag in [t.strip() for t in request.headers.get('If-None-Match', '').split(',')]:
+        response = HttpResponseNotModified()
+        response['ETag'] = etag
+        return response
+
+    events = []
+    if client_id:
+        for i in get_client_interviews(client_id):
+            events.append(dict(i, summary=f"Interview: {i['job_title']} with {i['freelancer_name']}"))
+    if freelancer_id:
+        for i in get_freelancer_interviews(freelancer_id):
+            company = i['company_name'] or i['client_username']
+            events.append(dict(i, summary=f"Interview: {i['job_title']} at {company}"))
+
+    response = HttpResponse(render_ics(events, f"{username} - Interviews"), content_type='text/calendar; charset=utf-8')
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    return response
+
+# --- Live dashboard events ---
+async def event_stream(request):
+    user = await request.auser()
+    if not user.is_authenticated:
+        return HttpResponse(status=403)
+    if not isinstance(request, ASGIRequest):
+        # A WSGI worker would be tied up for the life of the stream.
+        # 204 tells EventSource to stop reconnecting.
+        return HttpResponse(status=204)
+
+    try:
+        last_event_id = int(request.headers.get('Last-Event-ID', ''))
+    except ValueError:
+        last_event_id = None
+    subscription = await events.hub.subscribe(events.user_channel(user.id), last_event_id)
+
+    response = StreamingHttpResponse(events.stream(subscription), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # nginx: don't buffer the stream
+    return response
+
+# --- Monitoring ---
+@staff_member_required
+def admission_metrics(request):
+    return JsonResponse(rejection_metrics())
+
+
+@staff_member_required
+def query_stats(request):
+    labels = [f"<{b}ms" for b in HISTOGRAM_BOUNDS] + [f">={HISTOGRAM_BOUNDS[-1]}ms"]
+    rows = top_fingerprints(limit=50)
+    for row in rows:
+        row['buckets'] = list(zip(labels, row['histogram']))
+    return render(request, 'dashboard/query_stats.html', {'rows': rows})
+
+
+@staff_member_required
+def db_pool_metrics(request):
+    return JsonResponse(pool_metrics())
+
+
+@staff_member_required
+def object_cache_metrics(request):
+    return JsonResponse(cache_metrics())
@@ -0,0 +1,63 @@
+import os
+import threading
+import uuid
+
+from django.core.cache import cache
+
+# --- Per-worker metrics registry ---
+# The query log, connection pools and object caches keep their counters
+# per process; each worker publishes a snapshot under a numbered slot so
+# the staff views can merge all of them with one get_many.
+#
+# A worker claims a slot with cache.add(), which is atomic on Redis and
+# LocMemCache, so two workers starting together never share one. Slots
+# expire SNAPSHOT_TTL after their owner's last publish and are reused by
+# the next worker to start; the slot counter is only incremented when
+# every existing slot is taken.
+
+SNAPSHOT_TTL = 60 * 60
+
+_owners = {}  # pid -> token identifying this process across hosts
+_slots = {}  # (prefix, pid) -> claimed slot
+_lock = threading.Lock()
+
+
+def _slot_key(prefix, slot):
+    return f"{prefix}:worker:{slot}"
+
+
+def _claim(prefix, entry):
+    counter = f"{prefix}:slots"
+    for slot in range(1, (cache.get(counter) or 0) + 1):
+        if cache.add(_slot_key(prefix, slot), entry, SNAPSHOT_TTL):
+            return slot
+    while True:
+        cache.add(counter, 0, None)
+        try:
+            slot = cache.incr(counter)
+        except ValueError:
+            continue  # Evicted between add() and incr()
+        if cache.add(_slot_key(prefix, slot), entry, SNAPSHOT_TTL):
+            return slot
+
+
+def publish(prefix, snapshot):
+    """Write this worker's snapshot, claiming a slot on first use"""
+    pid = os.getpid()
+    with _lock:
+        owner = _owners.setdefault(pid, uuid.uuid4().hex)
+        entry = {'owner': owner, 'snapshot': snapshot}
+        slot = _slots.get((prefix, pid))
+        current = cache.get(_slot_key(prefix, slot)) if slot else None
+        if current is not None and current['owner'] == owner:
+            cache.set(_slot_key(prefix, slot), entry, SNAPSHOT_TTL)
+        else:
+            # First publish, or the slot expired and may have been reused
+            _slots[(prefix, pid)] = _claim(prefix, entry)
+
+
+def collect(prefix):
+    """Latest snapshot from every live worker"""
+    slots = cache.get(f"{prefix}:slots") or 0
+    entries = cache.get_many([_slot_key(prefix, slot) for slot in range(1, slots + 1)])
+    return [entry['snapshot'] for entry in entries.values()]
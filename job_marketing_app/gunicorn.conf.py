@@ -0,0 +1,27 @@
+# Gunicorn picks this file up automatically from the working directory.
+import os
+
+from job_market import warmup
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', '3'))
+# Load the app (and compile templates) once in the master, then fork
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') != '0'
+
+
+def post_fork(server, worker):
+    # Never reuse a DB socket that was opened in the master before fork
+    from django.db import connections
+    connections.close_all()
+
+
+def post_worker_init(worker):
+    # Runs in each worker after the app is loaded, before it accepts requests
+    if warmup.is_enabled():
+        warmup.warm_connections()
+
+
+def worker_exit(server, worker):
+    # Write out buffered job view counts before the worker goes away
+    from core.view_counter import flush_views
+    flush_views()
@@ -3,6 +3,11 @@ ASGI config for job_market project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+The live dashboard stream (/events/) only works under ASGI, e.g.
+``uvicorn job_market.asgi:application``. It can run next to the
+gunicorn/WSGI app with /events/ routed to it, as long as REDIS_URL is
+set so both sides share the event broker (see EVENTS in settings).
+
 For more information on this file, see
 https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
 """
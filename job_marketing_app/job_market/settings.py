@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
 import os
+import sys
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -50,6 +51,8 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'core.middleware.AdmissionControlMiddleware',
+    'core.querylog.QueryObserverMiddleware',
 ]
 
 ROOT_URLCONF = 'job_market.urls'
@@ -78,15 +81,167 @@ WSGI_APPLICATION = 'job_market.wsgi.application'
 
 DATABASES = {
     'default': {
-        'ENGINE': 'django.db.backends.mysql',
+        # The MySQL backend plus a per-worker connection pool (core/pool.py)
+        'ENGINE': 'core.backends.mysql_pool',
         'NAME': 'job_market_db',      # <--- The name you created in Step 1
         'USER': 'root',               # Your MySQL username
         'PASSWORD': '',  # Your MySQL password
         'HOST': 'localhost',
         'PORT': '3306',
+        # Connections go back to the pool after every request
+        'CONN_MAX_AGE': 0,
+        'OPTIONS': {
+            # Per worker process; a replica alias with this ENGINE gets its own pool.
+            # MAX_SIZE x workers must stay under MySQL's max_connections.
+            'POOL': {
+                'MAX_SIZE': 10,
+                # Opened by the worker warm-up (job_market/warmup.py)
+                'MIN_SIZE': 2,
+                'TIMEOUT': 10,
+                'MAX_LIFETIME': 30 * 60,
+                'HEALTH_CHECK_AFTER': 30,
+            },
+        },
+    }
+}
+
+
+# Cache
+# Shared between gunicorn workers when REDIS_URL is set, in-memory otherwise
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
     }
 }
 
+if os.environ.get('REDIS_URL'):
+    CACHES['default'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ['REDIS_URL'],
+    }
+
+
+# Admission control (core/middleware.py)
+# Keys are URL names from core/urls.py
+
+ADMISSION_CONTROL = {
+    'CACHE_ALIAS': 'default',
+    'LIMITS': {
+        'view_applications': {'concurrency': 4, 'queue': 8, 'timeout': 2.0},
+        'client_dashboard': {'concurrency': 6, 'queue': 12, 'timeout': 2.0},
+        'freelancer_dashboard': {'concurrency': 6, 'queue': 12, 'timeout': 2.0},
+    },
+    'RATE_LIMITS': {
+        'job_detail': {'rate': 0.1, 'burst': 5},   # applications
+        'post_job': {'rate': 0.05, 'burst': 3},
+    },
+}
+
+
+# Per-freelancer applied job ids (core/applied_jobs.py)
+
+APPLIED_JOBS_CACHE = {
+    'MAX_IDS': 20000,     # ~80KB per cached freelancer
+    'TIMEOUT': 60 * 60,
+}
+
+
+# Slow query fingerprint log (core/querylog.py)
+
+QUERY_LOG = {
+    'ENABLED': True,
+    'SLOW_MS': 100,               # statements slower than this may get an EXPLAIN
+    'EXPLAIN_SAMPLE_RATE': 0.1,
+    'MAX_FINGERPRINTS': 500,      # per worker
+    'PUBLISH_INTERVAL': 10,       # seconds between snapshots to the shared cache
+}
+
+
+# Write-behind job view counters (core/view_counter.py)
+
+JOB_VIEW_COUNTER = {
+    # Seconds; also the most a crashed worker can lose. None starts no flush
+    # thread, so tests don't write from a second connection behind their back
+    'FLUSH_INTERVAL': None if sys.argv[1:2] == ['test'] else 10,
+    'BATCH_SIZE': 500,
+}
+
+
+# Trending jobs (core/trending.py)
+
+TRENDING = {
+    'HALF_LIFE_HOURS': 24,
+}
+
+
+# Prefix autocomplete for job titles and skills (core/autocomplete.py)
+
+AUTOCOMPLETE = {
+    'REFRESH_SECONDS': 10 * 60,      # background rebuild from the database
+    'PRECOMPUTE_PREFIX_LENGTH': 3,   # prefixes this short answer from a precomputed top-k,
+    'PRECOMPUTE_MIN_RANGE': 256,     # as do longer ones matching more terms than this
+    'MAX_RESULTS': 10,
+}
+
+
+# Ranked applicant lists in view_applications (core/applicant_ranking.py)
+
+APPLICANT_RANKING = {
+    'WEIGHTS': {'budget': 0.4, 'skills': 0.4, 'recency': 0.2},
+    'RECENCY_HALF_LIFE_DAYS': 7,
+    'MAX_SKILLS': 5,
+    'PAGE_SIZE': 25,
+    'TIMEOUT': 60 * 60,   # cached rankings also expire, to pick up skill edits
+}
+
+
+# Live dashboard events over SSE (core/events.py)
+# /events/ needs the ASGI app (job_market/asgi.py). With REDIS_URL set,
+# events published by WSGI workers reach every ASGI process via Redis.
+
+EVENTS = {
+    'BROKER': 'core.events.LocalBroker',
+    'HEARTBEAT_SECONDS': 15,
+    'QUEUE_SIZE': 100,
+    'REPLAY_SIZE': 20,
+}
+
+if os.environ.get('REDIS_URL'):
+    EVENTS['BROKER'] = 'core.events.RedisBroker'
+
+
+# Interview reminders (core/reminders.py), sent by `manage.py run_reminders`
+# Schedule/reschedule changes reach the scheduler through a table, or a
+# Redis list when REDIS_URL is set.
+
+INTERVIEW_REMINDERS = {
+    'LEAD_TIMES': (24 * 60 * 60, 60 * 60),   # seconds before the interview
+    'WINDOW': 6 * 60 * 60,
+    'BATCH_SIZE': 200,
+    'QUEUE': 'core.reminders.DatabaseQueue',
+}
+
+if os.environ.get('REDIS_URL'):
+    INTERVIEW_REMINDERS['QUEUE'] = 'core.reminders.RedisQueue'
+
+
+# Read-through cache for job_detail records (core/object_cache.py)
+# Hit rates per worker at /metrics/object-cache/
+
+OBJECT_CACHE = {
+    'TIMEOUT': 10 * 60,
+    'STALE_TIMEOUT': 60,
+    'LOCK_WAIT': 0.5,
+}
+
+
+# Bulk deletion of users/clients/freelancers/jobs (core/bulk_delete.py)
+
+BULK_DELETE = {
+    'BATCH_SIZE': 500,   # ids per DELETE and per transaction
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
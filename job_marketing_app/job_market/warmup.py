@@ -0,0 +1,101 @@
+"""
+Per-worker warm-up so the first real request doesn't pay for template
+compilation, URL resolver population, the first DB connection, the
+first category query and the autocomplete index build.
+
+Two stages:
+
+* ``warm_code()`` - templates + URL resolvers. Safe before fork, so with
+  ``gunicorn --preload`` it runs once in the master and every worker
+  inherits the compiled objects. Called from wsgi.py.
+* ``warm_connections()`` - DB connections + shared caches. Sockets must
+  not be shared across fork, so this runs in each worker from the
+  gunicorn ``post_worker_init`` hook (gunicorn.conf.py), before the
+  worker accepts traffic.
+"""
+
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def compile_templates():
+    from django.template import TemplateSyntaxError, engines
+    from django.template.autoreload import get_template_directories
+
+    compiled = 0
+    for directory in get_template_directories():
+        for root, _dirs, files in os.walk(directory):
+            for name in files:
+                if not name.endswith(('.html', '.txt')):
+                    continue
+                template_name = os.path.relpath(os.path.join(root, name), directory).replace(os.sep, '/')
+                for engine in engines.all():
+                    try:
+                        # The cached loader keeps the compiled template for the worker's lifetime
+                        engine.get_template(template_name)
+                        compiled += 1
+                        break
+                    except TemplateSyntaxError:
+                        logger.exception("Warm-up could not compile %s", template_name)
+                        break
+                    except Exception:
+                        continue
+    return compiled
+
+
+def populate_url_resolvers():
+    from django.urls import get_resolver
+
+    resolver = get_resolver()
+    # Builds reverse_dict / namespace_dict for the whole URLconf
+    return len(resolver.reverse_dict)
+
+
+def open_connections():
+    from django.db import connections
+
+    for alias in connections:
+        connection = connections[alias]
+        connection.ensure_connection()
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        if getattr(connection, 'pool', None) is not None:
+            # Back to the pool (core/pool.py), which then opens the rest of its MIN_SIZE
+            connection.close()
+            connection.prefill_pool()
+    return len(connections.all())
+
+
+def prime_caches():
+    from core import autocomplete
+    from core.views import get_categories
+
+    get_categories()
+    autocomplete.warm()
+
+
+def warm_code():
+    start = time.perf_counter()
+    templates = compile_templates()
+    patterns = populate_url_resolvers()
+    logger.info(
+        "Warm-up: %s templates, %s URL names in %.0f ms",
+        templates, patterns, (time.perf_counter() - start) * 1000
+    )
+
+
+def warm_connections():
+    start = time.perf_counter()
+    aliases = open_connections()
+    prime_caches()
+    logger.info(
+        "Warm-up: %s DB connection(s) and caches in %.0f ms",
+        aliases, (time.perf_counter() - start) * 1000
+    )
+
+
+def is_enabled():
+    return os.environ.get('DJANGO_WARMUP', '1') != '0'
@@ -14,3 +14,11 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'job_market.settings')
 
 application = get_wsgi_application()
+
+# Compile templates and URL resolvers before the first request.
+# Under `gunicorn --preload` this runs once in the master.
+# DB connections are opened per worker in gunicorn.conf.py.
+from job_market import warmup  # noqa: E402
+
+if warmup.is_enabled():
+    warmup.warm_code()